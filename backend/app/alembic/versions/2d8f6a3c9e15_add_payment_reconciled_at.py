@@ -0,0 +1,28 @@
+"""Add payment reconciled_at
+
+Revision ID: 2d8f6a3c9e15
+Revises: 9c1e5b7d2a64
+Create Date: 2026-10-18 18:41:07.562390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d8f6a3c9e15'
+down_revision = '9c1e5b7d2a64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('payment', sa.Column('reconciled_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_payment_reconciled_at_unsettled', 'payment',
+                    ['reconciled_at', 'created_at'],
+                    postgresql_where=sa.text("status IN ('PENDING', 'NOT_FOUND')"))
+
+
+def downgrade():
+    op.drop_index('ix_payment_reconciled_at_unsettled', table_name='payment')
+    op.drop_column('payment', 'reconciled_at')
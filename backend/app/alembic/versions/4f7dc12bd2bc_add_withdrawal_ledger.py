@@ -0,0 +1,92 @@
+"""Add withdrawal ledger and recipient balances
+
+Revision ID: 4f7dc12bd2bc
+Revises: a3f9c2e71b58
+Create Date: 2026-10-18 16:37:12.540281
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4f7dc12bd2bc'
+down_revision = 'a3f9c2e71b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    sa.Enum('SPONSORSHIP_CREDIT', 'SPONSORSHIP_REVERSAL', 'WITHDRAWAL_HOLD',
+            'WITHDRAWAL_COMPLETION', 'WITHDRAWAL_RELEASE',
+            name='withdrawalledgerentrytype').create(op.get_bind())
+    op.create_table('withdrawalledgerentry',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('recipient_id', sa.Uuid(), nullable=False),
+    sa.Column('entry_type', postgresql.ENUM('SPONSORSHIP_CREDIT', 'SPONSORSHIP_REVERSAL', 'WITHDRAWAL_HOLD', 'WITHDRAWAL_COMPLETION', 'WITHDRAWAL_RELEASE', name='withdrawalledgerentrytype', create_type=False), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('withdrawal_id', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['recipient_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_withdrawalledgerentry_recipient_id_created_at', 'withdrawalledgerentry',
+                    ['recipient_id', 'created_at'], unique=False)
+    op.create_table('recipientbalance',
+    sa.Column('recipient_id', sa.Uuid(), nullable=False),
+    sa.Column('total_received', sa.Float(), nullable=False),
+    sa.Column('total_withdrawn', sa.Float(), nullable=False),
+    sa.Column('pending_withdrawals', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['recipient_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('recipient_id')
+    )
+    # Backfill the ledger from existing sponsorships and withdrawals
+    op.execute("""
+        INSERT INTO withdrawalledgerentry (id, recipient_id, entry_type, amount, order_id, created_at)
+        SELECT gen_random_uuid(), sponsorship.recipient_id, 'SPONSORSHIP_CREDIT',
+               payment.amount, payment.order_id, payment.updated_at
+        FROM sponsorship JOIN payment ON sponsorship.order_id = payment.order_id
+        WHERE payment.status = 'SUCCESS'
+    """)
+    op.execute("""
+        INSERT INTO withdrawalledgerentry (id, recipient_id, entry_type, amount, withdrawal_id, created_at)
+        SELECT gen_random_uuid(), recipient_id, 'WITHDRAWAL_HOLD',
+               amount_requested, id, requested_at
+        FROM withdrawal
+        WHERE status IN ('PENDING', 'COMPLETED')
+    """)
+    op.execute("""
+        INSERT INTO withdrawalledgerentry (id, recipient_id, entry_type, amount, withdrawal_id, created_at)
+        SELECT gen_random_uuid(), recipient_id, 'WITHDRAWAL_COMPLETION',
+               amount_requested, id, coalesce(completed_at, requested_at)
+        FROM withdrawal
+        WHERE status = 'COMPLETED'
+    """)
+    op.execute("""
+        INSERT INTO recipientbalance
+            (recipient_id, total_received, total_withdrawn, pending_withdrawals, updated_at)
+        SELECT recipient_id,
+               coalesce(sum(amount) FILTER (WHERE entry_type = 'SPONSORSHIP_CREDIT'), 0)
+             - coalesce(sum(amount) FILTER (WHERE entry_type = 'SPONSORSHIP_REVERSAL'), 0),
+               coalesce(sum(amount) FILTER (WHERE entry_type = 'WITHDRAWAL_COMPLETION'), 0),
+               coalesce(sum(amount) FILTER (WHERE entry_type = 'WITHDRAWAL_HOLD'), 0)
+             - coalesce(sum(amount) FILTER (
+                   WHERE entry_type IN ('WITHDRAWAL_COMPLETION', 'WITHDRAWAL_RELEASE')), 0),
+               max(created_at)
+        FROM withdrawalledgerentry
+        GROUP BY recipient_id
+    """)
+
+
+def downgrade():
+    op.drop_table('recipientbalance')
+    op.drop_index('ix_withdrawalledgerentry_recipient_id_created_at',
+                  table_name='withdrawalledgerentry')
+    op.drop_table('withdrawalledgerentry')
+    sa.Enum('SPONSORSHIP_CREDIT', 'SPONSORSHIP_REVERSAL', 'WITHDRAWAL_HOLD',
+            'WITHDRAWAL_COMPLETION', 'WITHDRAWAL_RELEASE',
+            name='withdrawalledgerentrytype').drop(op.get_bind())
@@ -0,0 +1,37 @@
+"""Add notification counter table
+
+Revision ID: 5d2f7b3a9e61
+Revises: c4e8a1d2f9b7
+Create Date: 2026-10-18 11:40:37.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2f7b3a9e61'
+down_revision = 'c4e8a1d2f9b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notificationcounter',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # Backfill from existing unread notifications
+    op.execute("""
+        INSERT INTO notificationcounter (user_id, unread_count)
+        SELECT user_id, count(*) FROM notification
+        WHERE is_read = false
+        GROUP BY user_id
+    """)
+
+
+def downgrade():
+    op.drop_table('notificationcounter')
@@ -0,0 +1,40 @@
+"""Add PayHere webhook event
+
+Revision ID: 6b3e9f1a7c42
+Revises: 2d8f6a3c9e15
+Create Date: 2026-10-18 19:16:52.104873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '6b3e9f1a7c42'
+down_revision = '2d8f6a3c9e15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('payherewebhookevent',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=False),
+    sa.Column('md5sig', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('received_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['payment.order_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_payherewebhookevent_order_id_status_code_md5sig', 'payherewebhookevent',
+                    ['order_id', 'status_code', 'md5sig'], unique=True)
+    op.create_index('ix_payherewebhookevent_received_at_unprocessed', 'payherewebhookevent',
+                    ['received_at'], postgresql_where=sa.text('processed_at IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_payherewebhookevent_received_at_unprocessed', table_name='payherewebhookevent')
+    op.drop_index('ix_payherewebhookevent_order_id_status_code_md5sig', table_name='payherewebhookevent')
+    op.drop_table('payherewebhookevent')
@@ -0,0 +1,28 @@
+"""Add comment and reply order indexes
+
+Revision ID: 8a4c2e7f1b93
+Revises: 6b3e9f1a7c42
+Create Date: 2026-10-18 21:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4c2e7f1b93'
+down_revision = '6b3e9f1a7c42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_comment_thread_id_created_at_id', 'comment',
+                    ['thread_id', 'created_at', 'id'])
+    op.create_index('ix_reply_parent_id_created_at_id', 'reply',
+                    ['parent_id', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_reply_parent_id_created_at_id', table_name='reply')
+    op.drop_index('ix_comment_thread_id_created_at_id', table_name='comment')
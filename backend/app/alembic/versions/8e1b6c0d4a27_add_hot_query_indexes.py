@@ -0,0 +1,54 @@
+"""Add composite and partial indexes for hot queries
+
+Built CONCURRENTLY so the migration can run against a live database without
+locking writes; CONCURRENTLY cannot run inside a transaction, hence the
+autocommit block.
+
+Revision ID: 8e1b6c0d4a27
+Revises: 5d2f7b3a9e61
+Create Date: 2026-10-18 12:21:09.553862
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '8e1b6c0d4a27'
+down_revision = '5d2f7b3a9e61'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_notification_user_id_created_at_unread', 'notification', ['user_id', 'created_at'], sa.text('is_read = false')),
+    ('ix_projectapplication_project_id_status', 'projectapplication', ['project_id', 'status'], None),
+    ('ix_projectapplication_volunteer_id_created_at', 'projectapplication', ['volunteer_id', 'created_at'], None),
+    ('ix_task_assignee_id_status', 'task', ['assignee_id', 'status'], None),
+    ('ix_payment_status', 'payment', ['status'], None),
+    ('ix_sponsorship_recipient_id', 'sponsorship', ['recipient_id'], None),
+    ('ix_withdrawal_recipient_id_status', 'withdrawal', ['recipient_id', 'status'], None),
+    ('ix_project_status_created_at', 'project', ['status', 'created_at'], None),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,31 @@
+"""Add PayHere access token
+
+Revision ID: 9c1e5b7d2a64
+Revises: fed84abec09b
+Create Date: 2026-10-18 18:02:13.418207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '9c1e5b7d2a64'
+down_revision = 'fed84abec09b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('payhereaccesstoken',
+    sa.Column('app_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('access_token', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('app_id')
+    )
+
+
+def downgrade():
+    op.drop_table('payhereaccesstoken')
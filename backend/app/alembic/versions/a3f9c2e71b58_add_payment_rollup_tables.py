@@ -0,0 +1,68 @@
+"""Add payment rollup tables
+
+Revision ID: a3f9c2e71b58
+Revises: 8e1b6c0d4a27
+Create Date: 2026-10-18 14:02:51.318604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f9c2e71b58'
+down_revision = '8e1b6c0d4a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    sa.Enum('DONATION', 'SPONSORSHIP', name='paymentkind').create(op.get_bind())
+    sa.Enum('DONOR', 'SPONSOR', 'RECIPIENT',
+            name='paymentparticipantrole').create(op.get_bind())
+    op.create_table('payment_daily_rollup',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('currency', postgresql.ENUM('LKR', 'USD', name='paymentcurrency', create_type=False), nullable=False),
+    sa.Column('kind', postgresql.ENUM('DONATION', 'SPONSORSHIP', name='paymentkind', create_type=False), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDING', 'CANCELLED', 'FAILED', 'CHARGEDBACK', 'NOT_FOUND', 'SUCCESS', name='paymentstatus', create_type=False), nullable=False),
+    sa.Column('payment_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'currency', 'kind', 'status')
+    )
+    op.create_table('payment_participant_rollup',
+    sa.Column('role', postgresql.ENUM('DONOR', 'SPONSOR', 'RECIPIENT', name='paymentparticipantrole', create_type=False), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('successful_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('role', 'user_id')
+    )
+    # Backfill from existing donations and sponsorships
+    for kind, table in (('DONATION', 'donation'), ('SPONSORSHIP', 'sponsorship')):
+        op.execute(f"""
+            INSERT INTO payment_daily_rollup (day, currency, kind, status, payment_count, total_amount)
+            SELECT date(payment.created_at), payment.currency, '{kind}', payment.status,
+                   count(*), sum(payment.amount)
+            FROM {table} JOIN payment ON {table}.order_id = payment.order_id
+            GROUP BY date(payment.created_at), payment.currency, payment.status
+        """)
+    for role, table, column in (
+        ('DONOR', 'donation', 'donor_id'),
+        ('SPONSOR', 'sponsorship', 'sponsor_id'),
+        ('RECIPIENT', 'sponsorship', 'recipient_id'),
+    ):
+        op.execute(f"""
+            INSERT INTO payment_participant_rollup (role, user_id, successful_count)
+            SELECT '{role}', {table}.{column}, count(*)
+            FROM {table} JOIN payment ON {table}.order_id = payment.order_id
+            WHERE payment.status = 'SUCCESS'
+            GROUP BY {table}.{column}
+        """)
+
+
+def downgrade():
+    op.drop_table('payment_participant_rollup')
+    op.drop_table('payment_daily_rollup')
+    sa.Enum('DONOR', 'SPONSOR', 'RECIPIENT', name='paymentparticipantrole').drop(op.get_bind())
+    sa.Enum('DONATION', 'SPONSORSHIP', name='paymentkind').drop(op.get_bind())
@@ -0,0 +1,25 @@
+"""Add PayHere token refresh claim
+
+Revision ID: a6f3c9d2b8e1
+Revises: d2e7a4b9c1f5
+Create Date: 2026-10-18 23:48:05.207913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6f3c9d2b8e1'
+down_revision = 'd2e7a4b9c1f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('payhereaccesstoken', sa.Column('refreshing_until', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('payhereaccesstoken', 'refreshing_until')
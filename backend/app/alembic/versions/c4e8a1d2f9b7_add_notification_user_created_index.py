@@ -0,0 +1,25 @@
+"""Add notification (user_id, created_at) index
+
+Revision ID: c4e8a1d2f9b7
+Revises: e7b91cb2ffd3
+Create Date: 2026-10-18 10:12:04.318412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1d2f9b7'
+down_revision = 'e7b91cb2ffd3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_notification_user_id_created_at', 'notification', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_notification_user_id_created_at', table_name='notification')
@@ -0,0 +1,65 @@
+"""Add project thread comment counts and last activity
+
+Revision ID: c5d1f8a3e6b7
+Revises: 8a4c2e7f1b93
+Create Date: 2026-10-18 22:03:51.174630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d1f8a3e6b7'
+down_revision = '8a4c2e7f1b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('projectthread', sa.Column('comment_count', sa.Integer(), nullable=False,
+                                             server_default='0'))
+    op.add_column('projectthread', sa.Column('reply_count', sa.Integer(), nullable=False,
+                                             server_default='0'))
+    op.add_column('projectthread', sa.Column('last_activity_at', sa.DateTime(), nullable=True))
+    op.add_column('projectthread', sa.Column('last_author_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key('projectthread_last_author_id_fkey', 'projectthread', 'user',
+                          ['last_author_id'], ['id'])
+    # Backfill from existing comments and replies
+    op.execute("""
+        UPDATE projectthread SET
+            comment_count = (
+                SELECT count(*) FROM comment WHERE comment.thread_id = projectthread.id),
+            reply_count = (
+                SELECT count(*) FROM reply JOIN comment ON reply.parent_id = comment.id
+                WHERE comment.thread_id = projectthread.id),
+            last_activity_at = latest.created_at,
+            last_author_id = latest.author_id
+        FROM (
+            SELECT DISTINCT ON (thread_id) thread_id, created_at, author_id
+            FROM (
+                SELECT id AS thread_id, created_at, author_id FROM projectthread
+                UNION ALL
+                SELECT thread_id, created_at, author_id FROM comment
+                UNION ALL
+                SELECT comment.thread_id, reply.created_at, reply.author_id
+                FROM reply JOIN comment ON reply.parent_id = comment.id
+            ) AS activity
+            ORDER BY thread_id, created_at DESC
+        ) AS latest
+        WHERE latest.thread_id = projectthread.id
+    """)
+    op.alter_column('projectthread', 'comment_count', server_default=None)
+    op.alter_column('projectthread', 'reply_count', server_default=None)
+    op.alter_column('projectthread', 'last_activity_at', nullable=False)
+    op.create_index('ix_projectthread_project_id_last_activity_at_id', 'projectthread',
+                    ['project_id', 'last_activity_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_projectthread_project_id_last_activity_at_id', table_name='projectthread')
+    op.drop_constraint('projectthread_last_author_id_fkey', 'projectthread', type_='foreignkey')
+    op.drop_column('projectthread', 'last_author_id')
+    op.drop_column('projectthread', 'last_activity_at')
+    op.drop_column('projectthread', 'reply_count')
+    op.drop_column('projectthread', 'comment_count')
@@ -0,0 +1,28 @@
+"""Add withdrawal idempotency key
+
+Revision ID: fed84abec09b
+Revises: 4f7dc12bd2bc
+Create Date: 2026-10-18 17:21:45.902113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'fed84abec09b'
+down_revision = '4f7dc12bd2bc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('withdrawal', sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+    op.create_index('ix_withdrawal_recipient_id_idempotency_key', 'withdrawal',
+                    ['recipient_id', 'idempotency_key'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_withdrawal_recipient_id_idempotency_key', table_name='withdrawal')
+    op.drop_column('withdrawal', 'idempotency_key')
@@ -1,5 +1,5 @@
-from collections.abc import Generator
-from typing import Annotated, Optional
+from collections.abc import AsyncGenerator, Generator
+from typing import Annotated, Any, Optional
 
 import jwt
 from fastapi import Depends, HTTPException, status, Request, Cookie, UploadFile
@@ -7,13 +7,15 @@ from fastapi.security import OAuth2PasswordBearer, HTTPBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import async_engine, engine
 from app.models import TokenPayload, User
 
-from app.services.payhere_service import PayHereService
+from app.services.payhere_service import PayHereService, payhere_service
+from app.utils import decode_cursor
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token",
@@ -26,7 +28,13 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[Optional[str], Depends(reusable_oauth2)]
 
 # TODO: For now, I added coockie based authentication on top of using Autherization header.
@@ -58,18 +66,20 @@ TokenFromCookieOrHeader = Annotated[Optional[str],
                                     Depends(get_token_from_cookie_or_header)]
 
 
-def get_current_user(session: SessionDep, token: TokenFromCookieOrHeader) -> User:
+def _decode_token(token: str | None) -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except (InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+
+
+def _check_user(user: User | None) -> User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
@@ -77,8 +87,43 @@ def get_current_user(session: SessionDep, token: TokenFromCookieOrHeader) -> Use
     return user
 
 
+def get_current_user(session: SessionDep, token: TokenFromCookieOrHeader) -> User:
+    token_data = _decode_token(token)
+    return _check_user(session.get(User, token_data.sub))
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
+
+async def get_current_user_async(
+    session: AsyncSessionDep, token: TokenFromCookieOrHeader
+) -> User:
+    """
+    Same as get_current_user, but resolves the user through the async engine
+    so async routes never wait on a threadpool slot for authentication.
+    """
+    token_data = _decode_token(token)
+    return _check_user(await session.get(User, token_data.sub))
+
+
+AsyncCurrentUser = Annotated[User, Depends(get_current_user_async)]
+
+
+async def get_stream_user(token: TokenFromCookieOrHeader) -> User:
+    """
+    Authenticate a long-lived stream (SSE).
+    Dependencies that yield a session keep it open until the response ends, so
+    the user is resolved on a private session that is closed before streaming
+    starts and no pooled connection is held for the life of the stream.
+    """
+    token_data = _decode_token(token)
+    async with AsyncSession(async_engine) as session:
+        user = _check_user(await session.get(User, token_data.sub))
+    return user
+
+
+StreamUser = Annotated[User, Depends(get_stream_user)]
+
 # Optional authentication dependency for public endpoints
 
 
@@ -121,8 +166,8 @@ def get_current_active_superuser(current_user: CurrentUser) -> User:
     return current_user
 
 
-def get_payhere_service(session: SessionDep) -> PayHereService:
-    return PayHereService(session=session)
+def get_payhere_service() -> PayHereService:
+    return payhere_service
 
 
 PayHereServiceDep = Annotated[PayHereService, Depends(get_payhere_service)]
@@ -144,3 +189,16 @@ def validate_image_file(max_size: int = 5 * 1024 * 1024):
         return file
 
     return validator
+
+
+def get_cursor(cursor: str | None = None) -> tuple[Any, ...] | None:
+    """Decode the optional ?cursor= of keyset-paginated listings"""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+CursorDep = Annotated[tuple[Any, ...] | None, Depends(get_cursor)]
@@ -11,6 +11,9 @@ Flow:
 4. User completes payment on PayHere
 5. Webhook updates payment status
 6. Donation is linked to successful payment via order_id
+
+Listings load each page's payments with it; payment statuses are kept
+current by PayHere webhooks and the background reconciler.
 """
 
 import logging
@@ -18,7 +21,8 @@ import logging
 from fastapi import APIRouter, HTTPException
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep, PayHereServiceDep
+from app.api.deps import CurrentUser, CursorDep, SessionDep, PayHereServiceDep
+from app.utils import InvalidCursorError, get_next_cursor
 from app.models import (
     DonationCreate,
     PaymentInitiationResponse,
@@ -80,7 +84,8 @@ def initiate_donation(
         )
 
         # Initiate payment through PayHere service
-        payment_response = payhere_service.initiate_payment(payment_in)
+        payment_response = payhere_service.initiate_payment(
+            session=session, payment_in=payment_in)
 
         # Create donation record linked to the payment
         crud.create_donation(
@@ -107,11 +112,11 @@ def initiate_donation(
 
 
 @router.get("/my-donations", response_model=DonationsPublic, status_code=200)
-async def get_my_donations(
+def get_my_donations(
     *,
     session: SessionDep,
-    payhere_service: PayHereServiceDep,
     current_user: CurrentUser,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 100
 ) -> DonationsPublic:
@@ -120,10 +125,11 @@ async def get_my_donations(
 
     This endpoint:
     1. Fetches all donations made by the current user, ordered by order_id descending
-    2. For each donation, retrieves payment details from PayHere service
-    3. Returns donation data with updated payment status from PayHere
+    2. Includes the payment details of each donation
+    3. Returns donation data with the stored payment status
 
-    The payment status is fetched in real-time from PayHere API to ensure accuracy.
+    Payment statuses are kept up to date by PayHere webhooks and the
+    background reconciler, so reading them does not call PayHere.
 
     Requires authentication.
 
@@ -140,27 +146,19 @@ async def get_my_donations(
     """
     try:
         # Get donations from database ordered by order_id
-        donations = crud.get_donations_by_donor_id(
+        donations, total = crud.get_donations_by_donor_id(
             session=session,
             donor_id=current_user.id,
             skip=skip,
-            limit=limit
-        )
-
-        # Get total count for pagination
-        total = crud.count_donations_by_donor_id(
-            session=session,
-            donor_id=current_user.id
+            limit=limit,
+            after=after
         )
 
-        # Fetch payment details for each donation using PayHere service
+        # Attach payment details to each donation
         # Note: donations are already filtered by SUCCESS/PENDING status at database level
         donations_with_payments = []
         for donation in donations:
-            # Use PayHere service to get payment details
-            # This will check PayHere API if payment status is PENDING
-            payment = await payhere_service.get_payment_by_order_id(donation.order_id)
-
+            payment = donation.payment
             if payment:
                 # Create DonationPublic with payment and donor info
                 donation_public = DonationPublic(
@@ -212,7 +210,8 @@ async def get_my_donations(
         meta = Meta(
             page=current_page,
             total=total,
-            totalPages=total_pages
+            totalPages=total_pages,
+            next_cursor=get_next_cursor(donations, limit, lambda d: (d.order_id,))
         )
 
         logger.info(
@@ -224,6 +223,8 @@ async def get_my_donations(
             meta=meta
         )
 
+    except (HTTPException, InvalidCursorError):
+        raise
     except Exception as e:
         logger.error(
             f"Error fetching donations for user {current_user.id}: {str(e)}")
@@ -234,11 +235,11 @@ async def get_my_donations(
 
 
 @router.get("/all", response_model=DonationsPublic, status_code=200)
-async def get_all_donations_admin(
+def get_all_donations_admin(
     *,
     session: SessionDep,
-    payhere_service: PayHereServiceDep,
     current_user: CurrentUser,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 100
 ) -> DonationsPublic:
@@ -248,8 +249,8 @@ async def get_all_donations_admin(
     This endpoint:
     1. Verifies the user is an admin
     2. Fetches all donations ordered by order_id descending
-    3. For each donation, retrieves payment details from PayHere service
-    4. Returns donation data with updated payment status from PayHere
+    3. Includes the payment details of each donation
+    4. Returns donation data with the stored payment status
 
     Only accessible to users with ADMIN role.
 
@@ -274,21 +275,17 @@ async def get_all_donations_admin(
 
     try:
         # Get all donations from database ordered by order_id
-        donations = crud.get_all_donations(
+        donations, total = crud.get_all_donations(
             session=session,
             skip=skip,
-            limit=limit
+            limit=limit,
+            after=after
         )
 
-        # Get total count for pagination
-        total = crud.count_all_donations(session=session)
-
-        # Fetch payment details for each donation using PayHere service
+        # Attach payment details to each donation
         donations_with_payments = []
         for donation in donations:
-            # Use PayHere service to get payment details
-            payment = await payhere_service.get_payment_by_order_id(donation.order_id)
-
+            payment = donation.payment
             if payment and donation.donor:
                 # Create DonationPublic with payment and donor info
                 donation_public = DonationPublic(
@@ -339,7 +336,8 @@ async def get_all_donations_admin(
         meta = Meta(
             page=current_page,
             total=total,
-            totalPages=total_pages
+            totalPages=total_pages,
+            next_cursor=get_next_cursor(donations, limit, lambda d: (d.order_id,))
         )
 
         logger.info(
@@ -351,7 +349,7 @@ async def get_all_donations_admin(
             meta=meta
         )
 
-    except HTTPException:
+    except (HTTPException, InvalidCursorError):
         raise
     except Exception as e:
         logger.error(
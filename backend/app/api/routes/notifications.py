@@ -1,47 +1,92 @@
 import json
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
+from fastapi import APIRouter, Depends, Header, HTTPException
 from fastapi.responses import StreamingResponse
-from app.api.deps import CurrentUser, SessionDep
-from app.core.notification_manager import notification_manager
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CurrentUser, CursorDep, SessionDep, StreamUser
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.core.db import async_engine
+from app.core.notification_manager import (
+    SSEConnection,
+    format_notification_event,
+    format_reset_event,
+    frame_event_id,
+    notification_event_data,
+    notification_manager,
+    parse_event_id,
+)
 from app.models import NotificationsPublic, Meta
 from app import crud
+from app.utils import calculate_pagination_meta_from_page, get_next_cursor
 import uuid
-import asyncio
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 @router.get("/stream")
-async def notification_stream(current_user: CurrentUser):
+async def notification_stream(
+    current_user: StreamUser,
+    last_event_id: Annotated[str | None, Header()] = None
+):
     """
-    SSE endpoint - keeps connection open and streams notifications
+    SSE endpoint - keeps connection open and streams notifications.
+    Uses StreamUser so no database connection is held while streaming.
+    On reconnect the browser sends Last-Event-ID and missed notifications
+    are replayed before live ones, or a notifications_reset event is sent
+    when more were missed than one replay carries.
     """
     async def event_generator():
-        # Create a queue for this specific connection
-        message_queue = asyncio.Queue()
+        # Create a bounded buffer for this specific connection
+        connection = SSEConnection()
         
         # Register this connection with the notification manager
-        await notification_manager.connect(current_user.id, message_queue)
+        await notification_manager.connect(current_user.id, connection)
         
         try:
             # Send initial connection success message
             connect_data = {'type': 'connected', 'user_id': str(current_user.id)}
             yield f"data: {json.dumps(connect_data)}\n\n"
 
-            # Keep connection alive and yield notifications
+            # Replay after registering, so nothing falls between the two;
+            # live frames already covered by the replay are skipped below
+            replayed_up_to = None
+            since = parse_event_id(last_event_id) if last_event_id else None
+            if since is not None:
+                async with AsyncSession(async_engine) as session:
+                    missed = await crud.get_notifications_since_async(
+                        session=session,
+                        user_id=current_user.id,
+                        after=since,
+                        limit=settings.SSE_QUEUE_SIZE + 1
+                    )
+                if len(missed) > settings.SSE_QUEUE_SIZE:
+                    # Too many to replay; have the client refetch instead of
+                    # silently losing the oldest
+                    newest = missed[-1]
+                    replayed_up_to = (newest.created_at, newest.id)
+                    yield format_reset_event(newest)
+                else:
+                    for notification in missed:
+                        replayed_up_to = (notification.created_at, notification.id)
+                        yield format_notification_event(notification_event_data(notification))
+
+            # Yield notifications; keepalives are queued by the manager's
+            # shared heartbeat while the connection is idle
             while True:
-                try:
-                    # Wait for notification with timeout (for keepalive)
-                    message = await asyncio.wait_for(message_queue.get(), timeout=30.0)
-                    yield message
-                except asyncio.TimeoutError:
-                    # Send keepalive ping every 30 seconds
-                    keepalive_data = {'type': 'keepalive'}
-                    yield f"data: {json.dumps(keepalive_data)}\n\n"
+                message = await connection.get()
+                if message is None:
+                    # Evicted as a slow consumer; the client will reconnect
+                    break
+                if replayed_up_to is not None:
+                    event_id = frame_event_id(message)
+                    key = parse_event_id(event_id) if event_id else None
+                    if key is not None and key <= replayed_up_to:
+                        continue
+                yield message
         except Exception as e:
             print(f"SSE connection error: {e}")
         finally:
             # Clean up connection
-            notification_manager.disconnect(current_user.id, message_queue)
+            notification_manager.disconnect(current_user.id, connection)
     
     return StreamingResponse(
         event_generator(),
@@ -54,22 +99,24 @@ async def notification_stream(current_user: CurrentUser):
     )
     
 @router.get("/", response_model=NotificationsPublic)
-def get_notifications(
-    session: SessionDep,
-    current_user: CurrentUser,
+async def get_notifications(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 50
 ):
-    """Get user's notification history"""
-    notifications, total = crud.get_user_notifications(
+    """Get user's notification history (pass meta.next_cursor as ?cursor= to page by key)"""
+    notifications, total = await crud.get_user_notifications_async(
         session=session,
         user_id=current_user.id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        after=after
     )
-    # Calculate totalPages manually (since we can't change utils.py)
-    totalPages = (total + limit - 1) // limit  # Ceiling division
-    meta = Meta(total=total, page=(skip // limit) + 1, totalPages=totalPages)
+    meta = calculate_pagination_meta_from_page(
+        total=total, page=(skip // limit) + 1, limit=limit,
+        next_cursor=get_next_cursor(notifications, limit, lambda n: (n.created_at, n.id)))
     return NotificationsPublic(data=notifications, meta=meta)
 
 @router.patch("/{notification_id}/read")
@@ -100,15 +147,15 @@ def mark_all_as_read(
     return {"message": f"Marked {count} notifications as read"}
 
 @router.get("/unread", response_model=NotificationsPublic)
-def get_unread_notifications(
-    session: SessionDep,
-    current_user: CurrentUser
+async def get_unread_notifications(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser
 ):
     """
     Get all unread notifications.
     Called when user logs in or opens app.
     """
-    notifications = crud.get_unread_notifications(
+    notifications = await crud.get_unread_notifications_async(
         session=session, 
         user_id=current_user.id
     )
@@ -123,15 +170,15 @@ def get_unread_notifications(
     )
 
 @router.get("/unread/count")
-def get_unread_count(
-    session: SessionDep,
-    current_user: CurrentUser
+async def get_unread_count(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser
 ):
     """
     Get count of unread notifications.
     For the notification bell badge.
     """
-    count = crud.get_unread_notifications_count(
+    count = await crud.get_unread_notifications_count_async(
         session=session, 
         user_id=current_user.id
     )
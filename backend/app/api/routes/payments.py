@@ -1,12 +1,18 @@
 from app.models import (
     PaymentCreate, PaymentInitiationResponse,
-    PayhereCheckoutAPIVerificationResponse, PaymentPublic
+    PayhereCheckoutAPIVerificationResponse, PaymentPublic,
+    PaymentCurrency, PaymentDailyRollupsPublic, PaymentKind,
+    PaymentSeriesGranularity, PaymentSeriesPublic, UserRole
 )
-from app.api.deps import PayHereServiceDep
+from app.api.deps import AsyncSessionDep, CurrentUser, PayHereServiceDep, SessionDep
+from app import crud
+from app.services.payhere_webhook_processor import payhere_webhook_processor
+import hashlib
 import logging
+from datetime import date, timedelta
 from typing import Any, Annotated
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Form, Header, HTTPException, Query, Response
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,10 +20,17 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
+# Payment series: longest range and moving average window, and how long
+# clients may reuse a response
+MAX_SERIES_DAYS = 3660
+MAX_SERIES_WINDOW = 90
+SERIES_MAX_AGE = 300
+
 
 @router.post("/initiate", response_model=PaymentInitiationResponse)
 def initiate_payment(
     *,
+    session: SessionDep,
     payhere_service: PayHereServiceDep,
     payment_in: PaymentCreate
 ) -> Any:
@@ -27,20 +40,24 @@ def initiate_payment(
     Creates a payment record with PENDING status and returns the payment details
     along with PayHere URLs and hash for frontend to process the payment.
     """
-    return payhere_service.initiate_payment(payment_in)
+    return payhere_service.initiate_payment(session=session, payment_in=payment_in)
 
 
 @router.post("/payhere-webhook")
-def payhere_webhook(
+async def payhere_webhook(
     *,
+    session: AsyncSessionDep,
     payhere_service: PayHereServiceDep,
     verification_data: Annotated[PayhereCheckoutAPIVerificationResponse,
                                  Form(...)]
 ) -> bool:
     """
     Handle PayHere webhook notifications.
+    Only verifies and records the notification, on the event loop; the
+    payment is updated off-request by the webhook processor.
     """
-    return payhere_service.verify_webhook(
+    recorded = await payhere_service.verify_webhook(
+        session=session,
         merchant_id=verification_data.merchant_id or "",
         order_id=verification_data.order_id or "",
         amount=verification_data.payhere_amount or "",
@@ -48,16 +65,103 @@ def payhere_webhook(
         status_code=verification_data.status_code or "",
         received_hash=verification_data.md5sig or ""
     )
+    payhere_webhook_processor.wake()
+    return recorded
+
+
+@router.get("/statistics/daily", response_model=PaymentDailyRollupsPublic)
+def get_daily_payment_statistics(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    kind: PaymentKind | None = None,
+    start: date | None = None,
+    end: date | None = None
+) -> Any:
+    """
+    Daily payment counts and amounts per currency, kind and status (Admin only).
+    Read from the payment rollup, so the cost depends on the date range only.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=403,
+            detail="Only administrators can view payment statistics"
+        )
+
+    rollups = crud.get_payment_daily_rollups(
+        session=session, kind=kind, start=start, end=end)
+    return PaymentDailyRollupsPublic(data=rollups)
+
+
+@router.get(
+    "/statistics/series",
+    response_model=PaymentSeriesPublic,
+    responses={304: {"description": "Series unchanged since the given ETag"}},
+)
+def get_payment_series(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    response: Response,
+    kind: PaymentKind,
+    granularity: PaymentSeriesGranularity = PaymentSeriesGranularity.DAY,
+    start: date | None = None,
+    end: date | None = None,
+    window: Annotated[int, Query(ge=1, le=MAX_SERIES_WINDOW)] = 7,
+    currency: PaymentCurrency | None = None,
+    if_none_match: Annotated[str | None, Header()] = None
+) -> Any:
+    """
+    Successful donation or sponsorship volume bucketed by day, week or month:
+    count, amount and unique payers per bucket, with moving averages over the
+    trailing `window` buckets (Admin only).
+
+    Defaults to the last 90 days. Responses carry an ETag and may be cached
+    privately for a short while, keyed by the query string.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=403,
+            detail="Only administrators can view payment statistics"
+        )
+
+    end = end or date.today()
+    start = start or end - timedelta(days=89)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days > MAX_SERIES_DAYS:
+        raise HTTPException(status_code=400, detail="Date range is too long")
+
+    series = PaymentSeriesPublic(
+        kind=kind,
+        granularity=granularity,
+        start=start,
+        end=end,
+        window=window,
+        data=crud.get_payment_series(
+            session=session, kind=kind, granularity=granularity,
+            start=start, end=end, window=window, currency=currency
+        )
+    )
+
+    etag = f'"{hashlib.md5(series.model_dump_json().encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={SERIES_MAX_AGE}"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return series
 
 
 @router.get("/{order_id}", response_model=PaymentPublic)
-async def get_payment_by_order_id(
+def get_payment_by_order_id(
     *,
-    payhere_service: PayHereServiceDep,
+    session: SessionDep,
     order_id: int
 ) -> Any:
     """
     Get payment details by order_id.
+    The status is the stored one, kept current by PayHere webhooks and the
+    background reconciler.
 
     Args:
         order_id: The order ID to retrieve
@@ -65,7 +169,7 @@ async def get_payment_by_order_id(
     Returns:
         Payment details
     """
-    payment = await payhere_service.get_payment_by_order_id(
-        order_id=order_id)
+    payment = crud.get_payment_by_order_id(
+        session=session, order_id=order_id)
 
     return payment
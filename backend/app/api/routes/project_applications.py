@@ -2,9 +2,10 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import func, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CurrentUser, CursorDep, SessionDep
 from app.models import (
     ProjectApplication,
     ProjectApplicationCreate,
@@ -26,7 +27,7 @@ from app.models import (
     CanReviewResponse
 )
 from app import crud
-from app.utils import calculate_pagination_meta_from_page, page_to_skip
+from app.utils import calculate_pagination_meta_from_page, get_next_cursor, page_to_skip
 
 router = APIRouter(prefix="/applications", tags=["project_applications"])
 
@@ -82,9 +83,10 @@ def create_application(
 
 
 @router.get("/", response_model=ProjectApplicationsPublic)
-def read_applications(
-    session: SessionDep,
-    current_user: CurrentUser,
+async def read_applications(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    after: CursorDep,
     page: int = 1,
     limit: int = 100
 ) -> Any:
@@ -93,59 +95,52 @@ def read_applications(
     - ADMIN users can see all applications
     - VOLUNTEER users can see only their own applications
     - REQUESTER users can see applications for their own projects
+    Pass meta.next_cursor back as ?cursor= for keyset paging.
     """
     skip = page_to_skip(page, limit)
 
     if current_user.role == UserRole.ADMIN:
         # Admins can see all applications
-        applications, total = crud.get_all_applications(
-            session=session, skip=skip, limit=limit
+        applications, total = await crud.get_all_applications_async(
+            session=session, skip=skip, limit=limit, after=after
         )
     elif current_user.role == UserRole.VOLUNTEER:
         # Volunteers can see only their own applications
-        applications, total = crud.get_applications_by_volunteer_id(
-            session=session, volunteer_id=current_user.id, skip=skip, limit=limit
+        applications, total = await crud.get_applications_by_volunteer_id_async(
+            session=session, volunteer_id=current_user.id, skip=skip, limit=limit, after=after
         )
     elif current_user.role == UserRole.REQUESTER:
         # Requesters can see applications for their own projects
-        # First get all projects by this requester
-        statement = select(Project.id).where(
+        project_ids = select(Project.id).where(
             Project.requester_id == current_user.id)
-        project_ids = session.exec(statement).all()
-
-        if not project_ids:
-            # No projects, no applications
-            meta = calculate_pagination_meta_from_page(
-                total=0, page=page, limit=limit)
-            return ProjectApplicationsPublic(data=[], meta=meta)
-
-        # Get applications for these projects
         statement = (
             select(ProjectApplication)
             .where(ProjectApplication.project_id.in_(project_ids))
-            .offset(skip)
-            .limit(limit)
-            .order_by(ProjectApplication.created_at.desc())
+            .options(
+                selectinload(ProjectApplication.volunteer),
+                selectinload(ProjectApplication.project)
+            )
         )
-        applications = session.exec(statement).all()
-
-        count_statement = select(func.count(ProjectApplication.id)).where(
-            ProjectApplication.project_id.in_(project_ids)
+        applications, total = await crud.get_page_async(
+            session=session, statement=statement,
+            columns=[ProjectApplication.created_at, ProjectApplication.id],
+            skip=skip, limit=limit, after=after
         )
-        total = session.exec(count_statement).one()
     else:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
     meta = calculate_pagination_meta_from_page(
-        total=total, page=page, limit=limit)
+        total=total, page=page, limit=limit,
+        next_cursor=get_next_cursor(applications, limit, lambda a: (a.created_at, a.id)))
     return ProjectApplicationsPublic(data=applications, meta=meta)
 
 
 @router.get("/projects/{project_id}", response_model=ProjectApplicationsPublic)
-def read_project_applications(
-    session: SessionDep,
-    current_user: CurrentUser,
+async def read_project_applications(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     project_id: uuid.UUID,
+    after: CursorDep,
     page: int = 1,
     limit: int = 100
 ) -> Any:
@@ -156,7 +151,7 @@ def read_project_applications(
     - VOLUNTEER users with reviewer permission can see applications
     """
     # Check if project exists
-    project = crud.get_project_by_id(session=session, project_id=project_id)
+    project = await crud.get_project_by_id_async(session=session, project_id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -166,7 +161,7 @@ def read_project_applications(
         pass
     elif current_user.role in [UserRole.REQUESTER, UserRole.VOLUNTEER]:
         # Check if user has permission to review applications for this project
-        has_permission = crud.check_reviewer_permission(
+        has_permission = await crud.check_reviewer_permission_async(
             session=session,
             project_id=project_id,
             user_id=current_user.id
@@ -180,12 +175,13 @@ def read_project_applications(
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
     skip = page_to_skip(page, limit)
-    applications, total = crud.get_applications_by_project_id(
-        session=session, project_id=project_id, skip=skip, limit=limit
+    applications, total = await crud.get_applications_by_project_id_async(
+        session=session, project_id=project_id, skip=skip, limit=limit, after=after
     )
 
     meta = calculate_pagination_meta_from_page(
-        total=total, page=page, limit=limit)
+        total=total, page=page, limit=limit,
+        next_cursor=get_next_cursor(applications, limit, lambda a: (a.created_at, a.id)))
     return ProjectApplicationsPublic(data=applications, meta=meta)
 
 
@@ -5,15 +5,17 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import select
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncSessionDep, CurrentUser, CursorDep, SessionDep
 from app.models import (
+    Comment,
     CommentCreate,
     CommentPublic,
     CommentsPublic,
     CommentUpdate,
     Message,
-    Meta,
+    ProjectThread,
     ProjectThreadCreate,
+    ProjectThreadSort,
     ProjectThreadUpdate,
     ProjectThreadPublic,
     ProjectThreadsPublic,
@@ -22,30 +24,59 @@ from app.models import (
     RepliesPublic,
     ReplyUpdate,
 )
+from app.utils import calculate_pagination_meta_from_page, get_next_cursor
 
 router = APIRouter(prefix="/projects", tags=["project-threads"])
 
+# Comments on the thread detail, and replies shown under each comment
+COMMENT_LIMIT = 20
+REPLY_LIMIT = 3
+
+
+def comment_public(comment: Comment, reply_limit: int) -> CommentPublic:
+    """A comment with its first replies and the cursor to load the rest"""
+    return CommentPublic.model_validate(comment, update={
+        "replies_next_cursor": get_next_cursor(
+            comment.replies, reply_limit, lambda r: (r.created_at, r.id)),
+    })
+
+
+def thread_public(
+    thread: ProjectThread, comment_limit: int, reply_limit: int
+) -> ProjectThreadPublic:
+    """A thread with its first comments and the cursor to load more"""
+    return ProjectThreadPublic.model_validate(thread, update={
+        "comments": [comment_public(comment, reply_limit) for comment in thread.comments],
+        "comments_next_cursor": get_next_cursor(
+            thread.comments, comment_limit, lambda c: (c.created_at, c.id)),
+    })
+
+
 @router.get("/{project_id}/threads", response_model=ProjectThreadsPublic)
-def read_project_threads(
+async def read_project_threads(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100,
+    sort: ProjectThreadSort = ProjectThreadSort.CREATED,
 ) -> Any:
     """
-    Retrieve threads for a project.
+    Retrieve threads for a project, newest first or, with sort=activity,
+    most recently active first. Threads come with their comment and reply
+    counts but without their comments.
     """
-    project = crud.get_project_by_id(session=session, project_id=project_id)
+    project = await crud.get_project_by_id_async(session=session, project_id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    threads, count = crud.get_project_threads_by_project_id(
-        session=session, project_id=project_id, skip=skip, limit=limit
+    threads, count = await crud.get_project_threads_by_project_id_async(
+        session=session, project_id=project_id, skip=skip, limit=limit, sort=sort
     )
     return ProjectThreadsPublic(
         data=threads,
-        meta=Meta(total=count, page=skip // limit + 1, totalPages=(count + limit - 1) // limit),
+        meta=calculate_pagination_meta_from_page(
+            total=count, page=skip // limit + 1, limit=limit),
     )
 
 
@@ -75,15 +106,24 @@ def create_project_thread(
 
 @router.get("/threads/{thread_id}", response_model=ProjectThreadPublic)
 def read_project_thread(
-    *, session: SessionDep, thread_id: uuid.UUID
+    *,
+    session: SessionDep,
+    thread_id: uuid.UUID,
+    comment_limit: int = Query(default=COMMENT_LIMIT, ge=1, le=100),
+    reply_limit: int = Query(default=REPLY_LIMIT, ge=1, le=100),
 ) -> Any:
     """
-    Get a specific thread by ID.
+    Get a specific thread by ID, with its first comments and their first
+    replies. The next_cursor fields load more through the comment and
+    reply listings.
     """
-    thread = crud.get_project_thread_by_id(session=session, thread_id=thread_id)
+    thread = crud.get_project_thread_by_id(
+        session=session, thread_id=thread_id,
+        comment_limit=comment_limit, reply_limit=reply_limit
+    )
     if not thread:
         raise HTTPException(status_code=404, detail="Thread not found")
-    return thread
+    return thread_public(thread, comment_limit, reply_limit)
 
 @router.patch("/threads/{thread_id}", response_model=ProjectThreadPublic)
 def update_thread(
@@ -96,19 +136,23 @@ def update_thread(
     """
     Update a project thread.
     """
-    thread = crud.get_project_thread_by_id(session=session, thread_id=thread_id)
-    if not thread:
+    author_id = crud.get_project_thread_author_id(session=session, thread_id=thread_id)
+    if not author_id:
         raise HTTPException(status_code=404, detail="Thread not found")
     
     # Check if the current user is the author of the thread
-    if thread.author_id != current_user.id:
+    if author_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Update the thread
-    thread = crud.update_project_thread(
-        session=session, db_thread=thread, thread_in=thread_in
-    )
-    return thread
+    db_thread = session.get(ProjectThread, thread_id)
+    if not db_thread:
+        raise HTTPException(status_code=404, detail="Thread not found")
+    crud.update_project_thread(session=session, db_thread=db_thread, thread_in=thread_in)
+    thread = crud.get_project_thread_by_id(session=session, thread_id=thread_id)
+    if not thread:
+        raise HTTPException(status_code=404, detail="Thread not found")
+    return thread_public(thread, COMMENT_LIMIT, REPLY_LIMIT)
 
 
 @router.delete("/threads/{thread_id}", response_model=Message)
@@ -121,16 +165,16 @@ def delete_thread(
     """
     Delete a project thread.
     """
-    thread = crud.get_project_thread_by_id(session=session, thread_id=thread_id)
-    if not thread:
+    author_id = crud.get_project_thread_author_id(session=session, thread_id=thread_id)
+    if not author_id:
         raise HTTPException(status_code=404, detail="Thread not found")
     
     # Check if the current user is the author of the thread
-    if thread.author_id != current_user.id:
+    if author_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    # Delete the thread (this will cascade delete all comments and replies)
-    crud.delete_project_thread(session=session, db_thread=thread)
+    # Delete the thread together with all its comments and replies
+    crud.delete_project_thread(session=session, thread_id=thread_id)
     return Message(message="Thread deleted successfully")
 
 
@@ -139,22 +183,27 @@ def read_comments(
     *,
     session: SessionDep,
     thread_id: uuid.UUID,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 100,
+    reply_limit: int = Query(default=REPLY_LIMIT, ge=1, le=100),
 ) -> Any:
     """
-    Retrieve comments for a thread.
+    Retrieve comments for a thread, oldest first, each with its first replies.
     """
-    thread = crud.get_project_thread_by_id(session=session, thread_id=thread_id)
-    if not thread:
+    if not crud.get_project_thread_author_id(session=session, thread_id=thread_id):
         raise HTTPException(status_code=404, detail="Thread not found")
 
     comments, count = crud.get_comments_by_thread_id(
-        session=session, thread_id=thread_id, skip=skip, limit=limit
+        session=session, thread_id=thread_id, skip=skip, limit=limit,
+        after=after, reply_limit=reply_limit
     )
     return CommentsPublic(
-        data=comments,
-        meta=Meta(total=count, page=skip // limit + 1, totalPages=(count + limit - 1) // limit),
+        data=[comment_public(comment, reply_limit) for comment in comments],
+        meta=calculate_pagination_meta_from_page(
+            total=count, page=skip // limit + 1, limit=limit,
+            next_cursor=get_next_cursor(comments, limit, lambda c: (c.created_at, c.id)),
+        ),
     )
 
 
@@ -171,8 +220,7 @@ def create_comment(
     """
     print(f"Received comment data: {comment_in}")
     
-    thread = crud.get_project_thread_by_id(session=session, thread_id=thread_id)
-    if not thread:
+    if not crud.get_project_thread_author_id(session=session, thread_id=thread_id):
         raise HTTPException(status_code=404, detail="Thread not found")
 
     comment = crud.create_comment(
@@ -219,22 +267,26 @@ def read_replies(
     *,
     session: SessionDep,
     comment_id: uuid.UUID,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
     """
-    Retrieve replies for a comment.
+    Retrieve replies for a comment, oldest first.
     """
     comment = crud.get_comment_by_id(session=session, comment_id=comment_id)
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
 
     replies, count = crud.get_replies_by_comment_id(
-        session=session, comment_id=comment_id, skip=skip, limit=limit
+        session=session, comment_id=comment_id, skip=skip, limit=limit, after=after
     )
     return RepliesPublic(
         data=replies,
-        meta=Meta(total=count, page=skip // limit + 1, totalPages=(count + limit - 1) // limit),
+        meta=calculate_pagination_meta_from_page(
+            total=count, page=skip // limit + 1, limit=limit,
+            next_cursor=get_next_cursor(replies, limit, lambda r: (r.created_at, r.id)),
+        ),
     )
 
 
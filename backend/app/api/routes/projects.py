@@ -2,17 +2,17 @@ import uuid
 from typing import Any, Optional, Annotated
 
 from fastapi import APIRouter, HTTPException, Depends, Request, Cookie
-from sqlmodel import func, select
+from sqlmodel import select
 import jwt
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 
-from app.api.deps import CurrentUser, SessionDep, OptionalCurrentUser
+from app.api.deps import AsyncSessionDep, CurrentUser, CursorDep, SessionDep, OptionalCurrentUser
 from app.models import NotificationType, Project, ProjectCreate, ProjectPublic, ProjectsPublic, ProjectUpdate, Message, UserRole, ProjectStatus, User, TokenPayload, Meta, ProjectResponse
 from app.core import groq_utils, security
 from app.core.config import settings
 from app import crud
-from app.utils import calculate_pagination_meta, page_to_skip, calculate_pagination_meta_from_page
+from app.utils import calculate_pagination_meta, get_next_cursor, page_to_skip, calculate_pagination_meta_from_page
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -44,6 +44,7 @@ def create_project(
 def read_projects(
     session: SessionDep,
     current_user: CurrentUser,
+    after: CursorDep,
     page: int = 1,
     limit: int = 100
 ) -> Any:
@@ -54,17 +55,14 @@ def read_projects(
 
     if current_user.role == UserRole.ADMIN:
         # Admins can see all projects
-        count_statement = select(func.count()).select_from(Project)
-        total = session.exec(count_statement).one()
-
-        # Convert page to skip
         skip = page_to_skip(page, limit)
-        projects = crud.get_all_projects(
-            session=session, skip=skip, limit=limit)
+        projects, total = crud.get_all_projects(
+            session=session, skip=skip, limit=limit, after=after)
 
         # Calculate pagination metadata
         meta = calculate_pagination_meta_from_page(
-            total=total, page=page, limit=limit)
+            total=total, page=page, limit=limit,
+            next_cursor=get_next_cursor(projects, limit, lambda p: (p.created_at, p.id)))
         return ProjectsPublic(data=projects, meta=meta)
     raise HTTPException(status_code=403, detail="Insufficient permissions")
 
@@ -72,60 +70,49 @@ def read_projects(
 def read_user_projects(
     session: SessionDep,
     current_user: CurrentUser,
+    after: CursorDep,
     page: int = 1,
     limit: int = 100
 ) -> Any:
     """
     Retrieve projects created by the current user.
     """
-    count_statement = (
-        select(func.count())
-        .select_from(Project)
-        .where(Project.requester_id == current_user.id)
-    )
-    total = session.exec(count_statement).one()
-
     # Convert page to skip
     skip = page_to_skip(page, limit)
-    
-    statement = (
-        select(Project)
-        .where(Project.requester_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
+
+    statement = select(Project).where(Project.requester_id == current_user.id)
+    projects, total = crud.get_page(
+        session=session, statement=statement,
+        columns=[Project.created_at, Project.id], skip=skip, limit=limit,
+        after=after
     )
-    projects = session.exec(statement).all()
 
     # Calculate pagination metadata
     meta = calculate_pagination_meta_from_page(
-        total=total, page=page, limit=limit)
+        total=total, page=page, limit=limit,
+        next_cursor=get_next_cursor(projects, limit, lambda p: (p.created_at, p.id)))
     return ProjectsPublic(data=projects, meta=meta)
 
 @router.get("/approved", response_model=ProjectsPublic)
-def read_approved_projects(
-    session: SessionDep,
+async def read_approved_projects(
+    session: AsyncSessionDep,
+    after: CursorDep,
     page: int = 1,
     limit: int = 100
 ) -> Any:
     """
     Retrieve approved projects.
     """
-    count_statement = (
-        select(func.count())
-        .select_from(Project)
-        .where(Project.status == ProjectStatus.APPROVED)
-    )
-    total = session.exec(count_statement).one()
-
     # Convert page to skip
     skip = page_to_skip(page, limit)
-    projects = crud.get_approved_projects(
-        session=session, skip=skip, limit=limit
+    projects, total = await crud.get_approved_projects_async(
+        session=session, skip=skip, limit=limit, after=after
     )
 
     # Calculate pagination metadata
     meta = calculate_pagination_meta_from_page(
-        total=total, page=page, limit=limit)
+        total=total, page=page, limit=limit,
+        next_cursor=get_next_cursor(projects, limit, lambda p: (p.created_at, p.id)))
     return ProjectsPublic(data=projects, meta=meta)
 
 
@@ -133,6 +120,7 @@ def read_approved_projects(
 def read_pending_projects(
     session: SessionDep,
     current_user: CurrentUser,
+    after: CursorDep,
     page: int = 1,
     limit: int = 100
 ) -> Any:
@@ -143,22 +131,19 @@ def read_pending_projects(
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
-    count_statement = (
-        select(func.count())
-        .select_from(Project)
-        .where(Project.status == ProjectStatus.PENDING)
-    )
-    total = session.exec(count_statement).one()
-
     # Convert page to skip
     skip = page_to_skip(page, limit)
-    projects = crud.get_pending_projects(
-        session=session, skip=skip, limit=limit
+    statement = select(Project).where(Project.status == ProjectStatus.PENDING)
+    projects, total = crud.get_page(
+        session=session, statement=statement,
+        columns=[Project.created_at, Project.id], skip=skip, limit=limit,
+        after=after
     )
 
     # Calculate pagination metadata
     meta = calculate_pagination_meta_from_page(
-        total=total, page=page, limit=limit)
+        total=total, page=page, limit=limit,
+        next_cursor=get_next_cursor(projects, limit, lambda p: (p.created_at, p.id)))
     return ProjectsPublic(data=projects, meta=meta)
 
 
@@ -11,6 +11,9 @@ Flow:
 4. User completes payment on PayHere
 5. Webhook updates payment status
 6. Sponsorship is linked to successful payment via order_id
+
+Listings load each page's payments with it; payment statuses are kept
+current by PayHere webhooks and the background reconciler.
 """
 
 import logging
@@ -19,7 +22,8 @@ import uuid
 from fastapi import APIRouter, HTTPException
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep, PayHereServiceDep
+from app.api.deps import CurrentUser, CursorDep, SessionDep, PayHereServiceDep
+from app.utils import InvalidCursorError, get_next_cursor
 from app.models import (
     SponsorshipCreate,
     PaymentInitiationResponse,
@@ -107,7 +111,8 @@ def initiate_sponsorship(
         )
 
         # Initiate payment through PayHere service
-        payment_response = payhere_service.initiate_payment(payment_in)
+        payment_response = payhere_service.initiate_payment(
+            session=session, payment_in=payment_in)
 
         # Create sponsorship record linked to the payment
         crud.create_sponsorship(
@@ -138,11 +143,11 @@ def initiate_sponsorship(
 
 
 @router.get("/my-sponsorships", response_model=SponsorshipsPublic, status_code=200)
-async def get_my_sponsorships(
+def get_my_sponsorships(
     *,
     session: SessionDep,
-    payhere_service: PayHereServiceDep,
     current_user: CurrentUser,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 100
 ) -> SponsorshipsPublic:
@@ -151,10 +156,11 @@ async def get_my_sponsorships(
 
     This endpoint:
     1. Fetches all sponsorships made by the current user, ordered by order_id descending
-    2. For each sponsorship, retrieves payment details from PayHere service
-    3. Returns sponsorship data with updated payment status from PayHere
+    2. Includes the payment details of each sponsorship
+    3. Returns sponsorship data with the stored payment status
 
-    The payment status is fetched in real-time from PayHere API to ensure accuracy.
+    Payment statuses are kept up to date by PayHere webhooks and the
+    background reconciler, so reading them does not call PayHere.
 
     Requires authentication.
 
@@ -171,25 +177,18 @@ async def get_my_sponsorships(
     """
     try:
         # Get sponsorships from database ordered by order_id
-        sponsorships = crud.get_sponsorships_by_sponsor_id(
+        sponsorships, total = crud.get_sponsorships_by_sponsor_id(
             session=session,
             sponsor_id=current_user.id,
             skip=skip,
-            limit=limit
-        )
-
-        # Get total count for pagination
-        total = crud.count_sponsorships_by_sponsor_id(
-            session=session,
-            sponsor_id=current_user.id
+            limit=limit,
+            after=after
         )
 
-        # Fetch payment details for each sponsorship using PayHere service
+        # Attach payment details to each sponsorship
         sponsorships_with_payments = []
         for sponsorship in sponsorships:
-            # Use PayHere service to get payment details
-            payment = await payhere_service.get_payment_by_order_id(sponsorship.order_id)
-
+            payment = sponsorship.payment
             if payment and sponsorship.sponsor and sponsorship.recipient:
                 # Create SponsorshipPublic with payment and user info
                 sponsorship_public = SponsorshipPublic(
@@ -250,7 +249,8 @@ async def get_my_sponsorships(
         meta = Meta(
             page=current_page,
             total=total,
-            totalPages=total_pages
+            totalPages=total_pages,
+            next_cursor=get_next_cursor(sponsorships, limit, lambda s: (s.order_id,))
         )
 
         logger.info(
@@ -262,6 +262,8 @@ async def get_my_sponsorships(
             meta=meta
         )
 
+    except (HTTPException, InvalidCursorError):
+        raise
     except Exception as e:
         logger.error(
             f"Error fetching sponsorships for user {current_user.id}: {str(e)}")
@@ -272,11 +274,11 @@ async def get_my_sponsorships(
 
 
 @router.get("/received", response_model=SponsorshipsPublic, status_code=200)
-async def get_received_sponsorships(
+def get_received_sponsorships(
     *,
     session: SessionDep,
-    payhere_service: PayHereServiceDep,
     current_user: CurrentUser,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 100
 ) -> SponsorshipsPublic:
@@ -285,10 +287,11 @@ async def get_received_sponsorships(
 
     This endpoint:
     1. Fetches all sponsorships received by the current user, ordered by order_id descending
-    2. For each sponsorship, retrieves payment details from PayHere service
-    3. Returns sponsorship data with updated payment status from PayHere
+    2. Includes the payment details of each sponsorship
+    3. Returns sponsorship data with the stored payment status
 
-    The payment status is fetched in real-time from PayHere API to ensure accuracy.
+    Payment statuses are kept up to date by PayHere webhooks and the
+    background reconciler, so reading them does not call PayHere.
 
     Requires authentication. Typically used by users with VOLUNTEER role.
 
@@ -305,25 +308,18 @@ async def get_received_sponsorships(
     """
     try:
         # Get sponsorships from database ordered by order_id
-        sponsorships = crud.get_sponsorships_by_recipient_id(
+        sponsorships, total = crud.get_sponsorships_by_recipient_id(
             session=session,
             recipient_id=current_user.id,
             skip=skip,
-            limit=limit
+            limit=limit,
+            after=after
         )
 
-        # Get total count for pagination
-        total = crud.count_sponsorships_by_recipient_id(
-            session=session,
-            recipient_id=current_user.id
-        )
-
-        # Fetch payment details for each sponsorship using PayHere service
+        # Attach payment details to each sponsorship
         sponsorships_with_payments = []
         for sponsorship in sponsorships:
-            # Use PayHere service to get payment details
-            payment = await payhere_service.get_payment_by_order_id(sponsorship.order_id)
-
+            payment = sponsorship.payment
             if payment and sponsorship.sponsor and sponsorship.recipient:
                 # Create SponsorshipPublic with payment and user info
                 sponsorship_public = SponsorshipPublic(
@@ -384,7 +380,8 @@ async def get_received_sponsorships(
         meta = Meta(
             page=current_page,
             total=total,
-            totalPages=total_pages
+            totalPages=total_pages,
+            next_cursor=get_next_cursor(sponsorships, limit, lambda s: (s.order_id,))
         )
 
         logger.info(
@@ -396,6 +393,8 @@ async def get_received_sponsorships(
             meta=meta
         )
 
+    except (HTTPException, InvalidCursorError):
+        raise
     except Exception as e:
         logger.error(
             f"Error fetching received sponsorships for user {current_user.id}: {str(e)}")
@@ -403,3 +402,135 @@ async def get_received_sponsorships(
             status_code=500,
             detail="Failed to retrieve received sponsorships"
         )
+
+
+@router.get("/all", response_model=SponsorshipsPublic, status_code=200)
+def get_all_sponsorships_admin(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    after: CursorDep,
+    skip: int = 0,
+    limit: int = 100
+) -> SponsorshipsPublic:
+    """
+    Get all sponsorships in the system (Admin only).
+
+    This endpoint:
+    1. Verifies the user is an admin
+    2. Fetches all sponsorships ordered by order_id descending
+    3. Returns sponsorship data with sponsor, recipient and payment details
+
+    Only accessible to users with ADMIN role.
+
+    Args:
+        skip: Number of records to skip (for pagination)
+        limit: Maximum number of records to return
+
+    Returns:
+        SponsorshipsPublic: List of all sponsorships with payment details and pagination metadata
+
+    Raises:
+        HTTPException 401: User not authenticated
+        HTTPException 403: User is not an admin
+        HTTPException 500: Server error while fetching sponsorships
+    """
+    # Check if user is admin
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=403,
+            detail="Only administrators can view all sponsorships"
+        )
+
+    try:
+        # Sponsors, recipients and payments are loaded with the page
+        sponsorships, total = crud.get_all_sponsorships(
+            session=session,
+            skip=skip,
+            limit=limit,
+            after=after
+        )
+
+        sponsorships_with_payments = []
+        for sponsorship in sponsorships:
+            payment = sponsorship.payment
+            if payment and sponsorship.sponsor and sponsorship.recipient:
+                sponsorship_public = SponsorshipPublic(
+                    id=sponsorship.id,
+                    sponsor_id=sponsorship.sponsor_id,
+                    recipient_id=sponsorship.recipient_id,
+                    order_id=sponsorship.order_id,
+                    created_at=sponsorship.created_at,
+                    message=sponsorship.message,
+                    sponsor=UserPublic(
+                        id=sponsorship.sponsor.id,
+                        email=sponsorship.sponsor.email,
+                        is_active=sponsorship.sponsor.is_active,
+                        is_superuser=sponsorship.sponsor.is_superuser,
+                        firstname=sponsorship.sponsor.firstname,
+                        lastname=sponsorship.sponsor.lastname,
+                        role=sponsorship.sponsor.role
+                    ),
+                    recipient=UserPublic(
+                        id=sponsorship.recipient.id,
+                        email=sponsorship.recipient.email,
+                        is_active=sponsorship.recipient.is_active,
+                        is_superuser=sponsorship.recipient.is_superuser,
+                        firstname=sponsorship.recipient.firstname,
+                        lastname=sponsorship.recipient.lastname,
+                        role=sponsorship.recipient.role
+                    ),
+                    payment=PaymentPublic(
+                        id=payment.id,
+                        merchant_id=payment.merchant_id,
+                        first_name=payment.first_name,
+                        last_name=payment.last_name,
+                        email=payment.email,
+                        phone=payment.phone,
+                        address=payment.address,
+                        city=payment.city,
+                        country=payment.country,
+                        order_id=payment.order_id,
+                        items=payment.items,
+                        currency=payment.currency,
+                        amount=payment.amount,
+                        status=payment.status,
+                        created_at=payment.created_at,
+                        updated_at=payment.updated_at
+                    )
+                )
+                sponsorships_with_payments.append(sponsorship_public)
+            else:
+                logger.warning(
+                    f"Payment or users not found for sponsorship {sponsorship.id} with order_id {sponsorship.order_id}"
+                )
+
+        # Calculate pagination metadata
+        total_pages = (total + limit - 1) // limit if limit > 0 else 1
+        current_page = (skip // limit) + 1 if limit > 0 else 1
+
+        meta = Meta(
+            page=current_page,
+            total=total,
+            totalPages=total_pages,
+            next_cursor=get_next_cursor(sponsorships, limit, lambda s: (s.order_id,))
+        )
+
+        logger.info(
+            f"Admin {current_user.id} retrieved {len(sponsorships_with_payments)} sponsorships"
+        )
+
+        return SponsorshipsPublic(
+            data=sponsorships_with_payments,
+            meta=meta
+        )
+
+    except (HTTPException, InvalidCursorError):
+        raise
+    except Exception as e:
+        logger.error(
+            f"Error fetching all sponsorships for admin {current_user.id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to retrieve sponsorships"
+        )
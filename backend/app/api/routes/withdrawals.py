@@ -8,11 +8,13 @@ A 6% fee is deducted from all withdrawals.
 
 import logging
 import uuid
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import CurrentUser, CursorDep, SessionDep
+from app.utils import InvalidCursorError, get_next_cursor
 from app.models import (
     WithdrawalRequest,
     WithdrawalPublic,
@@ -69,16 +71,20 @@ def request_withdrawal(
     *,
     session: SessionDep,
     current_user: CurrentUser,
-    withdrawal_request: WithdrawalRequest
+    withdrawal_request: WithdrawalRequest,
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None
 ) -> WithdrawalPublic:
     """
     Request a withdrawal of sponsorship funds.
 
     A 6% fee will be deducted from the requested amount.
     The withdrawal must not exceed the available balance.
+    Retrying with the same Idempotency-Key header returns the original
+    withdrawal instead of creating another one.
 
     Args:
         withdrawal_request: Withdrawal details including amount and bank information
+        idempotency_key: Optional client-generated key identifying this request
 
     Returns:
         WithdrawalPublic: Created withdrawal with fee calculation
@@ -95,21 +101,7 @@ def request_withdrawal(
                 detail="Withdrawal amount must be greater than 0"
             )
 
-        # Check available balance
-        balance_data = crud.get_withdrawal_balance(
-            session=session,
-            recipient_id=current_user.id
-        )
-
-        available_balance = balance_data["available_balance"]
-
-        if withdrawal_request.amount > available_balance:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient balance. Available: {available_balance:.2f}, Requested: {withdrawal_request.amount:.2f}"
-            )
-
-        # Create withdrawal
+        # Create withdrawal; the balance is checked under the recipient's lock
         withdrawal = crud.create_withdrawal(
             session=session,
             recipient_id=current_user.id,
@@ -117,7 +109,8 @@ def request_withdrawal(
             bank_account_number=withdrawal_request.bank_account_number,
             bank_name=withdrawal_request.bank_name,
             account_holder_name=withdrawal_request.account_holder_name,
-            fee_percentage=6.0
+            fee_percentage=6.0,
+            idempotency_key=idempotency_key
         )
 
         logger.info(
@@ -153,6 +146,8 @@ def request_withdrawal(
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(
             f"Error creating withdrawal for user {current_user.id}: {str(e)}")
@@ -167,6 +162,7 @@ def get_my_withdrawals(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 100
 ) -> WithdrawalsPublic:
@@ -186,17 +182,12 @@ def get_my_withdrawals(
     """
     try:
         # Get withdrawals from database
-        withdrawals = crud.get_withdrawals_by_recipient(
+        withdrawals, total = crud.get_withdrawals_by_recipient(
             session=session,
             recipient_id=current_user.id,
             skip=skip,
-            limit=limit
-        )
-
-        # Get total count for pagination
-        total = crud.count_withdrawals_by_recipient(
-            session=session,
-            recipient_id=current_user.id
+            limit=limit,
+            after=after
         )
 
         # Convert to public models
@@ -234,7 +225,8 @@ def get_my_withdrawals(
         meta = Meta(
             page=current_page,
             total=total,
-            totalPages=total_pages
+            totalPages=total_pages,
+            next_cursor=get_next_cursor(withdrawals, limit, lambda w: (w.requested_at, w.id))
         )
 
         logger.info(
@@ -245,6 +237,8 @@ def get_my_withdrawals(
             meta=meta
         )
 
+    except (HTTPException, InvalidCursorError):
+        raise
     except Exception as e:
         logger.error(
             f"Error fetching withdrawals for user {current_user.id}: {str(e)}")
@@ -259,6 +253,7 @@ def get_all_withdrawals(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    after: CursorDep,
     skip: int = 0,
     limit: int = 100
 ) -> WithdrawalsPublic:
@@ -287,22 +282,19 @@ def get_all_withdrawals(
                 detail="Only administrators can view all withdrawals"
             )
 
-        # Get all withdrawals from database (we'll create a new crud function)
-        withdrawals = crud.get_all_withdrawals(
+        # Get all withdrawals from database
+        withdrawals, total = crud.get_all_withdrawals(
             session=session,
             skip=skip,
-            limit=limit
+            limit=limit,
+            after=after
         )
 
-        # Get total count for pagination
-        total = crud.count_all_withdrawals(session=session)
-
         # Convert to public models with recipient info
         withdrawals_public = []
         for withdrawal in withdrawals:
-            # Get recipient user info
-            recipient = crud.get_user_by_id(
-                session=session, user_id=withdrawal.recipient_id)
+            # Recipient was loaded with the page
+            recipient = withdrawal.recipient
 
             withdrawal_public = WithdrawalPublic(
                 id=withdrawal.id,
@@ -336,7 +328,8 @@ def get_all_withdrawals(
         meta = Meta(
             page=current_page,
             total=total,
-            totalPages=total_pages
+            totalPages=total_pages,
+            next_cursor=get_next_cursor(withdrawals, limit, lambda w: (w.requested_at, w.id))
         )
 
         logger.info(
@@ -347,7 +340,7 @@ def get_all_withdrawals(
             meta=meta
         )
 
-    except HTTPException:
+    except (HTTPException, InvalidCursorError):
         raise
     except Exception as e:
         logger.error(f"Error fetching all withdrawals: {str(e)}")
@@ -110,6 +110,53 @@ class Settings(BaseSettings):
     PAYHERE_API_BASE_URL: str = "https://sandbox.payhere.lk"  # Default to sandbox
     PAYHERE_TOKEN_URL: str = "https://sandbox.payhere.lk/merchant/v1/oauth/token"
     PAYHERE_RETRIEVAL_URL: str = "https://sandbox.payhere.lk/merchant/v1/payment/search"
+    # Retrieval lookups the reconciler may have in flight at once, and how
+    # long a retrieval answer (including "no payment yet") is reused
+    PAYHERE_LOOKUP_CONCURRENCY: int = 10
+    PAYHERE_RETRIEVAL_CACHE_TTL: float = 30.0
+    # One pooled client is shared by every PayHere call; connections are kept
+    # alive between requests instead of paying a TLS handshake per call
+    PAYHERE_HTTP2: bool = True
+    PAYHERE_MAX_CONNECTIONS: int = 20
+    PAYHERE_KEEPALIVE_EXPIRY: float = 30.0
+    PAYHERE_TIMEOUT: float = 10.0
+    PAYHERE_CONNECT_TIMEOUT: float = 5.0
+    # The OAuth token is shared by all workers through the database. It is
+    # renewed in the background this many seconds before it expires, and
+    # callers never use it in its last PAYHERE_TOKEN_EXPIRY_MARGIN seconds.
+    # Workers waiting for another worker's renewal check back this often
+    PAYHERE_TOKEN_REFRESH_AHEAD: float = 120.0
+    PAYHERE_TOKEN_EXPIRY_MARGIN: float = 60.0
+    PAYHERE_TOKEN_RETRY_INTERVAL: float = 10.0
+    PAYHERE_TOKEN_WAIT_INTERVAL: float = 0.1
+    # Background reconciliation of unsettled payments with the retrieval API:
+    # how often each worker claims a batch and how large it is, how long a
+    # new payment is left to its webhook, how long before a payment is
+    # checked again, and for how long payments PayHere has no record of
+    # (abandoned checkouts) keep being checked
+    PAYHERE_RECONCILE_ENABLED: bool = True
+    PAYHERE_RECONCILE_INTERVAL: float = 30.0
+    PAYHERE_RECONCILE_BATCH_SIZE: int = 100
+    PAYHERE_RECONCILE_MIN_AGE: float = 300.0
+    PAYHERE_RECONCILE_RECHECK_AFTER: float = 600.0
+    PAYHERE_RECONCILE_MAX_AGE: float = 86400.0
+    # Webhook notifications are recorded on the request path and applied in
+    # batches off it; each worker applies the ones it received right away and
+    # polls for the rest (e.g. recorded by other workers) this often
+    PAYHERE_WEBHOOK_POLL_INTERVAL: float = 1.0
+    PAYHERE_WEBHOOK_BATCH_SIZE: int = 500
+
+    # Notification fan-out between workers: "postgres" uses LISTEN/NOTIFY on
+    # the app database, "memory" only reaches connections in the same process
+    NOTIFICATION_BROKER: Literal["memory", "postgres"] = "postgres"
+    # Per-connection SSE buffer; when a slow client lets it fill up, either
+    # drop the oldest message, coalesce the overflow into one "N new
+    # notifications" event, or disconnect the client
+    SSE_QUEUE_SIZE: int = 100
+    SSE_OVERFLOW_POLICY: Literal["drop_oldest", "coalesce", "disconnect"] = "coalesce"
+    # One shared ticker sends keepalives to idle streams, sweeping a shard of
+    # connections at a time so each one hears from us once per interval
+    SSE_HEARTBEAT_INTERVAL: float = 30.0
 
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "changethis":
@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud
@@ -6,6 +7,10 @@ from app.models import User, UserCreate, UserRole
 
 engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
 
+# Async engine for routes that run on the event loop. psycopg 3 ships both a
+# sync and an async driver, so the same URI works for both engines.
+async_engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
 # otherwise, SQLModel might fail to initialize relationships properly
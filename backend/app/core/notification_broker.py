@@ -0,0 +1,168 @@
+"""
+Notification brokers.
+
+A broker carries notifications between API workers. Every worker publishes
+through the broker and receives every published notification back, then fans
+it out to the SSE connections it holds locally.
+
+- InMemoryNotificationBroker: single process only, used for unit tests.
+- PostgresNotificationBroker: LISTEN/NOTIFY on the app database, so several
+  uvicorn workers (or hosts) share notifications without extra infrastructure.
+"""
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+import psycopg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DeliverCallback = Callable[[UUID, dict[str, Any]], Awaitable[None]]
+
+
+class NotificationBroker(ABC):
+    """Interface shared by all brokers"""
+
+    @abstractmethod
+    async def start(self, deliver: DeliverCallback) -> None: ...
+
+    @abstractmethod
+    async def stop(self) -> None: ...
+
+    @abstractmethod
+    async def publish(self, user_id: UUID, notification_data: dict[str, Any]) -> None: ...
+
+    async def publish_many(self, notifications: list[tuple[UUID, dict[str, Any]]]) -> None:
+        for user_id, notification_data in notifications:
+            await self.publish(user_id, notification_data)
+
+
+class InMemoryNotificationBroker(NotificationBroker):
+    """Delivers straight back to the local process"""
+
+    def __init__(self) -> None:
+        self._deliver: DeliverCallback | None = None
+
+    async def start(self, deliver: DeliverCallback) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, user_id: UUID, notification_data: dict[str, Any]) -> None:
+        if self._deliver:
+            await self._deliver(user_id, notification_data)
+
+
+class PostgresNotificationBroker(NotificationBroker):
+    """
+    Fan-out over Postgres LISTEN/NOTIFY.
+    Each worker keeps one listening connection; publishing is a pg_notify on a
+    separate connection, so a slow listener never blocks publishers.
+    """
+
+    CHANNEL = "notifications"
+    RECONNECT_DELAY = 1.0
+    START_TIMEOUT = 10.0
+
+    def __init__(self, conninfo: str | None = None, channel: str = CHANNEL) -> None:
+        self.conninfo = conninfo or make_url(
+            str(settings.SQLALCHEMY_DATABASE_URI)
+        ).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._deliver: DeliverCallback | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._publisher: psycopg.AsyncConnection[Any] | None = None
+        self._publisher_loop: asyncio.AbstractEventLoop | None = None
+        self._publish_lock = asyncio.Lock()
+        self._listening = asyncio.Event()
+
+    async def start(self, deliver: DeliverCallback) -> None:
+        self._deliver = deliver
+        # Loop-bound, recreated per start so the broker can be restarted on a
+        # new event loop (e.g. one per TestClient)
+        self._listening = asyncio.Event()
+        self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._listening.wait(), self.START_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Keep retrying in the background rather than blocking startup
+            logger.warning("Notification listener not connected yet")
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._publisher and self._publisher_loop is asyncio.get_running_loop():
+            await self._publisher.close()
+        self._publisher = None
+
+    async def publish(self, user_id: UUID, notification_data: dict[str, Any]) -> None:
+        await self.publish_many([(user_id, notification_data)])
+
+    async def publish_many(self, notifications: list[tuple[UUID, dict[str, Any]]]) -> None:
+        # One round trip for the whole batch; each notification stays its own
+        # NOTIFY so payloads remain under the 8000 byte limit
+        payloads = [
+            json.dumps({"user_id": str(user_id), "data": notification_data})
+            for user_id, notification_data in notifications
+        ]
+        loop = asyncio.get_running_loop()
+        if self._publisher_loop is not loop:
+            # Called from a new event loop (scripts, tests using asyncio.run);
+            # the old connection and lock belong to the previous loop
+            self._publisher = None
+            self._publish_lock = asyncio.Lock()
+            self._publisher_loop = loop
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.closed:
+                self._publisher = await psycopg.AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                )
+            await self._publisher.execute(
+                "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+                (self.channel, payloads),
+            )
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                ) as conn:
+                    await conn.execute(f'LISTEN "{self.channel}"')
+                    self._listening.set()
+                    async for notify in conn.notifies():
+                        await self._dispatch(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification listener lost connection: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+
+    async def _dispatch(self, payload: str) -> None:
+        if not self._deliver:
+            return
+        try:
+            message = json.loads(payload)
+            await self._deliver(UUID(message["user_id"]), message["data"])
+        except Exception as e:
+            logger.error(f"Failed to dispatch notification: {e}")
+
+
+def create_notification_broker() -> NotificationBroker:
+    if settings.NOTIFICATION_BROKER == "postgres":
+        return PostgresNotificationBroker()
+    return InMemoryNotificationBroker()
@@ -1,54 +1,271 @@
-from typing import Dict, List
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 import asyncio
 import json
 
+from app.core.config import settings
+from app.core.notification_broker import NotificationBroker, create_notification_broker
+from app.models import Notification, Payment, PaymentKind
+from app.utils import decode_cursor, encode_cursor
+
+# Encoded once and shared by every idle connection
+KEEPALIVE_FRAME = f"data: {json.dumps({'type': 'keepalive'})}\n\n"
+
+
+def notification_event_id(created_at: datetime, notification_id: UUID) -> str:
+    """
+    SSE event id for a notification: a cursor over (created_at, id), so
+    notifications created in the same microsecond still get distinct ids
+    """
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return encode_cursor(created_at, notification_id)
+
+
+def parse_event_id(event_id: str) -> tuple[datetime, UUID] | None:
+    """(created_at, id) key of a notification event id, None if it is not one"""
+    try:
+        key = decode_cursor(event_id)
+    except ValueError:
+        return None
+    if len(key) != 2 or not isinstance(key[0], datetime) or not isinstance(key[1], UUID):
+        return None
+    return key[0], key[1]
+
+
+def frame_event_id(frame: str) -> str | None:
+    """Event id of an encoded SSE frame, if it carries one"""
+    if not frame.startswith("id: "):
+        return None
+    return frame[4:frame.index("\n")]
+
+
+def notification_event_data(notification: Notification) -> dict[str, Any]:
+    """Payload pushed to SSE clients for a stored notification"""
+    return {
+        "id": str(notification.id),
+        "type": notification.type,
+        "title": notification.title,
+        "message": notification.message,
+        "action_url": notification.action_url,
+        "created_at": notification.created_at.replace(tzinfo=timezone.utc).isoformat(),
+        "is_read": notification.is_read
+    }
+
+
+def payment_status_event_data(payment: Payment, kind: PaymentKind) -> dict[str, Any]:
+    """
+    Payload pushed to a payment's participants when its status changes, so
+    clients can wait for it instead of polling. Not stored, so not replayed.
+    """
+    return {
+        "type": "payment_status",
+        "order_id": payment.order_id,
+        "kind": kind.value,
+        "status": payment.status.value,
+        "updated_at": payment.updated_at.replace(tzinfo=timezone.utc).isoformat(),
+    }
+
+
+def format_notification_event(notification_data: dict[str, Any]) -> str:
+    """Encode as an SSE frame; stored notifications get an id: for Last-Event-ID"""
+    frame = f"data: {json.dumps(notification_data)}\n\n"
+    if notification_data.get("created_at") and notification_data.get("id"):
+        event_id = notification_event_id(
+            datetime.fromisoformat(notification_data["created_at"]),
+            UUID(notification_data["id"]),
+        )
+        frame = f"id: {event_id}\n{frame}"
+    return frame
+
+
+def format_reset_event(newest: Notification) -> str:
+    """
+    Sent instead of a replay when more notifications were missed than one
+    replay carries; the client refetches its lists. Carries the newest
+    notification's id so the next reconnect resumes from there.
+    """
+    reset_data = {"type": "notifications_reset"}
+    event_id = notification_event_id(newest.created_at, newest.id)
+    return f"id: {event_id}\ndata: {json.dumps(reset_data)}\n\n"
+
+
+class SSEConnection:
+    """
+    Bounded message buffer for one SSE stream.
+    put() never blocks the sender; a client that stops reading is handled by
+    the overflow policy instead of growing memory.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+    def __init__(self, maxsize: int | None = None, overflow: str | None = None) -> None:
+        self.maxsize = maxsize or settings.SSE_QUEUE_SIZE
+        self.overflow = overflow or settings.SSE_OVERFLOW_POLICY
+        self.dropped = 0
+        self.closed = False
+        self._messages: deque[str] = deque()
+        self._coalesced = 0
+        self._ready = asyncio.Event()
+
+    def put(self, message: str) -> bool:
+        """Queue a message; returns False once the connection has been closed"""
+        if self.closed:
+            return False
+        if len(self._messages) >= self.maxsize:
+            self.dropped += 1
+            if self.overflow == self.DROP_OLDEST:
+                self._messages.popleft()
+                self._messages.append(message)
+            elif self.overflow == self.COALESCE:
+                self._coalesced += 1
+            else:
+                self.close()
+                return False
+        else:
+            self._messages.append(message)
+        self._ready.set()
+        return True
+
+    async def get(self) -> str | None:
+        """Next frame to send, or None when the connection has been closed"""
+        while not self._messages and not self._coalesced:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        if self.closed:
+            return None
+        if self._messages:
+            return self._messages.popleft()
+        # Buffer drained; tell the client how many it missed so it can refetch
+        coalesced_data = {'type': 'notifications_coalesced', 'count': self._coalesced}
+        self._coalesced = 0
+        return f"data: {json.dumps(coalesced_data)}\n\n"
+
+    def keepalive(self) -> None:
+        """Queue a keepalive frame if nothing else is waiting to be sent"""
+        if not self.closed and not self._messages and not self._coalesced:
+            self._messages.append(KEEPALIVE_FRAME)
+            self._ready.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._messages.clear()
+        self._ready.set()
+
+
 class NotificationConnectionManager:
-    def __init__(self):
-        # Store active connections: {user_id: [connection1, connection2, ...]}
-        self.active_connections: Dict[UUID, List] = {}
-    
-    async def connect(self, user_id: UUID, websocket):
+    SHARDS = 16
+
+    def __init__(
+        self,
+        broker: NotificationBroker | None = None,
+        heartbeat_interval: float | None = None,
+    ) -> None:
+        # Store active connections, sharded by user so the heartbeat can sweep
+        # them a slice at a time: [{user_id: [connection1, connection2, ...]}]
+        self.shards: list[dict[UUID, list[SSEConnection]]] = [
+            {} for _ in range(self.SHARDS)
+        ]
+        # Carries notifications between workers; every worker receives every
+        # notification back through deliver_local
+        self.broker = broker or create_notification_broker()
+        # Overflow counters across all connections of this worker
+        self.dropped_messages = 0
+        self.evicted_connections = 0
+        self.heartbeat_interval = heartbeat_interval or settings.SSE_HEARTBEAT_INTERVAL
+        self._heartbeat: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start receiving notifications from the broker and the heartbeat"""
+        await self.broker.start(self.deliver_local)
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop(self) -> None:
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        await self.broker.stop()
+
+    def _shard(self, user_id: UUID) -> dict[UUID, list[SSEConnection]]:
+        return self.shards[user_id.int % self.SHARDS]
+
+    def get_connections(self, user_id: UUID) -> list[SSEConnection]:
+        return self._shard(user_id).get(user_id, [])
+
+    async def _heartbeat_loop(self) -> None:
+        # One shard per tick, so every connection is visited once per interval
+        tick = self.heartbeat_interval / self.SHARDS
+        shard_index = 0
+        while True:
+            await asyncio.sleep(tick)
+            self.send_heartbeat(shard_index)
+            shard_index = (shard_index + 1) % self.SHARDS
+
+    def send_heartbeat(self, shard_index: int) -> None:
+        """Send keepalives to the idle connections of one shard"""
+        for connections in self.shards[shard_index].values():
+            for connection in connections:
+                connection.keepalive()
+
+    async def connect(self, user_id: UUID, connection: SSEConnection) -> None:
         """Add a new connection for a user"""
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
-        print(f"User {user_id} connected. Total connections: {len(self.active_connections[user_id])}")
-    
-    def disconnect(self, user_id: UUID, websocket):
+        connections = self._shard(user_id).setdefault(user_id, [])
+        connections.append(connection)
+        print(f"User {user_id} connected. Total connections: {len(connections)}")
+
+    def disconnect(self, user_id: UUID, connection: SSEConnection) -> None:
         """Remove a connection when user disconnects"""
-        if user_id in self.active_connections:
+        shard = self._shard(user_id)
+        if user_id in shard:
             try:
-                self.active_connections[user_id].remove(websocket)
-                print(f"User {user_id} disconnected. Remaining connections: {len(self.active_connections[user_id])}")
-                if not self.active_connections[user_id]:
-                    del self.active_connections[user_id]
+                shard[user_id].remove(connection)
+                print(f"User {user_id} disconnected. Remaining connections: {len(shard[user_id])}")
+                if not shard[user_id]:
+                    del shard[user_id]
             except ValueError:
                 pass  # Connection already removed
-    
-    async def send_notification(self, user_id: UUID, notification_data: dict):
-        """Send notification to all connections for a specific user"""
-        if user_id in self.active_connections:
+
+    async def send_notification(self, user_id: UUID, notification_data: dict[str, Any]) -> None:
+        """Publish notification to every worker; each delivers to its own connections"""
+        await self.broker.publish(user_id, notification_data)
+
+    async def send_notifications(self, notifications: list[tuple[UUID, dict[str, Any]]]) -> None:
+        """Publish a batch of (user_id, notification_data) in one go"""
+        await self.broker.publish_many(notifications)
+
+    async def deliver_local(self, user_id: UUID, notification_data: dict[str, Any]) -> None:
+        """Send notification to all connections for a specific user held by this worker"""
+        connections = self.get_connections(user_id)
+        if connections:
             # Format as SSE (Server-Sent Event)
-            message = f"data: {json.dumps(notification_data)}\n\n"
-            
+            message = format_notification_event(notification_data)
+
             print(f"Sending notification to user {user_id}: {notification_data}")
-            
+
             # Send to all user's open connections (multiple tabs/devices)
-            dead_connections = []
-            for websocket in self.active_connections[user_id]:
-                try:
-                    await websocket.put(message)  # Put message in queue
-                except Exception as e:
-                    print(f"Failed to send to connection: {e}")
-                    dead_connections.append(websocket)
-            
-            # Clean up dead connections
-            for dead in dead_connections:
-                self.disconnect(user_id, dead)
-                
-        else:
-            print(f"User {user_id} is offline, notification saved to DB only")
+            evicted = []
+            for connection in connections:
+                dropped = connection.dropped
+                if not connection.put(message):
+                    evicted.append(connection)
+                self.dropped_messages += connection.dropped - dropped
+
+            # Slow consumers closed by the disconnect policy
+            for connection in evicted:
+                print(f"Evicting slow connection for user {user_id}")
+                self.evicted_connections += 1
+                self.disconnect(user_id, connection)
+        # Otherwise the user is connected to another worker, or offline
 
 # Global instance
-notification_manager = NotificationConnectionManager()
\ No newline at end of file
+notification_manager = NotificationConnectionManager()
@@ -6,16 +6,82 @@ from app.models import (
     ApplicationReviewerPermission, ApplicationReviewerPermissionCreate, ApplicationReviewerPermissionPublic, ReviewerPermissionStatus, Sponsorship, SponsorshipCreate, SponsorshipStatistics, UserVolunteerRole, VolunteerRole, Withdrawal, WithdrawalStatus, OpenPosition, OpenPositionCreate, OpenPositionUpdate, DeveloperRole
 )
 
+import logging
 import uuid
+from collections.abc import Sequence
 from typing import Any
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 
-from sqlmodel import Session, select, func
+from collections import Counter, defaultdict
+from sqlalchemy import Date, DateTime, case, cast, delete, insert, literal, literal_column, text, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, or_, select, func
+from pydantic import ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.security import get_password_hash, verify_password
-from app.models import Item, ItemCreate, User, UserCreate, UserUpdate, Project, ProjectCreate, ProjectUpdate, ProjectStatus, Task, TaskCreate, TaskUpdate, ProjectThread, ProjectThreadCreate, ProjectThreadUpdate, Comment, CommentCreate, CommentUpdate, CommentPublic, Reply, ReplyCreate, ReplyUpdate, ReplyPublic, ProjectApplication, ProjectApplicationCreate, ProjectApplicationUpdate, ApplicationStatus, Notification, NotificationType
-from app.core.notification_manager import notification_manager
-from sqlalchemy.orm import selectinload
+from app.models import Item, ItemCreate, User, UserCreate, UserUpdate, Project, ProjectCreate, ProjectUpdate, ProjectStatus, Task, TaskCreate, TaskUpdate, ProjectThread, ProjectThreadCreate, ProjectThreadSort, ProjectThreadUpdate, Comment, CommentCreate, CommentUpdate, CommentPublic, Reply, ReplyCreate, ReplyUpdate, ReplyPublic, ProjectApplication, ProjectApplicationCreate, ProjectApplicationUpdate, ApplicationStatus, Notification, NotificationCounter, NotificationType, PaymentDailyRollup, PaymentKind, PaymentParticipantRole, PaymentParticipantRollup, PaymentSeriesGranularity, PaymentSeriesPoint, PayHereAccessToken, PayHereWebhookEvent, RecipientBalance, WithdrawalLedgerDiscrepancy, WithdrawalLedgerEntry, WithdrawalLedgerEntryType
+from app.core.notification_manager import notification_event_data, notification_manager, payment_status_event_data
+from app.utils import count_rows, paginate, paginate_with_total, split_total
+from sqlalchemy.orm import aliased, noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+logger = logging.getLogger(__name__)
+
+
+def get_page(
+    *,
+    session: Session,
+    statement: Any,
+    columns: list[Any],
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None,
+    descending: bool = True,
+    estimate: bool = False,
+) -> tuple[list[Any], int | None]:
+    """
+    One page of a listing and its total, from a single query. Pages read with
+    a cursor have no total (None); the first page carries it.
+    """
+    rows = session.execute(paginate_with_total(
+        statement, columns, skip=skip, limit=limit, after=after,
+        descending=descending, estimate=estimate
+    )).all()
+    if rows:
+        return split_total(rows)
+    if after is not None:
+        return [], None
+    if not skip:
+        return [], 0
+    # Past the last page there is no row to carry the total
+    return [], session.execute(count_rows(statement)).scalar_one()
+
+
+async def get_page_async(
+    *,
+    session: AsyncSession,
+    statement: Any,
+    columns: list[Any],
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None,
+    descending: bool = True,
+    estimate: bool = False,
+) -> tuple[list[Any], int | None]:
+    """One page of a listing and its total, from a single query (async)"""
+    rows = (await session.execute(paginate_with_total(
+        statement, columns, skip=skip, limit=limit, after=after,
+        descending=descending, estimate=estimate
+    ))).all()
+    if rows:
+        return split_total(rows)
+    if after is not None:
+        return [], None
+    if not skip:
+        return [], 0
+    return [], (await session.execute(count_rows(statement))).scalar_one()
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -128,10 +194,26 @@ def get_project_by_id(*, session: Session, project_id: uuid.UUID) -> Project | N
     return session.get(Project, project_id)
 
 
-def get_approved_projects(*, session: Session, skip: int = 0, limit: int = 100) -> list[Project]:
-    statement = select(Project).where(
-        Project.status == ProjectStatus.APPROVED).offset(skip).limit(limit)
-    return session.exec(statement).all()
+async def get_project_by_id_async(*, session: AsyncSession, project_id: uuid.UUID) -> Project | None:
+    return await session.get(Project, project_id)
+
+
+def get_approved_projects(
+    *, session: Session, skip: int = 0, limit: int = 100, after: tuple[Any, ...] | None = None
+) -> tuple[list[Project], int | None]:
+    return get_page(
+        session=session, statement=select(Project).where(Project.status == ProjectStatus.APPROVED),
+        columns=[Project.created_at, Project.id], skip=skip, limit=limit, after=after
+    )
+
+
+async def get_approved_projects_async(
+    *, session: AsyncSession, skip: int = 0, limit: int = 100, after: tuple[Any, ...] | None = None
+) -> tuple[list[Project], int | None]:
+    return await get_page_async(
+        session=session, statement=select(Project).where(Project.status == ProjectStatus.APPROVED),
+        columns=[Project.created_at, Project.id], skip=skip, limit=limit, after=after
+    )
 
 
 def get_pending_projects(*, session: Session, skip: int = 0, limit: int = 100) -> list[Project]:
@@ -140,9 +222,13 @@ def get_pending_projects(*, session: Session, skip: int = 0, limit: int = 100) -
     return session.exec(statement).all()
 
 
-def get_all_projects(*, session: Session, skip: int = 0, limit: int = 100) -> list[Project]:
-    statement = select(Project).offset(skip).limit(limit)
-    return session.exec(statement).all()
+def get_all_projects(
+    *, session: Session, skip: int = 0, limit: int = 100, after: tuple[Any, ...] | None = None
+) -> tuple[list[Project], int | None]:
+    return get_page(
+        session=session, statement=select(Project), columns=[Project.created_at, Project.id],
+        skip=skip, limit=limit, after=after, estimate=True
+    )
 
 
 def update_project(*, session: Session, db_project: Project, project_in: ProjectUpdate) -> Project:
@@ -231,49 +317,93 @@ def assign_task_to_volunteer(*, session: Session, task_id: uuid.UUID, volunteer_
 
 
 # Project Thread CRUD operations
+THREAD_SORT_COLUMNS = {
+    ProjectThreadSort.CREATED: [ProjectThread.created_at, ProjectThread.id],
+    ProjectThreadSort.ACTIVITY: [ProjectThread.last_activity_at, ProjectThread.id],
+}
+
+
 def get_project_threads_by_project_id(
-    *, session: Session, project_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> tuple[list[ProjectThread], int]:
+    *,
+    session: Session,
+    project_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    sort: ProjectThreadSort = ProjectThreadSort.CREATED,
+) -> tuple[list[ProjectThread], int | None]:
     statement = (
         select(ProjectThread)
         .where(ProjectThread.project_id == project_id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(ProjectThread.created_at.desc())
+        .options(noload(ProjectThread.comments))
     )
-    threads = session.exec(statement).all()
-    count_statement = select(func.count(ProjectThread.id)).where(
-        ProjectThread.project_id == project_id
+    return get_page(
+        session=session, statement=statement,
+        columns=THREAD_SORT_COLUMNS[sort], skip=skip, limit=limit
     )
-    count = session.exec(count_statement).one()
-    return threads, count
 
 
-def get_project_thread_by_id(
+async def get_project_threads_by_project_id_async(
+    *,
+    session: AsyncSession,
+    project_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    sort: ProjectThreadSort = ProjectThreadSort.CREATED,
+) -> tuple[list[ProjectThread], int | None]:
+    # Relationships can't be lazy loaded on an AsyncSession, so the author is
+    # loaded up front. Listings carry the thread's counters, not its comments.
+    statement = (
+        select(ProjectThread)
+        .where(ProjectThread.project_id == project_id)
+        .options(selectinload(ProjectThread.author), noload(ProjectThread.comments))
+    )
+    return await get_page_async(
+        session=session, statement=statement,
+        columns=THREAD_SORT_COLUMNS[sort], skip=skip, limit=limit
+    )
+
+
+def get_project_thread_author_id(
     *, session: Session, thread_id: uuid.UUID
+) -> uuid.UUID | None:
+    """
+    Author of a thread, or None when it does not exist. A primary key lookup
+    that loads nothing else, for routes that only need existence or ownership.
+    """
+    return session.exec(
+        select(ProjectThread.author_id).where(ProjectThread.id == thread_id)
+    ).first()
+
+
+def get_project_thread_by_id(
+    *,
+    session: Session,
+    thread_id: uuid.UUID,
+    comment_limit: int = 20,
+    reply_limit: int = 3,
 ) -> ProjectThread | None:
-    # Step 1: Fetch the thread itself.
-    thread = session.get(ProjectThread, thread_id)
+    """
+    A thread with its first comment_limit comments, oldest first, each with
+    its first reply_limit replies. Both are cut in SQL, so reading a busy
+    thread costs the same as reading a quiet one.
+    """
+    thread = session.exec(
+        select(ProjectThread)
+        .where(ProjectThread.id == thread_id)
+        .options(selectinload(ProjectThread.author))
+    ).first()
     if not thread:
         return None
 
-    # Step 2: Fetch all comments for this thread, with their authors and replies.
-    all_comments = session.exec(
+    comments = session.exec(paginate(
         select(Comment)
         .where(Comment.thread_id == thread_id)
-        .options(selectinload(Comment.author), selectinload(Comment.replies).selectinload(Reply.author))
-    ).all()
-
-    # Step 3: Sort comments by creation date for correct order.
-    all_comments.sort(key=lambda c: c.created_at)
-
-    # Step 4: Sort replies within each comment by creation date.
-    for comment in all_comments:
-        comment.replies.sort(key=lambda r: r.created_at)
-
-    # Step 5: Assign the correctly structured list of comments back to the thread.
-    thread.comments = all_comments
-
+        .options(selectinload(Comment.author)),
+        [Comment.created_at, Comment.id], limit=comment_limit, descending=False
+    )).all()
+    load_reply_windows(session=session, comments=comments, limit=reply_limit)
+    # Only a window of the comments; set without marking the collection changed
+    set_committed_value(thread, "comments", list(comments))
     return thread
 
 
@@ -285,8 +415,10 @@ def create_project_thread(
     project_id: uuid.UUID,
 ) -> ProjectThread:
     db_thread = ProjectThread.model_validate(
-        thread_in, update={"author_id": author_id, "project_id": project_id}
+        thread_in,
+        update={"author_id": author_id, "project_id": project_id, "last_author_id": author_id},
     )
+    db_thread.last_activity_at = db_thread.created_at
     session.add(db_thread)
     session.commit()
     session.refresh(db_thread)
@@ -310,14 +442,94 @@ def update_project_thread(
     return db_thread
 
 
-def delete_project_thread(*, session: Session, db_thread: ProjectThread) -> None:
+def delete_project_thread(*, session: Session, thread_id: uuid.UUID) -> None:
+    """
+    Delete a project thread with all its comments and replies. Deleted in
+    bulk rather than through the ORM cascade, which would first load every
+    comment and reply of the thread.
+    """
+    comment_ids = select(Comment.id).where(Comment.thread_id == thread_id)
+    session.execute(delete(Reply).where(Reply.parent_id.in_(comment_ids)))
+    session.execute(delete(Comment).where(Comment.thread_id == thread_id))
+    session.execute(delete(ProjectThread).where(ProjectThread.id == thread_id))
+    session.commit()
+
+
+def update_thread_activity(
+    *,
+    session: Session,
+    thread_id: Any,
+    comments: int = 0,
+    replies: int = 0,
+    at: datetime | None = None,
+    author_id: uuid.UUID | None = None,
+) -> None:
     """
-    Delete a project thread.
-    This will cascade delete all associated comments and replies due to the 
-    cascade="all, delete-orphan" relationship defined in the model.
+    Move a thread's comment and reply counters in the caller's transaction,
+    and record activity at `at` by `author_id` unless the thread has seen
+    something newer meanwhile. Deleting is not activity; pass no `at`.
     """
-    session.delete(db_thread)
+    values: dict[str, Any] = {
+        "comment_count": func.greatest(ProjectThread.comment_count + comments, 0),
+        "reply_count": func.greatest(ProjectThread.reply_count + replies, 0),
+        # Bookkeeping, not an edit of the thread
+        "updated_at": ProjectThread.updated_at,
+    }
+    if at is not None:
+        newer = ProjectThread.last_activity_at <= at
+        values["last_activity_at"] = case((newer, at), else_=ProjectThread.last_activity_at)
+        values["last_author_id"] = case((newer, author_id), else_=ProjectThread.last_author_id)
+    session.execute(
+        update(ProjectThread).where(ProjectThread.id == thread_id).values(**values)
+    )
+
+
+def rebuild_project_thread_activity(*, session: Session) -> int:
+    """
+    Recompute every thread's comment and reply counts and its last activity
+    from the comments and replies. Returns the number of threads updated.
+    """
+    # Comment and reply writes that commit meanwhile wait for this to
+    # finish, then apply their move on top of the rebuilt counters
+    session.execute(text("LOCK TABLE projectthread IN EXCLUSIVE MODE"))
+    activity = union_all(
+        select(ProjectThread.id.label("thread_id"), ProjectThread.created_at,
+               ProjectThread.author_id),
+        select(Comment.thread_id, Comment.created_at, Comment.author_id),
+        select(Comment.thread_id, Reply.created_at, Reply.author_id)
+        .join(Comment, Reply.parent_id == Comment.id),
+    ).subquery()
+    latest = (
+        select(activity.c.thread_id, activity.c.created_at, activity.c.author_id)
+        .distinct(activity.c.thread_id)
+        .order_by(activity.c.thread_id, activity.c.created_at.desc())
+        .subquery()
+    )
+    comment_count = (
+        select(func.count()).select_from(Comment)
+        .where(Comment.thread_id == ProjectThread.id)
+        .scalar_subquery()
+    )
+    reply_count = (
+        select(func.count()).select_from(Reply)
+        .join(Comment, Reply.parent_id == Comment.id)
+        .where(Comment.thread_id == ProjectThread.id)
+        .scalar_subquery()
+    )
+    updated = session.execute(
+        update(ProjectThread)
+        .where(ProjectThread.id == latest.c.thread_id)
+        .values(
+            comment_count=comment_count,
+            reply_count=reply_count,
+            last_activity_at=latest.c.created_at,
+            last_author_id=latest.c.author_id,
+            updated_at=ProjectThread.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
     session.commit()
+    return updated
 
 
 # Comment CRUD operations
@@ -326,23 +538,51 @@ def get_comment_by_id(*, session: Session, comment_id: uuid.UUID) -> Comment | N
 
 
 def get_comments_by_thread_id(
-    *, session: Session, thread_id: uuid.UUID, skip: int = 0, limit: int = 10
-) -> tuple[list[Comment], int]:
+    *,
+    session: Session,
+    thread_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 10,
+    after: tuple[Any, ...] | None = None,
+    reply_limit: int = 3,
+) -> tuple[list[Comment], int | None]:
+    """A page of a thread's comments, oldest first, each with its first replies"""
     statement = (
         select(Comment)
         .where(Comment.thread_id == thread_id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(Comment.created_at.asc())
+        .options(selectinload(Comment.author))
     )
-    comments = session.exec(statement).all()
-    count_statement = select(func.count(Comment.id)).where(
-        Comment.thread_id == thread_id
+    comments, count = get_page(
+        session=session, statement=statement, columns=[Comment.created_at, Comment.id],
+        skip=skip, limit=limit, after=after, descending=False
     )
-    count = session.exec(count_statement).one()
+    load_reply_windows(session=session, comments=comments, limit=reply_limit)
     return comments, count
 
 
+def load_reply_windows(*, session: Session, comments: list[Comment], limit: int) -> None:
+    """
+    Set the replies of each comment to its first `limit`, oldest first, from
+    one ROW_NUMBER() window query over all the comments.
+    """
+    replies: dict[uuid.UUID, list[Reply]] = {comment.id: [] for comment in comments}
+    if replies and limit > 0:
+        position = func.row_number().over(
+            partition_by=Reply.parent_id, order_by=(Reply.created_at, Reply.id)
+        ).label("position")
+        ranked = select(Reply, position).where(Reply.parent_id.in_(replies)).subquery()
+        windowed = aliased(Reply, ranked)
+        for reply in session.exec(
+            select(windowed)
+            .where(ranked.c.position <= limit)
+            .order_by(ranked.c.parent_id, ranked.c.position)
+            .options(selectinload(windowed.author))
+        ).all():
+            replies[reply.parent_id].append(reply)
+    for comment in comments:
+        set_committed_value(comment, "replies", replies[comment.id])
+
+
 def create_comment(
     *,
     session: Session,
@@ -356,6 +596,10 @@ def create_comment(
         author_id=author_id,
     )
     session.add(db_comment)
+    update_thread_activity(
+        session=session, thread_id=thread_id, comments=1,
+        at=db_comment.created_at, author_id=author_id
+    )
     session.commit()
     session.refresh(db_comment)
     return db_comment
@@ -367,21 +611,22 @@ def get_reply_by_id(*, session: Session, reply_id: uuid.UUID) -> Reply | None:
 
 
 def get_replies_by_comment_id(
-    *, session: Session, comment_id: uuid.UUID, skip: int = 0, limit: int = 10
-) -> tuple[list[Reply], int]:
+    *,
+    session: Session,
+    comment_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 10,
+    after: tuple[Any, ...] | None = None,
+) -> tuple[list[Reply], int | None]:
     statement = (
         select(Reply)
         .where(Reply.parent_id == comment_id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(Reply.created_at.asc())
+        .options(selectinload(Reply.author))
     )
-    replies = session.exec(statement).all()
-    count_statement = select(func.count(Reply.id)).where(
-        Reply.parent_id == comment_id
+    return get_page(
+        session=session, statement=statement, columns=[Reply.created_at, Reply.id],
+        skip=skip, limit=limit, after=after, descending=False
     )
-    count = session.exec(count_statement).one()
-    return replies, count
 
 
 def create_reply(
@@ -401,6 +646,10 @@ def create_reply(
         author_id=author_id,
     )
     session.add(db_reply)
+    update_thread_activity(
+        session=session, thread_id=parent_comment.thread_id, replies=1,
+        at=db_reply.created_at, author_id=author_id
+    )
     session.commit()
     session.refresh(db_reply)
     return db_reply
@@ -418,7 +667,11 @@ def update_reply(
 
 
 def delete_reply(*, session: Session, db_reply: Reply) -> None:
-    session.delete(db_reply)
+    thread_id = select(Comment.thread_id).where(Comment.id == db_reply.parent_id)
+    # Counted only if this call removed it, not a concurrent delete
+    if session.execute(delete(Reply).where(Reply.id == db_reply.id)).rowcount:
+        update_thread_activity(
+            session=session, thread_id=thread_id.scalar_subquery(), replies=-1)
     session.commit()
 
 
@@ -434,7 +687,15 @@ def update_comment(
 
 
 def delete_comment(*, session: Session, db_comment: Comment) -> None:
-    session.delete(db_comment)
+    """
+    Delete a comment with its replies, in bulk rather than loading the
+    replies for the ORM cascade, and take them off the thread's counters.
+    """
+    comment_id, thread_id = db_comment.id, db_comment.thread_id
+    replies = session.execute(delete(Reply).where(Reply.parent_id == comment_id)).rowcount
+    if session.execute(delete(Comment).where(Comment.id == comment_id)).rowcount:
+        update_thread_activity(
+            session=session, thread_id=thread_id, comments=-1, replies=-replies)
     session.commit()
 
 
@@ -485,24 +746,42 @@ def get_applications_by_project_id(
     project_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100
-) -> tuple[list[ProjectApplication], int]:
+) -> tuple[list[ProjectApplication], int | None]:
     """Get all applications for a specific project"""
     statement = (
         select(ProjectApplication)
         .where(ProjectApplication.project_id == project_id)
         .options(selectinload(ProjectApplication.volunteer))
-        .offset(skip)
-        .limit(limit)
-        .order_by(ProjectApplication.created_at.desc())
     )
-    applications = session.exec(statement).all()
-
-    count_statement = select(func.count(ProjectApplication.id)).where(
-        ProjectApplication.project_id == project_id
+    return get_page(
+        session=session, statement=statement,
+        columns=[ProjectApplication.created_at, ProjectApplication.id],
+        skip=skip, limit=limit
     )
-    count = session.exec(count_statement).one()
 
-    return applications, count
+
+async def get_applications_by_project_id_async(
+    *,
+    session: AsyncSession,
+    project_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[ProjectApplication], int | None]:
+    """Get all applications for a specific project (async)"""
+    statement = (
+        select(ProjectApplication)
+        .where(ProjectApplication.project_id == project_id)
+        .options(
+            selectinload(ProjectApplication.volunteer),
+            selectinload(ProjectApplication.project)
+        )
+    )
+    return await get_page_async(
+        session=session, statement=statement,
+        columns=[ProjectApplication.created_at, ProjectApplication.id],
+        skip=skip, limit=limit, after=after
+    )
 
 
 def get_applications_by_volunteer_id(
@@ -511,24 +790,42 @@ def get_applications_by_volunteer_id(
     volunteer_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100
-) -> tuple[list[ProjectApplication], int]:
+) -> tuple[list[ProjectApplication], int | None]:
     """Get all applications by a specific volunteer"""
     statement = (
         select(ProjectApplication)
         .where(ProjectApplication.volunteer_id == volunteer_id)
         .options(selectinload(ProjectApplication.project))
-        .offset(skip)
-        .limit(limit)
-        .order_by(ProjectApplication.created_at.desc())
     )
-    applications = session.exec(statement).all()
-
-    count_statement = select(func.count(ProjectApplication.id)).where(
-        ProjectApplication.volunteer_id == volunteer_id
+    return get_page(
+        session=session, statement=statement,
+        columns=[ProjectApplication.created_at, ProjectApplication.id],
+        skip=skip, limit=limit
     )
-    count = session.exec(count_statement).one()
 
-    return applications, count
+
+async def get_applications_by_volunteer_id_async(
+    *,
+    session: AsyncSession,
+    volunteer_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[ProjectApplication], int | None]:
+    """Get all applications by a specific volunteer (async)"""
+    statement = (
+        select(ProjectApplication)
+        .where(ProjectApplication.volunteer_id == volunteer_id)
+        .options(
+            selectinload(ProjectApplication.volunteer),
+            selectinload(ProjectApplication.project)
+        )
+    )
+    return await get_page_async(
+        session=session, statement=statement,
+        columns=[ProjectApplication.created_at, ProjectApplication.id],
+        skip=skip, limit=limit, after=after
+    )
 
 
 def get_applications_by_status(
@@ -537,7 +834,7 @@ def get_applications_by_status(
     status: ApplicationStatus,
     skip: int = 0,
     limit: int = 100
-) -> tuple[list[ProjectApplication], int]:
+) -> tuple[list[ProjectApplication], int | None]:
     """Get applications by status"""
     statement = (
         select(ProjectApplication)
@@ -546,18 +843,12 @@ def get_applications_by_status(
             selectinload(ProjectApplication.volunteer),
             selectinload(ProjectApplication.project)
         )
-        .offset(skip)
-        .limit(limit)
-        .order_by(ProjectApplication.created_at.desc())
     )
-    applications = session.exec(statement).all()
-
-    count_statement = select(func.count(ProjectApplication.id)).where(
-        ProjectApplication.status == status
+    return get_page(
+        session=session, statement=statement,
+        columns=[ProjectApplication.created_at, ProjectApplication.id],
+        skip=skip, limit=limit
     )
-    count = session.exec(count_statement).one()
-
-    return applications, count
 
 
 def update_application(
@@ -592,7 +883,7 @@ def get_all_applications(
     session: Session,
     skip: int = 0,
     limit: int = 100
-) -> tuple[list[ProjectApplication], int]:
+) -> tuple[list[ProjectApplication], int | None]:
     """Get all applications (admin only)"""
     statement = (
         select(ProjectApplication)
@@ -600,23 +891,41 @@ def get_all_applications(
             selectinload(ProjectApplication.volunteer),
             selectinload(ProjectApplication.project)
         )
-        .offset(skip)
-        .limit(limit)
-        .order_by(ProjectApplication.created_at.desc())
     )
-    applications = session.exec(statement).all()
+    return get_page(
+        session=session, statement=statement,
+        columns=[ProjectApplication.created_at, ProjectApplication.id],
+        skip=skip, limit=limit, estimate=True
+    )
 
-    count_statement = select(func.count(ProjectApplication.id))
-    count = session.exec(count_statement).one()
 
-    return applications, count
+async def get_all_applications_async(
+    *,
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[ProjectApplication], int | None]:
+    """Get all applications (admin only, async)"""
+    statement = (
+        select(ProjectApplication)
+        .options(
+            selectinload(ProjectApplication.volunteer),
+            selectinload(ProjectApplication.project)
+        )
+    )
+    return await get_page_async(
+        session=session, statement=statement,
+        columns=[ProjectApplication.created_at, ProjectApplication.id],
+        skip=skip, limit=limit, after=after, estimate=True
+    )
 
 
 def get_approved_applicants_for_project(
     *,
     session: Session,
     project_id: uuid.UUID
-) -> list[dict]:
+) -> list[dict[str, Any]]:
     """
     Get all approved applicants (volunteers) for a specific project with their volunteer roles.
     Returns combined User and ProjectApplication data.
@@ -686,22 +995,603 @@ def get_payment_by_order_id(*, session: Session, order_id: int) -> Payment | Non
     return session.exec(statement).first()
 
 
-def update_payment_status(*, session: Session, order_id: int, status: PaymentStatus) -> Payment | None:
+def update_payment_status(
+    *, session: Session, order_id: int, status: PaymentStatus,
+    expected_status: PaymentStatus | None = None
+) -> Payment | None:
     """
-    Update payment status by order_id
+    Update payment status by order_id. With expected_status, a payment whose
+    status has changed meanwhile (e.g. by a webhook) is left as it is.
     """
-    statement = select(Payment).where(Payment.order_id == order_id)
+    # Row lock so concurrent updates apply their rollup moves one at a time
+    statement = select(Payment).where(Payment.order_id == order_id).with_for_update()
     payment = session.exec(statement).first()
 
+    if payment and expected_status is not None and payment.status != expected_status:
+        session.commit()
+        return payment
+
     if payment:
+        old_status = payment.status
         payment.status = status
         payment.updated_at = datetime.now(timezone.utc)
         session.add(payment)
+        if old_status != status:
+            record_payment_status_change(
+                session=session, payment=payment, old_status=old_status)
         session.commit()
         session.refresh(payment)
 
     return payment
 
+
+def payment_status_events(
+    *,
+    session: Session,
+    payment: Payment,
+    participants: tuple[PaymentKind, list[tuple[PaymentParticipantRole, uuid.UUID]]] | None = None
+) -> list[tuple[uuid.UUID, dict[str, Any]]]:
+    """(user_id, event data) telling each participant of a payment its current status"""
+    if participants is None:
+        participants = get_payment_participants(session=session, order_id=payment.order_id)
+    if participants is None:
+        return []
+    kind, parties = participants
+    data = payment_status_event_data(payment, kind)
+    return [(user_id, data) for _, user_id in parties]
+
+
+def claim_payments_for_reconciliation(
+    *, session: Session, limit: int, min_age: float, recheck_after: float, max_age: float
+) -> list[tuple[int, PaymentStatus]]:
+    """
+    Claim up to limit unsettled payments for the background reconciler and
+    return their order ids and statuses. Claimed payments are stamped with
+    reconciled_at, so other workers pass them over until recheck_after
+    seconds have gone by; rows another worker is claiming right now are
+    skipped rather than waited for.
+
+    Payments younger than min_age seconds are left to their webhook, and
+    those PayHere had no record of are given up on after max_age seconds.
+    """
+    now = datetime.utcnow()
+    claimable = (
+        select(Payment.id)
+        .where(
+            Payment.status.in_([PaymentStatus.PENDING, PaymentStatus.NOT_FOUND]),
+            Payment.created_at <= now - timedelta(seconds=min_age),
+            (Payment.status == PaymentStatus.PENDING)
+            | (Payment.created_at >= now - timedelta(seconds=max_age)),
+            Payment.reconciled_at.is_(None)
+            | (Payment.reconciled_at <= now - timedelta(seconds=recheck_after)),
+        )
+        .order_by(Payment.reconciled_at.asc().nulls_first(), Payment.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(Payment)
+        .where(Payment.id.in_(claimable.scalar_subquery()))
+        .values(reconciled_at=now)
+        .returning(Payment.order_id, Payment.status)
+    )
+    claimed = [(order_id, status) for order_id, status in session.execute(statement)]
+    session.commit()
+    return claimed
+
+
+# PayHere webhook notifications
+async def record_payhere_webhook_async(
+    *, session: AsyncSession, order_id: int, status_code: int, md5sig: str
+) -> bool:
+    """
+    Record a verified PayHere notification for the webhook processor.
+    Returns False for a resend of a notification already recorded; raises
+    ValueError for an order that does not exist.
+    """
+    statement = (
+        pg_insert(PayHereWebhookEvent)
+        .values(order_id=order_id, status_code=status_code, md5sig=md5sig)
+        .on_conflict_do_nothing(index_elements=[
+            PayHereWebhookEvent.order_id, PayHereWebhookEvent.status_code,
+            PayHereWebhookEvent.md5sig
+        ])
+        .returning(PayHereWebhookEvent.id)
+    )
+    try:
+        recorded = (await session.execute(statement)).first() is not None
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise ValueError(f"Payment with order_id {order_id} not found")
+    return recorded
+
+
+def process_payhere_webhook_events(
+    *, session: Session, limit: int
+) -> tuple[int, list[tuple[uuid.UUID, dict[str, Any]]]]:
+    """
+    Apply up to limit recorded webhook notifications to their payments, in
+    the order they arrived, in one transaction; rollups and the withdrawal
+    ledger move with them. Notifications another worker is applying are
+    skipped. Returns the number applied and the payment status events for
+    the caller to push once they are committed.
+    """
+    statement = (
+        select(PayHereWebhookEvent)
+        .where(PayHereWebhookEvent.processed_at.is_(None))
+        .order_by(PayHereWebhookEvent.received_at, PayHereWebhookEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    events = session.exec(statement).all()
+    if not events:
+        return 0, []
+
+    # Locked in order_id order, so concurrent batches cannot deadlock on them
+    statement = (
+        select(Payment)
+        .where(Payment.order_id.in_({event.order_id for event in events}))
+        .order_by(Payment.order_id)
+        .with_for_update()
+    )
+    payments = {payment.order_id: payment for payment in session.exec(statement)}
+
+    processed_at = datetime.utcnow()
+    # Status of each payment before this batch, to move it once to where the
+    # batch leaves it
+    original_statuses: dict[int, PaymentStatus] = {}
+    for event in events:
+        payment = payments.get(event.order_id)
+        status = PaymentStatus(event.status_code)
+        if payment and payment.status != status:
+            original_statuses.setdefault(payment.order_id, payment.status)
+            payment.status = status
+            payment.updated_at = datetime.now(timezone.utc)
+            session.add(payment)
+        event.processed_at = processed_at
+        session.add(event)
+
+    changed = [
+        order_id for order_id, status in original_statuses.items()
+        if payments[order_id].status != status
+    ]
+    participants = get_payments_participants(session=session, order_ids=changed)
+    apply_payment_status_changes(session=session, changes=[
+        (payments[order_id], original_statuses[order_id], participants[order_id])
+        for order_id in changed if order_id in participants
+    ])
+    session.commit()
+    return len(events), [
+        status_event
+        for order_id in changed if order_id in participants
+        for status_event in payment_status_events(
+            session=session, payment=payments[order_id], participants=participants[order_id])
+    ]
+
+
+# PayHere access token, shared by all workers
+async def get_payhere_access_token_async(
+    *, session: AsyncSession, app_id: str
+) -> PayHereAccessToken | None:
+    return await session.get(PayHereAccessToken, app_id)
+
+
+async def claim_payhere_access_token_refresh_async(
+    *, session: AsyncSession, app_id: str, valid_until: datetime, claim_until: datetime
+) -> bool:
+    """
+    Claim the renewal of the app's access token until claim_until, unless its
+    token is still valid at valid_until or another worker holds an unexpired
+    claim. The claim is committed, so no row lock is held while PayHere is
+    asked for the new token.
+    """
+    await session.execute(
+        pg_insert(PayHereAccessToken)
+        .values(app_id=app_id)
+        .on_conflict_do_nothing(index_elements=[PayHereAccessToken.app_id])
+    )
+    now = datetime.utcnow()
+    statement = (
+        update(PayHereAccessToken)
+        .where(PayHereAccessToken.app_id == app_id)
+        .where(or_(
+            PayHereAccessToken.expires_at.is_(None), PayHereAccessToken.expires_at <= valid_until
+        ))
+        .where(or_(
+            PayHereAccessToken.refreshing_until.is_(None), PayHereAccessToken.refreshing_until <= now
+        ))
+        .values(refreshing_until=claim_until)
+        .returning(PayHereAccessToken.app_id)
+    )
+    claimed = (await session.execute(statement)).first() is not None
+    await session.commit()
+    return claimed
+
+
+async def release_payhere_access_token_refresh_async(
+    *, session: AsyncSession, app_id: str
+) -> None:
+    """Give up a renewal claim, so other workers need not wait for it to expire"""
+    await session.execute(
+        update(PayHereAccessToken)
+        .where(PayHereAccessToken.app_id == app_id)
+        .values(refreshing_until=None)
+    )
+    await session.commit()
+
+
+async def update_payhere_access_token_async(
+    *, session: AsyncSession, app_id: str, access_token: str, expires_at: datetime
+) -> None:
+    """Share a renewed access token and end the renewal claim"""
+    await session.execute(
+        update(PayHereAccessToken)
+        .where(PayHereAccessToken.app_id == app_id)
+        .values(
+            access_token=access_token,
+            expires_at=expires_at,
+            refreshing_until=None,
+            updated_at=datetime.utcnow(),
+        )
+    )
+    await session.commit()
+
+
+# Payment rollup operations
+
+
+def get_payments_participants(
+    *, session: Session, order_ids: list[int]
+) -> dict[int, tuple[PaymentKind, list[tuple[PaymentParticipantRole, uuid.UUID]]]]:
+    """
+    What each payment paid for and who took part, from one query; payments
+    not linked to a donation or sponsorship yet are left out
+    """
+    if not order_ids:
+        return {}
+    statement = (
+        select(
+            Payment.order_id, Donation.donor_id, Sponsorship.sponsor_id, Sponsorship.recipient_id
+        )
+        .select_from(Payment)
+        .outerjoin(Donation, Donation.order_id == Payment.order_id)
+        .outerjoin(Sponsorship, Sponsorship.order_id == Payment.order_id)
+        .where(Payment.order_id.in_(order_ids))
+    )
+    participants = {}
+    for order_id, donor_id, sponsor_id, recipient_id in session.execute(statement):
+        if donor_id is not None:
+            participants[order_id] = (
+                PaymentKind.DONATION, [(PaymentParticipantRole.DONOR, donor_id)])
+        elif sponsor_id is not None:
+            participants[order_id] = (PaymentKind.SPONSORSHIP, [
+                (PaymentParticipantRole.SPONSOR, sponsor_id),
+                (PaymentParticipantRole.RECIPIENT, recipient_id),
+            ])
+    return participants
+
+
+def get_payment_participants(
+    *, session: Session, order_id: int
+) -> tuple[PaymentKind, list[tuple[PaymentParticipantRole, uuid.UUID]]] | None:
+    """What a payment paid for and who took part, None if it is not linked yet"""
+    return get_payments_participants(session=session, order_ids=[order_id]).get(order_id)
+
+
+def record_payment_status_change(
+    *,
+    session: Session,
+    payment: Payment,
+    old_status: PaymentStatus | None,
+    participants: tuple[PaymentKind, list[tuple[PaymentParticipantRole, uuid.UUID]]] | None = None
+) -> None:
+    """
+    Move a payment from old_status (None when it is first linked to a donation
+    or sponsorship) to payment.status in the rollups, and credit or reverse a
+    sponsorship in its recipient's withdrawal ledger (caller commits).
+    """
+    if participants is None:
+        participants = get_payment_participants(session=session, order_id=payment.order_id)
+    if participants is None:
+        return
+    apply_payment_status_changes(session=session, changes=[(payment, old_status, participants)])
+
+
+def apply_payment_status_changes(
+    *,
+    session: Session,
+    changes: Sequence[tuple[
+        Payment, PaymentStatus | None,
+        tuple[PaymentKind, list[tuple[PaymentParticipantRole, uuid.UUID]]]
+    ]]
+) -> None:
+    """
+    record_payment_status_change for many payments (caller commits). Moves
+    are summed per rollup row and written in key order, and ledger entries
+    are appended in recipient order, so concurrent callers lock rollup and
+    balance rows in the same order and cannot deadlock on them.
+    """
+    daily: dict[tuple[Any, ...], list[float]] = defaultdict(lambda: [0, 0.0])
+    successful: dict[tuple[PaymentParticipantRole, uuid.UUID], int] = defaultdict(int)
+    ledger: list[tuple[uuid.UUID, WithdrawalLedgerEntryType, Payment]] = []
+    for payment, old_status, (kind, parties) in changes:
+        key = (payment.created_at.date(), payment.currency, kind)
+        moves = [(payment.status, 1)]
+        if old_status is not None:
+            moves.append((old_status, -1))
+        for status, sign in moves:
+            daily[(*key, status)][0] += sign
+            daily[(*key, status)][1] += sign * payment.amount
+
+        success_delta = (
+            (payment.status == PaymentStatus.SUCCESS) - (old_status == PaymentStatus.SUCCESS)
+        )
+        if not success_delta:
+            continue
+        for role, user_id in parties:
+            successful[(role, user_id)] += success_delta
+        if kind == PaymentKind.SPONSORSHIP:
+            recipient_id = next(
+                user_id for role, user_id in parties if role == PaymentParticipantRole.RECIPIENT)
+            ledger.append((
+                recipient_id,
+                WithdrawalLedgerEntryType.SPONSORSHIP_CREDIT if success_delta > 0
+                else WithdrawalLedgerEntryType.SPONSORSHIP_REVERSAL,
+                payment,
+            ))
+
+    rows = [
+        {
+            "day": day,
+            "currency": currency,
+            "kind": kind,
+            "status": status,
+            "payment_count": count,
+            "total_amount": amount,
+        }
+        for (day, currency, kind, status), (count, amount) in sorted(daily.items())
+        if count or amount
+    ]
+    if rows:
+        statement = pg_insert(PaymentDailyRollup).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                PaymentDailyRollup.day, PaymentDailyRollup.currency,
+                PaymentDailyRollup.kind, PaymentDailyRollup.status
+            ],
+            set_={
+                "payment_count": PaymentDailyRollup.payment_count
+                + statement.excluded.payment_count,
+                "total_amount": PaymentDailyRollup.total_amount
+                + statement.excluded.total_amount,
+            },
+        )
+        session.execute(statement)
+
+    rows = [
+        {"role": role, "user_id": user_id, "successful_count": delta}
+        for (role, user_id), delta in sorted(successful.items()) if delta
+    ]
+    if rows:
+        statement = pg_insert(PaymentParticipantRollup).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[PaymentParticipantRollup.role, PaymentParticipantRollup.user_id],
+            set_={
+                "successful_count": PaymentParticipantRollup.successful_count
+                + statement.excluded.successful_count
+            },
+        )
+        session.execute(statement)
+
+    # Stable sort: a recipient's entries keep the order their changes happened in
+    for recipient_id, entry_type, payment in sorted(ledger, key=lambda entry: entry[0]):
+        append_withdrawal_ledger_entry(
+            session=session,
+            recipient_id=recipient_id,
+            entry_type=entry_type,
+            amount=payment.amount,
+            order_id=payment.order_id,
+        )
+
+
+def rebuild_payment_rollups(*, session: Session) -> int:
+    """
+    Recompute the payment rollups from donation, sponsorship and payment.
+    Returns the number of daily rollup rows written.
+    """
+    # Status changes that commit meanwhile wait for this to finish, then
+    # apply their move on top of the rebuilt rows
+    session.execute(text(
+        "LOCK TABLE payment_daily_rollup, payment_participant_rollup IN EXCLUSIVE MODE"
+    ))
+    session.execute(delete(PaymentDailyRollup))
+    session.execute(delete(PaymentParticipantRollup))
+
+    kind_type = PaymentDailyRollup.__table__.c.kind.type
+    role_type = PaymentParticipantRollup.__table__.c.role.type
+    written = 0
+    for kind, model in ((PaymentKind.DONATION, Donation), (PaymentKind.SPONSORSHIP, Sponsorship)):
+        day = func.date(Payment.created_at)
+        rollup = (
+            select(
+                day, Payment.currency, cast(literal(kind.value), kind_type), Payment.status,
+                func.count(), func.sum(Payment.amount)
+            )
+            .select_from(model)
+            .join(Payment, model.order_id == Payment.order_id)
+            .group_by(day, Payment.currency, Payment.status)
+        )
+        written += session.execute(insert(PaymentDailyRollup).from_select(
+            ["day", "currency", "kind", "status", "payment_count", "total_amount"], rollup
+        )).rowcount
+
+    for role, column, model in (
+        (PaymentParticipantRole.DONOR, Donation.donor_id, Donation),
+        (PaymentParticipantRole.SPONSOR, Sponsorship.sponsor_id, Sponsorship),
+        (PaymentParticipantRole.RECIPIENT, Sponsorship.recipient_id, Sponsorship),
+    ):
+        participants = (
+            select(cast(literal(role.value), role_type), column, func.count())
+            .select_from(model)
+            .join(Payment, model.order_id == Payment.order_id)
+            .where(Payment.status == PaymentStatus.SUCCESS)
+            .group_by(column)
+        )
+        session.execute(insert(PaymentParticipantRollup).from_select(
+            ["role", "user_id", "successful_count"], participants
+        ))
+
+    session.commit()
+    return written
+
+
+def get_payment_rollup_totals(
+    *, session: Session, kind: PaymentKind
+) -> dict[PaymentStatus, tuple[int, float]]:
+    """Payment count and amount per status for one kind, summed over all days"""
+    statement = (
+        select(
+            PaymentDailyRollup.status,
+            func.sum(PaymentDailyRollup.payment_count),
+            func.sum(PaymentDailyRollup.total_amount),
+        )
+        .where(PaymentDailyRollup.kind == kind)
+        .group_by(PaymentDailyRollup.status)
+    )
+    return {
+        status: (int(count), float(amount))
+        for status, count, amount in session.exec(statement).all()
+    }
+
+
+def count_payment_participants(*, session: Session, role: PaymentParticipantRole) -> int:
+    """Distinct users with at least one successful payment in this role"""
+    statement = select(func.count()).select_from(PaymentParticipantRollup).where(
+        PaymentParticipantRollup.role == role,
+        PaymentParticipantRollup.successful_count > 0
+    )
+    return session.exec(statement).one()
+
+
+def get_payment_daily_rollups(
+    *,
+    session: Session,
+    kind: PaymentKind | None = None,
+    start: date | None = None,
+    end: date | None = None
+) -> list[PaymentDailyRollup]:
+    """Daily rollup rows between start and end (inclusive), oldest first"""
+    statement = select(PaymentDailyRollup)
+    if kind:
+        statement = statement.where(PaymentDailyRollup.kind == kind)
+    if start:
+        statement = statement.where(PaymentDailyRollup.day >= start)
+    if end:
+        statement = statement.where(PaymentDailyRollup.day <= end)
+    statement = statement.order_by(
+        PaymentDailyRollup.day, PaymentDailyRollup.kind,
+        PaymentDailyRollup.currency, PaymentDailyRollup.status
+    )
+    return list(session.exec(statement).all())
+
+
+def payment_series_buckets(
+    start: date, end: date, granularity: PaymentSeriesGranularity
+) -> list[date]:
+    """Every bucket start between start and end, as date_trunc would label them"""
+    if granularity == PaymentSeriesGranularity.WEEK:
+        bucket = start - timedelta(days=start.weekday())
+    elif granularity == PaymentSeriesGranularity.MONTH:
+        bucket = start.replace(day=1)
+    else:
+        bucket = start
+    buckets = []
+    while bucket <= end:
+        buckets.append(bucket)
+        if granularity == PaymentSeriesGranularity.WEEK:
+            bucket += timedelta(weeks=1)
+        elif granularity == PaymentSeriesGranularity.MONTH:
+            bucket = (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            bucket += timedelta(days=1)
+    return buckets
+
+
+def get_payment_series(
+    *,
+    session: Session,
+    kind: PaymentKind,
+    granularity: PaymentSeriesGranularity,
+    start: date,
+    end: date,
+    window: int = 7,
+    currency: PaymentCurrency | None = None
+) -> list[PaymentSeriesPoint]:
+    """
+    Successful payments of one kind per day, week or month between start and
+    end (inclusive). Counts and amounts come from payment_daily_rollup;
+    unique payers need the underlying rows, restricted to the range. Empty
+    buckets are filled with zeros so the moving averages (over the trailing
+    `window` buckets) see them.
+    """
+    # Inlined rather than bound so GROUP BY matches the selected expression
+    field = literal_column(f"'{granularity.value}'")
+    bucket = cast(func.date_trunc(field, cast(PaymentDailyRollup.day, DateTime)), Date)
+    totals = (
+        select(bucket, func.sum(PaymentDailyRollup.payment_count),
+               func.sum(PaymentDailyRollup.total_amount))
+        .where(
+            PaymentDailyRollup.kind == kind,
+            PaymentDailyRollup.status == PaymentStatus.SUCCESS,
+            PaymentDailyRollup.day >= start,
+            PaymentDailyRollup.day <= end,
+        )
+        .group_by(bucket)
+    )
+    if currency:
+        totals = totals.where(PaymentDailyRollup.currency == currency)
+
+    if kind == PaymentKind.DONATION:
+        model, payer = Donation, Donation.donor_id
+    else:
+        model, payer = Sponsorship, Sponsorship.sponsor_id
+    payment_bucket = cast(func.date_trunc(field, Payment.created_at), Date)
+    payers = (
+        select(payment_bucket, func.count(func.distinct(payer)))
+        .select_from(model)
+        .join(Payment, model.order_id == Payment.order_id)
+        .where(
+            Payment.status == PaymentStatus.SUCCESS,
+            Payment.created_at >= start,
+            Payment.created_at < end + timedelta(days=1),
+        )
+        .group_by(payment_bucket)
+    )
+    if currency:
+        payers = payers.where(Payment.currency == currency)
+
+    by_bucket = {
+        day: (int(count), float(amount)) for day, count, amount in session.exec(totals).all()
+    }
+    unique_by_bucket = dict(session.exec(payers).all())
+
+    points: list[PaymentSeriesPoint] = []
+    for day in payment_series_buckets(start, end, granularity):
+        count, amount = by_bucket.get(day, (0, 0.0))
+        trailing = points[-(window - 1):] if window > 1 else []
+        counts = [p.count for p in trailing] + [count]
+        amounts = [p.amount for p in trailing] + [amount]
+        points.append(PaymentSeriesPoint(
+            bucket=day,
+            count=count,
+            amount=amount,
+            unique_payers=unique_by_bucket.get(day, 0),
+            count_moving_average=sum(counts) / len(counts),
+            amount_moving_average=sum(amounts) / len(amounts),
+        ))
+    return points
+
 # Notification CRUD operations
 
 
@@ -716,75 +1606,175 @@ async def create_notification(
     related_entity_type: str | None = None,
     action_url: str | None = None
 ) -> Notification:
-    """Create notification and send via SSE"""
-    # Create in database
-    notification = Notification(
-        user_id=user_id,
+    """Create notification and send via SSE (a fan-out to one user)"""
+    notifications = await create_notifications_bulk(
+        session=session,
+        user_ids=[user_id],
         type=type,
         title=title,
         message=message,
         related_entity_id=related_entity_id,
         related_entity_type=related_entity_type,
-        action_url=action_url,
-        created_at=datetime.now(timezone.utc)
+        action_url=action_url
     )
-    session.add(notification)
+    if not notifications:
+        raise ValueError(f"Cannot notify user {user_id}")
+    return notifications[0]
+
+
+async def create_notifications_bulk(
+    *,
+    session: Session,
+    user_ids: list[uuid.UUID],
+    type: NotificationType,
+    title: str,
+    message: str,
+    related_entity_id: uuid.UUID | None = None,
+    related_entity_type: str | None = None,
+    action_url: str | None = None
+) -> list[Notification]:
+    """
+    Create the same notification for many users with one INSERT and one commit.
+    Recipients that no longer exist are logged and skipped instead of failing
+    the whole batch.
+    """
+    if not user_ids:
+        return []
+    existing = set(session.exec(select(User.id).where(User.id.in_(set(user_ids)))).all())
+    unknown = [user_id for user_id in user_ids if user_id not in existing]
+    if unknown:
+        logger.warning(f"Skipping notifications for {len(unknown)} unknown users: {unknown[:10]}")
+    recipients = [user_id for user_id in user_ids if user_id in existing]
+    if not recipients:
+        return []
+    # Rows differ only in their recipient, so validate the shared fields once
+    try:
+        row = Notification.model_validate({
+            "user_id": recipients[0],
+            "type": type,
+            "title": title,
+            "message": message,
+            "related_entity_id": related_entity_id,
+            "related_entity_type": related_entity_type,
+            "action_url": action_url,
+            "created_at": datetime.now(timezone.utc),
+        }).model_dump()
+    except ValidationError as e:
+        logger.warning(f"Skipping invalid notifications for {len(recipients)} users: {e}")
+        return []
+    rows = [{**row, "id": uuid.uuid4(), "user_id": user_id} for user_id in recipients]
+    # Multi-row INSERT ... RETURNING (batched by SQLAlchemy under the
+    # driver's parameter limit)
+    notifications = list(
+        session.scalars(insert(Notification).returning(Notification), rows)
+    )
+    adjust_unread_notification_counts(
+        session=session, deltas=Counter(row["user_id"] for row in rows))
     session.commit()
-    session.refresh(notification)
 
-    # 2. TRY TO SEND VIA SSE - Bonus for online users
+    # Fan out to live connections in one publish
     try:
-        await notification_manager.send_notification(
-            user_id=user_id,
-            notification_data={
-                "id": str(notification.id),
-                "type": notification.type,
-                "title": notification.title,
-                "message": notification.message,
-                "action_url": notification.action_url,
-                "created_at": notification.created_at.replace(tzinfo=timezone.utc).isoformat(),
-                "is_read": notification.is_read
-            }
+        await notification_manager.send_notifications(
+            [
+                (notification.user_id, notification_event_data(notification))
+                for notification in notifications
+            ]
         )
-    except Exception as e:
-        # Silently handle notification delivery failure (user may be offline)
-        pass
+    except Exception:
+        logger.exception(f"Failed to publish {len(notifications)} notifications")
 
-    return notification
+    return notifications
 
 
 def get_user_notifications(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 50
-) -> tuple[list[Notification], int]:
+    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 50,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Notification], int | None]:
     """Get user's notifications (for initial load)"""
+    return get_page(
+        session=session,
+        statement=select(Notification).where(Notification.user_id == user_id),
+        columns=[Notification.created_at, Notification.id],
+        skip=skip, limit=limit, after=after
+    )
+
+
+async def get_user_notifications_async(
+    *, session: AsyncSession, user_id: uuid.UUID, skip: int = 0, limit: int = 50,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Notification], int | None]:
+    """Get user's notifications (async)"""
+    return await get_page_async(
+        session=session,
+        statement=select(Notification).where(Notification.user_id == user_id),
+        columns=[Notification.created_at, Notification.id],
+        skip=skip, limit=limit, after=after
+    )
+
+
+async def get_notifications_since_async(
+    *, session: AsyncSession, user_id: uuid.UUID, after: tuple[datetime, uuid.UUID],
+    limit: int = 100
+) -> list[Notification]:
+    """
+    Get the newest notifications after the (created_at, id) key `after`,
+    oldest first (SSE replay)
+    """
+    key = tuple_(Notification.created_at, Notification.id)
     statement = (
         select(Notification)
-        .where(Notification.user_id == user_id)
-        .order_by(Notification.created_at.desc())
-        .offset(skip)
+        .where(Notification.user_id == user_id, key > tuple_(*after))
+        .order_by(Notification.created_at.desc(), Notification.id.desc())
         .limit(limit)
     )
-    notifications = session.exec(statement).all()
+    notifications = (await session.exec(statement)).all()
+    return list(reversed(notifications))
 
-    count_statement = select(func.count(Notification.id)).where(
-        Notification.user_id == user_id
-    )
-    count = session.exec(count_statement).one()
 
-    return notifications, count
+def adjust_unread_notification_counts(
+    *, session: Session, deltas: dict[uuid.UUID, int]
+) -> None:
+    """Add deltas to users' unread counters (caller commits)"""
+    # Sorted so concurrent fan-outs lock counter rows in the same order
+    increments = [
+        {"user_id": user_id, "unread_count": delta}
+        for user_id, delta in sorted(deltas.items()) if delta > 0
+    ]
+    if increments:
+        statement = pg_insert(NotificationCounter).values(increments)
+        statement = statement.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={
+                "unread_count": NotificationCounter.unread_count
+                + statement.excluded.unread_count
+            },
+        )
+        session.execute(statement)
+    for user_id, delta in deltas.items():
+        if delta < 0:
+            session.execute(
+                update(NotificationCounter)
+                .where(NotificationCounter.user_id == user_id)
+                .values(unread_count=func.greatest(NotificationCounter.unread_count + delta, 0))
+            )
 
 
 def mark_notification_as_read(
     *, session: Session, notification_id: uuid.UUID
 ) -> Notification:
     """Mark single notification as read"""
-    notification = session.get(Notification, notification_id)
-    if notification:
-        notification.is_read = True
-        session.add(notification)
-        session.commit()
-        session.refresh(notification)
-    return notification
+    # Only an unread -> read transition touches the counter
+    statement = (
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .returning(Notification.user_id)
+    )
+    user_id = session.execute(statement).scalar_one_or_none()
+    if user_id:
+        adjust_unread_notification_counts(session=session, deltas={user_id: -1})
+    session.commit()
+    return session.get(Notification, notification_id)
 
 
 def mark_all_notifications_as_read(
@@ -792,43 +1782,60 @@ def mark_all_notifications_as_read(
 ) -> int:
     """Mark all user's notifications as read"""
     statement = (
-        select(Notification)
+        update(Notification)
         .where(Notification.user_id == user_id, Notification.is_read == False)
+        .values(is_read=True)
     )
-    notifications = session.exec(statement).all()
+    count = session.execute(statement).rowcount
+    adjust_unread_notification_counts(session=session, deltas={user_id: -count})
+    session.commit()
+    return count
 
-    for notification in notifications:
-        notification.is_read = True
-        session.add(notification)
 
-    session.commit()
-    return len(notifications)
+def get_unread_notifications(
+    *, session: Session, user_id: uuid.UUID
+) -> list[Notification]:
+    """Get all unread notifications for a user"""
+    statement = (
+        select(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        )
+        .order_by(Notification.created_at.desc())
+    )
+    return session.exec(statement).all()
 
 
-def get_unread_notifications(
-    *, session: Session, user_id: uuid.UUID
+async def get_unread_notifications_async(
+    *, session: AsyncSession, user_id: uuid.UUID
 ) -> list[Notification]:
-    """Get all unread notifications for a user"""
+    """Get all unread notifications for a user (async)"""
     statement = (
         select(Notification)
         .where(
             Notification.user_id == user_id,
-            Notification.is_read == False
+            Notification.is_read.is_(False)
         )
         .order_by(Notification.created_at.desc())
     )
-    return session.exec(statement).all()
+    return (await session.exec(statement)).all()
 
 
 def get_unread_notifications_count(
     *, session: Session, user_id: uuid.UUID
 ) -> int:
     """Get count of unread notifications for a user"""
-    statement = select(func.count(Notification.id)).where(
-        Notification.user_id == user_id,
-        Notification.is_read == False
-    )
-    return session.exec(statement).one()
+    counter = session.get(NotificationCounter, user_id)
+    return counter.unread_count if counter else 0
+
+
+async def get_unread_notifications_count_async(
+    *, session: AsyncSession, user_id: uuid.UUID
+) -> int:
+    """Get count of unread notifications for a user (async)"""
+    counter = await session.get(NotificationCounter, user_id)
+    return counter.unread_count if counter else 0
 
 
 # Donation CRUD operations
@@ -857,6 +1864,12 @@ def create_donation(
         message=message
     )
     session.add(db_donation)
+    payment = get_payment_by_order_id(session=session, order_id=order_id)
+    if payment:
+        record_payment_status_change(
+            session=session, payment=payment, old_status=None,
+            participants=(PaymentKind.DONATION, [(PaymentParticipantRole.DONOR, donor_id)])
+        )
     session.commit()
     session.refresh(db_donation)
     return db_donation
@@ -877,8 +1890,9 @@ def get_donations_by_donor_id(
     session: Session,
     donor_id: uuid.UUID,
     skip: int = 0,
-    limit: int = 100
-) -> list[Donation]:
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Donation], int | None]:
     """
     Get all donations made by a specific donor with SUCCESS or PENDING payment status,
     ordered by order_id (descending).
@@ -892,42 +1906,25 @@ def get_donations_by_donor_id(
             Donation.donor_id == donor_id,
             Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
         )
-        .order_by(Donation.order_id.desc())
-        .offset(skip)
-        .limit(limit)
+        .options(selectinload(Donation.donor), selectinload(Donation.payment))
     )
-    return list(session.exec(statement).all())
-
-
-def count_donations_by_donor_id(
-    *,
-    session: Session,
-    donor_id: uuid.UUID
-) -> int:
-    """
-    Count total donations made by a specific donor with SUCCESS or PENDING payment status.
-    Only counts donations where payment status is SUCCESS (2) or PENDING (0).
-    """
-    statement = (
-        select(Donation)
-        .join(Payment, Donation.order_id == Payment.order_id)
-        .where(
-            Donation.donor_id == donor_id,
-            Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
-        )
+    return get_page(
+        session=session, statement=statement, columns=[Donation.order_id],
+        skip=skip, limit=limit, after=after
     )
-    return len(list(session.exec(statement).all()))
 
 
 def get_all_donations(
     *,
     session: Session,
     skip: int = 0,
-    limit: int = 100
-) -> list[Donation]:
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Donation], int | None]:
     """
     Get all donations with SUCCESS or PENDING payment status,
     ordered by order_id (descending) - for admin use.
+    Donors and payments are loaded with the page.
     """
     statement = (
         select(Donation)
@@ -935,29 +1932,12 @@ def get_all_donations(
         .where(
             Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
         )
-        .order_by(Donation.order_id.desc())
-        .offset(skip)
-        .limit(limit)
+        .options(selectinload(Donation.donor), selectinload(Donation.payment))
     )
-    return list(session.exec(statement).all())
-
-
-def count_all_donations(
-    *,
-    session: Session
-) -> int:
-    """
-    Count total donations with SUCCESS or PENDING payment status - for admin use.
-    """
-    statement = (
-        select(func.count())
-        .select_from(Donation)
-        .join(Payment, Donation.order_id == Payment.order_id)
-        .where(
-            Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
-        )
+    return get_page(
+        session=session, statement=statement, columns=[Donation.order_id],
+        skip=skip, limit=limit, after=after
     )
-    return session.exec(statement).one()
 
 
 def get_donation_statistics(
@@ -968,54 +1948,18 @@ def get_donation_statistics(
     Get donation statistics for admin dashboard.
     Returns total donations, total amount, average donation, etc.
     """
-    # Get all successful donations
-    statement = (
-        select(Donation, Payment)
-        .join(Payment, Donation.order_id == Payment.order_id)
-        .where(Payment.status == PaymentStatus.SUCCESS)
-    )
-    results = list(session.exec(statement).all())
-
-    if not results:
-        return DonationStatistics(
-            total_donations=0,
-            total_amount=0.0,
-            average_donation=0.0,
-            pending_donations=0,
-            successful_donations=0,
-            unique_donors=0
-        )
-
-    # Calculate statistics
-    total_amount = sum(payment.amount for _, payment in results)
-    successful_count = len(results)
-    average_donation = total_amount / successful_count if successful_count > 0 else 0.0
-
-    # Count pending donations
-    pending_statement = (
-        select(func.count())
-        .select_from(Donation)
-        .join(Payment, Donation.order_id == Payment.order_id)
-        .where(Payment.status == PaymentStatus.PENDING)
-    )
-    pending_count = session.exec(pending_statement).one()
-
-    # Count unique donors
-    unique_donors_statement = (
-        select(func.count(func.distinct(Donation.donor_id)))
-        .select_from(Donation)
-        .join(Payment, Donation.order_id == Payment.order_id)
-        .where(Payment.status == PaymentStatus.SUCCESS)
-    )
-    unique_donors = session.exec(unique_donors_statement).one()
+    totals = get_payment_rollup_totals(session=session, kind=PaymentKind.DONATION)
+    successful_count, total_amount = totals.get(PaymentStatus.SUCCESS, (0, 0.0))
+    pending_count, _ = totals.get(PaymentStatus.PENDING, (0, 0.0))
 
     return DonationStatistics(
         total_donations=successful_count + pending_count,
-        total_amount=float(total_amount),
-        average_donation=float(average_donation),
+        total_amount=total_amount,
+        average_donation=total_amount / successful_count if successful_count else 0.0,
         pending_donations=pending_count,
         successful_donations=successful_count,
-        unique_donors=unique_donors
+        unique_donors=count_payment_participants(
+            session=session, role=PaymentParticipantRole.DONOR)
     )
 
 
@@ -1051,6 +1995,15 @@ def create_sponsorship(
         message=message
     )
     session.add(db_sponsorship)
+    payment = get_payment_by_order_id(session=session, order_id=order_id)
+    if payment:
+        record_payment_status_change(
+            session=session, payment=payment, old_status=None,
+            participants=(PaymentKind.SPONSORSHIP, [
+                (PaymentParticipantRole.SPONSOR, sponsor_id),
+                (PaymentParticipantRole.RECIPIENT, recipient_id),
+            ])
+        )
     session.commit()
     session.refresh(db_sponsorship)
     return db_sponsorship
@@ -1071,8 +2024,9 @@ def get_sponsorships_by_sponsor_id(
     session: Session,
     sponsor_id: uuid.UUID,
     skip: int = 0,
-    limit: int = 100
-) -> list[Sponsorship]:
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Sponsorship], int | None]:
     """
     Get all sponsorships made by a specific sponsor with SUCCESS or PENDING payment status,
     ordered by order_id (descending).
@@ -1086,11 +2040,16 @@ def get_sponsorships_by_sponsor_id(
             Sponsorship.sponsor_id == sponsor_id,
             Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
         )
-        .order_by(Sponsorship.order_id.desc())
-        .offset(skip)
-        .limit(limit)
+        .options(
+            selectinload(Sponsorship.sponsor),
+            selectinload(Sponsorship.recipient),
+            selectinload(Sponsorship.payment)
+        )
+    )
+    return get_page(
+        session=session, statement=statement, columns=[Sponsorship.order_id],
+        skip=skip, limit=limit, after=after
     )
-    return list(session.exec(statement).all())
 
 
 def get_sponsorships_by_recipient_id(
@@ -1098,8 +2057,9 @@ def get_sponsorships_by_recipient_id(
     session: Session,
     recipient_id: uuid.UUID,
     skip: int = 0,
-    limit: int = 100
-) -> list[Sponsorship]:
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Sponsorship], int | None]:
     """
     Get all sponsorships received by a specific recipient with SUCCESS or PENDING payment status,
     ordered by order_id (descending).
@@ -1113,62 +2073,29 @@ def get_sponsorships_by_recipient_id(
             Sponsorship.recipient_id == recipient_id,
             Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
         )
-        .order_by(Sponsorship.order_id.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    return list(session.exec(statement).all())
-
-
-def count_sponsorships_by_sponsor_id(
-    *,
-    session: Session,
-    sponsor_id: uuid.UUID
-) -> int:
-    """
-    Count total sponsorships made by a specific sponsor with SUCCESS or PENDING payment status.
-    Only counts sponsorships where payment status is SUCCESS (2) or PENDING (0).
-    """
-    statement = (
-        select(Sponsorship)
-        .join(Payment, Sponsorship.order_id == Payment.order_id)
-        .where(
-            Sponsorship.sponsor_id == sponsor_id,
-            Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
+        .options(
+            selectinload(Sponsorship.sponsor),
+            selectinload(Sponsorship.recipient),
+            selectinload(Sponsorship.payment)
         )
     )
-    return len(list(session.exec(statement).all()))
-
-
-def count_sponsorships_by_recipient_id(
-    *,
-    session: Session,
-    recipient_id: uuid.UUID
-) -> int:
-    """
-    Count total sponsorships received by a specific recipient with SUCCESS or PENDING payment status.
-    Only counts sponsorships where payment status is SUCCESS (2) or PENDING (0).
-    """
-    statement = (
-        select(Sponsorship)
-        .join(Payment, Sponsorship.order_id == Payment.order_id)
-        .where(
-            Sponsorship.recipient_id == recipient_id,
-            Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
-        )
+    return get_page(
+        session=session, statement=statement, columns=[Sponsorship.order_id],
+        skip=skip, limit=limit, after=after
     )
-    return len(list(session.exec(statement).all()))
 
 
 def get_all_sponsorships(
     *,
     session: Session,
     skip: int = 0,
-    limit: int = 100
-) -> list[Sponsorship]:
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Sponsorship], int | None]:
     """
     Get all sponsorships with SUCCESS or PENDING payment status,
     ordered by order_id (descending) - for admin use.
+    Sponsors, recipients and payments are loaded with the page.
     """
     statement = (
         select(Sponsorship)
@@ -1176,29 +2103,16 @@ def get_all_sponsorships(
         .where(
             Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
         )
-        .order_by(Sponsorship.order_id.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    return list(session.exec(statement).all())
-
-
-def count_all_sponsorships(
-    *,
-    session: Session
-) -> int:
-    """
-    Count total sponsorships with SUCCESS or PENDING payment status - for admin use.
-    """
-    statement = (
-        select(func.count())
-        .select_from(Sponsorship)
-        .join(Payment, Sponsorship.order_id == Payment.order_id)
-        .where(
-            Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING])
+        .options(
+            selectinload(Sponsorship.sponsor),
+            selectinload(Sponsorship.recipient),
+            selectinload(Sponsorship.payment)
         )
     )
-    return session.exec(statement).one()
+    return get_page(
+        session=session, statement=statement, columns=[Sponsorship.order_id],
+        skip=skip, limit=limit, after=after
+    )
 
 
 def get_sponsorship_statistics(
@@ -1209,70 +2123,95 @@ def get_sponsorship_statistics(
     Get sponsorship statistics for admin dashboard.
     Returns total sponsorships, total amount, average sponsorship, etc.
     """
-    # Get all successful sponsorships
-    statement = (
-        select(Sponsorship, Payment)
-        .join(Payment, Sponsorship.order_id == Payment.order_id)
-        .where(Payment.status == PaymentStatus.SUCCESS)
+    totals = get_payment_rollup_totals(session=session, kind=PaymentKind.SPONSORSHIP)
+    successful_count, total_amount = totals.get(PaymentStatus.SUCCESS, (0, 0.0))
+    pending_count, _ = totals.get(PaymentStatus.PENDING, (0, 0.0))
+
+    return SponsorshipStatistics(
+        total_sponsorships=successful_count + pending_count,
+        total_amount=total_amount,
+        average_sponsorship=total_amount / successful_count if successful_count else 0.0,
+        pending_sponsorships=pending_count,
+        successful_sponsorships=successful_count,
+        unique_sponsors=count_payment_participants(
+            session=session, role=PaymentParticipantRole.SPONSOR),
+        unique_recipients=count_payment_participants(
+            session=session, role=PaymentParticipantRole.RECIPIENT)
     )
-    results = list(session.exec(statement).all())
-
-    if not results:
-        return SponsorshipStatistics(
-            total_sponsorships=0,
-            total_amount=0.0,
-            average_sponsorship=0.0,
-            pending_sponsorships=0,
-            successful_sponsorships=0,
-            unique_sponsors=0,
-            unique_recipients=0
-        )
 
-    # Calculate statistics
-    total_amount = sum(payment.amount for _, payment in results)
-    successful_count = len(results)
-    average_sponsorship = total_amount / \
-        successful_count if successful_count > 0 else 0.0
 
-    # Count pending sponsorships
-    pending_statement = (
-        select(func.count())
-        .select_from(Sponsorship)
-        .join(Payment, Sponsorship.order_id == Payment.order_id)
-        .where(Payment.status == PaymentStatus.PENDING)
-    )
-    pending_count = session.exec(pending_statement).one()
+# Withdrawal CRUD operations
 
-    # Count unique sponsors
-    unique_sponsors_statement = (
-        select(func.count(func.distinct(Sponsorship.sponsor_id)))
-        .select_from(Sponsorship)
-        .join(Payment, Sponsorship.order_id == Payment.order_id)
-        .where(Payment.status == PaymentStatus.SUCCESS)
-    )
-    unique_sponsors = session.exec(unique_sponsors_statement).one()
 
-    # Count unique recipients
-    unique_recipients_statement = (
-        select(func.count(func.distinct(Sponsorship.recipient_id)))
-        .select_from(Sponsorship)
-        .join(Payment, Sponsorship.order_id == Payment.order_id)
-        .where(Payment.status == PaymentStatus.SUCCESS)
+# How each ledger entry moves (total_received, total_withdrawn, pending_withdrawals)
+LEDGER_EFFECTS = {
+    WithdrawalLedgerEntryType.SPONSORSHIP_CREDIT: (1, 0, 0),
+    WithdrawalLedgerEntryType.SPONSORSHIP_REVERSAL: (-1, 0, 0),
+    WithdrawalLedgerEntryType.WITHDRAWAL_HOLD: (0, 0, 1),
+    WithdrawalLedgerEntryType.WITHDRAWAL_COMPLETION: (0, 1, -1),
+}
+
+
+def append_withdrawal_ledger_entry(
+    *,
+    session: Session,
+    recipient_id: uuid.UUID,
+    entry_type: WithdrawalLedgerEntryType,
+    amount: float,
+    order_id: int | None = None,
+    withdrawal_id: uuid.UUID | None = None
+) -> WithdrawalLedgerEntry:
+    """Append a ledger entry and apply it to the recipient's balance row (caller commits)"""
+    entry = WithdrawalLedgerEntry(
+        recipient_id=recipient_id,
+        entry_type=entry_type,
+        amount=amount,
+        order_id=order_id,
+        withdrawal_id=withdrawal_id
     )
-    unique_recipients = session.exec(unique_recipients_statement).one()
+    session.add(entry)
 
-    return SponsorshipStatistics(
-        total_sponsorships=successful_count + pending_count,
-        total_amount=float(total_amount),
-        average_sponsorship=float(average_sponsorship),
-        pending_sponsorships=pending_count,
-        successful_sponsorships=successful_count,
-        unique_sponsors=unique_sponsors,
-        unique_recipients=unique_recipients
+    received, withdrawn, pending = LEDGER_EFFECTS[entry_type]
+    statement = pg_insert(RecipientBalance).values(
+        recipient_id=recipient_id,
+        total_received=received * amount,
+        total_withdrawn=withdrawn * amount,
+        pending_withdrawals=pending * amount,
+        updated_at=entry.created_at
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[RecipientBalance.recipient_id],
+        set_={
+            "total_received": RecipientBalance.total_received
+            + statement.excluded.total_received,
+            "total_withdrawn": RecipientBalance.total_withdrawn
+            + statement.excluded.total_withdrawn,
+            "pending_withdrawals": RecipientBalance.pending_withdrawals
+            + statement.excluded.pending_withdrawals,
+            "updated_at": statement.excluded.updated_at,
+        },
     )
+    session.execute(statement)
+    return entry
 
 
-# Withdrawal CRUD operations
+def lock_recipient_balance(*, session: Session, recipient_id: uuid.UUID) -> RecipientBalance:
+    """
+    Row-lock the recipient's balance until the transaction ends, creating an
+    empty balance row first if the recipient has none yet.
+    """
+    session.execute(
+        pg_insert(RecipientBalance)
+        .values(recipient_id=recipient_id)
+        .on_conflict_do_nothing(index_elements=[RecipientBalance.recipient_id])
+    )
+    statement = (
+        select(RecipientBalance)
+        .where(RecipientBalance.recipient_id == recipient_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return session.exec(statement).one()
 
 
 def get_withdrawal_balance(
@@ -1284,49 +2223,88 @@ def get_withdrawal_balance(
     Calculate withdrawal balance for a recipient.
     Returns total received, total withdrawn, pending withdrawals, and available balance.
     """
+    # Running totals kept by the withdrawal ledger, so this is a key lookup
+    balance = session.get(RecipientBalance, recipient_id, populate_existing=True)
+    if not balance:
+        balance = RecipientBalance(recipient_id=recipient_id)
 
-    # Get total successfully received sponsorships
-    statement = (
-        select(func.sum(Payment.amount))
-        .select_from(Sponsorship)
-        .join(Payment, Sponsorship.order_id == Payment.order_id)
-        .where(
-            Sponsorship.recipient_id == recipient_id,
-            Payment.status == PaymentStatus.SUCCESS
+    return {
+        "total_received": balance.total_received,
+        "total_withdrawn": balance.total_withdrawn,
+        "pending_withdrawals": balance.pending_withdrawals,
+        "available_balance": (
+            balance.total_received - balance.total_withdrawn - balance.pending_withdrawals
         )
-    )
-    total_received = session.exec(statement).one() or 0.0
+    }
 
-    # Get total withdrawn (completed withdrawals)
-    withdrawn_statement = (
-        select(func.sum(Withdrawal.amount_requested))
-        .where(
-            Withdrawal.recipient_id == recipient_id,
-            Withdrawal.status == WithdrawalStatus.COMPLETED
-        )
-    )
-    total_withdrawn = session.exec(withdrawn_statement).one() or 0.0
 
-    # Get pending withdrawals
-    pending_statement = (
-        select(func.sum(Withdrawal.amount_requested))
-        .where(
-            Withdrawal.recipient_id == recipient_id,
-            Withdrawal.status == WithdrawalStatus.PENDING
+def reconcile_withdrawal_ledger(*, session: Session) -> list[WithdrawalLedgerDiscrepancy]:
+    """
+    Compare, per recipient, the balance figures derived from sponsorships and
+    withdrawals with the ledger sums and the materialized balance rows.
+    """
+    source: dict[uuid.UUID, dict[str, float]] = {}
+    received = (
+        select(Sponsorship.recipient_id, func.sum(Payment.amount))
+        .join(Payment, Sponsorship.order_id == Payment.order_id)
+        .where(Payment.status == PaymentStatus.SUCCESS)
+        .group_by(Sponsorship.recipient_id)
+    )
+    for recipient_id, amount in session.exec(received).all():
+        source.setdefault(recipient_id, {})["total_received"] = amount
+    withdrawals = (
+        select(Withdrawal.recipient_id, Withdrawal.status, func.sum(Withdrawal.amount_requested))
+        .where(Withdrawal.status.in_([WithdrawalStatus.COMPLETED, WithdrawalStatus.PENDING]))
+        .group_by(Withdrawal.recipient_id, Withdrawal.status)
+    )
+    for recipient_id, status, amount in session.exec(withdrawals).all():
+        field = (
+            "total_withdrawn" if status == WithdrawalStatus.COMPLETED else "pending_withdrawals"
         )
-    )
-    pending_withdrawals = session.exec(pending_statement).one() or 0.0
-
-    # Calculate available balance
-    available_balance = total_received - total_withdrawn - pending_withdrawals
-
-    return {
-        "total_received": float(total_received),
-        "total_withdrawn": float(total_withdrawn),
-        "pending_withdrawals": float(pending_withdrawals),
-        "available_balance": float(available_balance)
+        source.setdefault(recipient_id, {})[field] = amount
+
+    def entries(*types: WithdrawalLedgerEntryType) -> Any:
+        return func.coalesce(
+            func.sum(WithdrawalLedgerEntry.amount).filter(
+                WithdrawalLedgerEntry.entry_type.in_(types)), 0.0)
+
+    Entry = WithdrawalLedgerEntryType
+    ledger_statement = select(
+        WithdrawalLedgerEntry.recipient_id,
+        entries(Entry.SPONSORSHIP_CREDIT) - entries(Entry.SPONSORSHIP_REVERSAL),
+        entries(Entry.WITHDRAWAL_COMPLETION),
+        entries(Entry.WITHDRAWAL_HOLD) - entries(Entry.WITHDRAWAL_COMPLETION),
+    ).group_by(WithdrawalLedgerEntry.recipient_id)
+    ledger = {
+        recipient_id: {
+            "total_received": received,
+            "total_withdrawn": withdrawn,
+            "pending_withdrawals": pending,
+        }
+        for recipient_id, received, withdrawn, pending in session.exec(ledger_statement).all()
+    }
+    balances = {
+        balance.recipient_id: balance
+        for balance in session.exec(select(RecipientBalance)).all()
     }
 
+    discrepancies = []
+    for recipient_id in sorted(source.keys() | ledger.keys() | balances.keys()):
+        balance = balances.get(recipient_id)
+        for field in ("total_received", "total_withdrawn", "pending_withdrawals"):
+            figures = (
+                source.get(recipient_id, {}).get(field, 0.0),
+                ledger.get(recipient_id, {}).get(field, 0.0),
+                getattr(balance, field) if balance else 0.0,
+            )
+            # Amounts are floats; ignore differences below a cent
+            if max(figures) - min(figures) >= 0.005:
+                discrepancies.append(WithdrawalLedgerDiscrepancy(
+                    recipient_id=recipient_id, field=field,
+                    source=figures[0], ledger=figures[1], balance=figures[2]
+                ))
+    return discrepancies
+
 
 def create_withdrawal(
     *,
@@ -1336,13 +2314,43 @@ def create_withdrawal(
     bank_account_number: str,
     bank_name: str,
     account_holder_name: str,
-    fee_percentage: float = 6.0
+    fee_percentage: float = 6.0,
+    idempotency_key: str | None = None
 ) -> Withdrawal:
     """
     Create a new withdrawal request.
     Calculates fee and amount to transfer automatically.
+    Checks the balance and creates the withdrawal under the recipient's balance
+    row lock, so concurrent requests cannot overdraw. A request repeating an
+    earlier idempotency_key returns the withdrawal created for it.
     """
 
+    balance = lock_recipient_balance(session=session, recipient_id=recipient_id)
+
+    if idempotency_key:
+        statement = select(Withdrawal).where(
+            Withdrawal.recipient_id == recipient_id,
+            Withdrawal.idempotency_key == idempotency_key
+        )
+        existing = session.exec(statement).first()
+        if existing:
+            session.rollback()
+            if existing.amount_requested != amount_requested:
+                raise ValueError(
+                    "Idempotency key was already used for a different withdrawal")
+            session.refresh(existing)
+            return existing
+
+    available_balance = (
+        balance.total_received - balance.total_withdrawn - balance.pending_withdrawals
+    )
+    if amount_requested > available_balance:
+        session.rollback()
+        raise ValueError(
+            f"Insufficient balance. Available: {available_balance:.2f}, "
+            f"Requested: {amount_requested:.2f}"
+        )
+
     # Calculate fee and amount to transfer
     fee_amount = amount_requested * (fee_percentage / 100)
     amount_to_transfer = amount_requested - fee_amount
@@ -1357,10 +2365,18 @@ def create_withdrawal(
         bank_name=bank_name,
         account_holder_name=account_holder_name,
         status=WithdrawalStatus.PENDING,
-        requested_at=datetime.utcnow()
+        requested_at=datetime.utcnow(),
+        idempotency_key=idempotency_key
     )
 
     session.add(withdrawal)
+    append_withdrawal_ledger_entry(
+        session=session,
+        recipient_id=recipient_id,
+        entry_type=WithdrawalLedgerEntryType.WITHDRAWAL_HOLD,
+        amount=amount_requested,
+        withdrawal_id=withdrawal.id
+    )
     session.commit()
     session.refresh(withdrawal)
     return withdrawal
@@ -1371,33 +2387,19 @@ def get_withdrawals_by_recipient(
     session: Session,
     recipient_id: uuid.UUID,
     skip: int = 0,
-    limit: int = 100
-) -> list[Withdrawal]:
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Withdrawal], int | None]:
     """Get all withdrawals for a specific recipient, ordered by requested_at descending"""
 
     statement = (
         select(Withdrawal)
         .where(Withdrawal.recipient_id == recipient_id)
-        .order_by(Withdrawal.requested_at.desc())
-        .offset(skip)
-        .limit(limit)
     )
-    return list(session.exec(statement).all())
-
-
-def count_withdrawals_by_recipient(
-    *,
-    session: Session,
-    recipient_id: uuid.UUID
-) -> int:
-    """Count total withdrawals for a recipient"""
-
-    statement = (
-        select(func.count())
-        .select_from(Withdrawal)
-        .where(Withdrawal.recipient_id == recipient_id)
+    return get_page(
+        session=session, statement=statement, columns=[Withdrawal.requested_at, Withdrawal.id],
+        skip=skip, limit=limit, after=after
     )
-    return session.exec(statement).one()
 
 
 def get_withdrawal_by_id(
@@ -1418,12 +2420,45 @@ def complete_withdrawal(
     """
     Mark a withdrawal as completed.
     This would be called after the mock transfer is processed.
+    Runs under the recipient's balance row lock, like create_withdrawal, and
+    re-reads the withdrawal under it, so concurrent completions of the same
+    withdrawal move the balance once.
     """
 
     withdrawal = session.get(Withdrawal, withdrawal_id)
     if not withdrawal:
         raise ValueError(f"Withdrawal with id {withdrawal_id} not found")
 
+    lock_recipient_balance(session=session, recipient_id=withdrawal.recipient_id)
+    withdrawal = session.exec(
+        select(Withdrawal)
+        .where(Withdrawal.id == withdrawal_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).one()
+    if withdrawal.status == WithdrawalStatus.COMPLETED:
+        # Completed by a concurrent or earlier call
+        session.commit()
+        return withdrawal
+
+    # Move the held amount from pending to withdrawn; a withdrawal that
+    # was never held gets its hold first so the ledger stays balanced
+    if withdrawal.status == WithdrawalStatus.NOT_WITHDRAWN:
+        append_withdrawal_ledger_entry(
+            session=session,
+            recipient_id=withdrawal.recipient_id,
+            entry_type=WithdrawalLedgerEntryType.WITHDRAWAL_HOLD,
+            amount=withdrawal.amount_requested,
+            withdrawal_id=withdrawal.id
+        )
+    append_withdrawal_ledger_entry(
+        session=session,
+        recipient_id=withdrawal.recipient_id,
+        entry_type=WithdrawalLedgerEntryType.WITHDRAWAL_COMPLETION,
+        amount=withdrawal.amount_requested,
+        withdrawal_id=withdrawal.id
+    )
+
     withdrawal.status = WithdrawalStatus.COMPLETED
     withdrawal.completed_at = datetime.utcnow()
 
@@ -1437,27 +2472,22 @@ def get_all_withdrawals(
     *,
     session: Session,
     skip: int = 0,
-    limit: int = 100
-) -> list[Withdrawal]:
-    """Get all withdrawals across all users (admin only), ordered by requested_at descending"""
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None
+) -> tuple[list[Withdrawal], int | None]:
+    """
+    Get all withdrawals across all users (admin only), ordered by requested_at descending.
+    Recipients are loaded with the page.
+    """
 
     statement = (
         select(Withdrawal)
-        .order_by(Withdrawal.requested_at.desc())
-        .offset(skip)
-        .limit(limit)
+        .options(selectinload(Withdrawal.recipient))
+    )
+    return get_page(
+        session=session, statement=statement, columns=[Withdrawal.requested_at, Withdrawal.id],
+        skip=skip, limit=limit, after=after, estimate=True
     )
-    return list(session.exec(statement).all())
-
-
-def count_all_withdrawals(
-    *,
-    session: Session
-) -> int:
-    """Count total withdrawals across all users"""
-
-    statement = select(func.count()).select_from(Withdrawal)
-    return session.exec(statement).one()
 
 
 # Requester Profile CRUD operations
@@ -1576,7 +2606,7 @@ def search_requester_profiles(
     location: str | None = None,
     skip: int = 0,
     limit: int = 100
-) -> tuple[list[RequesterProfilePublic], int]:
+) -> tuple[list[RequesterProfilePublic], int | None]:
     """Search requester profiles with filters"""
     statement = (
         select(RequesterProfile)
@@ -1602,15 +2632,11 @@ def search_requester_profiles(
     if filters:
         statement = statement.where(*filters)
 
-    # Add pagination and ordering
-    count_statement = statement.with_only_columns(
-        func.count(RequesterProfile.id))
-    count = session.exec(count_statement).one()
-
-    profiles = session.exec(
-        statement.offset(skip).limit(limit).order_by(
-            RequesterProfile.created_at.desc())
-    ).all()
+    # Page and total in one query
+    profiles, count = get_page(
+        session=session, statement=statement,
+        columns=[RequesterProfile.created_at, RequesterProfile.id], skip=skip, limit=limit
+    )
 
     # Convert to public models
     public_profiles = [
@@ -1813,6 +2839,26 @@ def check_reviewer_permission(
     return permission is not None
 
 
+async def check_reviewer_permission_async(
+    *,
+    session: AsyncSession,
+    project_id: uuid.UUID,
+    user_id: uuid.UUID
+) -> bool:
+    """Async version of check_reviewer_permission"""
+    project = await session.get(Project, project_id)
+    if project and project.requester_id == user_id:
+        return True
+
+    statement = select(ApplicationReviewerPermission).where(
+        ApplicationReviewerPermission.project_id == project_id,
+        ApplicationReviewerPermission.reviewer_id == user_id,
+        ApplicationReviewerPermission.status == ReviewerPermissionStatus.ACTIVE
+    )
+    permission = (await session.exec(statement)).first()
+    return permission is not None
+
+
 def get_reviewer_permissions_for_project(
     *,
     session: Session,
@@ -2218,7 +3264,7 @@ def search_volunteer_profiles(
     location: str | None = None,
     skip: int = 0,
     limit: int = 100
-) -> tuple[list[VolunteerProfilePublic], int]:
+) -> tuple[list[VolunteerProfilePublic], int | None]:
     """Search volunteer profiles with filters"""
     statement = (
         select(VolunteerProfile)
@@ -2248,15 +3294,11 @@ def search_volunteer_profiles(
     if filters:
         statement = statement.where(*filters)
 
-    # Add pagination and ordering
-    count_statement = statement.with_only_columns(
-        func.count(VolunteerProfile.id))
-    count = session.exec(count_statement).one()
-
-    profiles = session.exec(
-        statement.offset(skip).limit(limit).order_by(
-            VolunteerProfile.created_at.desc())
-    ).all()
+    # Page and total in one query
+    profiles, count = get_page(
+        session=session, statement=statement,
+        columns=[VolunteerProfile.created_at, VolunteerProfile.id], skip=skip, limit=limit
+    )
 
     # Convert to public models
     public_profiles = [
@@ -2470,7 +3512,7 @@ def search_volunteer_profiles(
     location: str | None = None,
     skip: int = 0,
     limit: int = 100
-) -> tuple[list[VolunteerProfilePublic], int]:
+) -> tuple[list[VolunteerProfilePublic], int | None]:
     """Search volunteer profiles with filters"""
     statement = (
         select(VolunteerProfile)
@@ -2500,15 +3542,11 @@ def search_volunteer_profiles(
     if filters:
         statement = statement.where(*filters)
 
-    # Add pagination and ordering
-    count_statement = statement.with_only_columns(
-        func.count(VolunteerProfile.id))
-    count = session.exec(count_statement).one()
-
-    profiles = session.exec(
-        statement.offset(skip).limit(limit).order_by(
-            VolunteerProfile.created_at.desc())
-    ).all()
+    # Page and total in one query
+    profiles, count = get_page(
+        session=session, statement=statement,
+        columns=[VolunteerProfile.created_at, VolunteerProfile.id], skip=skip, limit=limit
+    )
 
     # Convert to public models
     public_profiles = [
@@ -1,10 +1,19 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.notification_manager import notification_manager
+from app.services.payhere_service import payhere_service
+from app.services.payhere_webhook_processor import payhere_webhook_processor
+from app.services.payment_reconciler import payment_reconciler
+from app.utils import InvalidCursorError
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,10 +23,26 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    await notification_manager.start()
+    await payhere_service.start()
+    await payhere_webhook_processor.start()
+    await payment_reconciler.start()
+    try:
+        yield
+    finally:
+        await payment_reconciler.stop()
+        await payhere_webhook_processor.stop()
+        await payhere_service.stop()
+        await notification_manager.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -30,4 +55,11 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(_request: Request, exc: InvalidCursorError) -> JSONResponse:
+    """A cursor from another listing is a bad request on every keyset listing"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,14 +1,14 @@
 import uuid
 import enum
 import re
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 from urllib.parse import urlparse
 
 from pydantic import EmailStr, field_validator, ValidationError
 from sqlmodel import Field, Relationship, SQLModel, Column, Enum, Identity, Integer
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
-from sqlalchemy import String
+from sqlalchemy import Index, String, text
 
 
 class UserRole(str, enum.Enum):
@@ -233,6 +233,10 @@ class ProjectUpdate(SQLModel):
 
 # Database model, database table inferred from class name
 class Project(ProjectBase, table=True):
+    __table_args__ = (
+        Index("ix_project_status_created_at", "status", "created_at"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     requester_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE")
@@ -262,8 +266,12 @@ class ProjectPublic(ProjectBase):
 # Pagination metadata
 class Meta(SQLModel):
     page: int
-    total: int
-    totalPages: int
+    # None on pages read with a cursor; the first page carries the total
+    total: int | None
+    totalPages: int | None
+    # Keyset pagination: pass back as ?cursor= for the next page. page and
+    # totalPages describe offset paging and are not meaningful with a cursor
+    next_cursor: str | None = None
 
 
 # Response wrapper for single project
@@ -356,6 +364,10 @@ class TaskUpdate(SQLModel):
 
 
 class Task(TaskBase, table=True):
+    __table_args__ = (
+        Index("ix_task_assignee_id_status", "assignee_id", "status"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     project_id: uuid.UUID = Field(
         foreign_key="project.id", nullable=False, ondelete="CASCADE")
@@ -418,15 +430,34 @@ class ProjectThreadUpdate(SQLModel):
     body: str | None = Field(default=None, min_length=1, max_length=10000)
 
 
+class ProjectThreadSort(str, enum.Enum):
+    CREATED = "created"
+    ACTIVITY = "activity"
+
+
 class ProjectThread(ProjectThreadBase, table=True):
+    __table_args__ = (
+        # A project's threads, most recently active first
+        Index("ix_projectthread_project_id_last_activity_at_id",
+              "project_id", "last_activity_at", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     author_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     project_id: uuid.UUID = Field(foreign_key="project.id", nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={
                                  "onupdate": datetime.utcnow})
-
-    author: "User" = Relationship()
+    # Kept up to date by the comment and reply writes in crud, so listings
+    # never read the comment tables; rebuild_project_thread_activity
+    # recomputes them from the comments and replies
+    comment_count: int = Field(default=0, nullable=False)
+    reply_count: int = Field(default=0, nullable=False)
+    last_activity_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    last_author_id: uuid.UUID | None = Field(default=None, foreign_key="user.id")
+
+    author: "User" = Relationship(
+        sa_relationship_kwargs={"foreign_keys": "[ProjectThread.author_id]"})
     project: "Project" = Relationship(back_populates="threads")
     comments: list["Comment"] = Relationship(
         back_populates="thread", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
@@ -438,8 +469,15 @@ class ProjectThreadPublic(ProjectThreadBase):
     project_id: uuid.UUID
     created_at: datetime
     updated_at: datetime
+    comment_count: int
+    reply_count: int
+    last_activity_at: datetime
+    last_author_id: uuid.UUID | None
     author: UserPublic
     comments: list["CommentPublic"] = []
+    # Thread detail only carries the first page of comments; pass this as
+    # ?cursor= to the comments listing for the next one
+    comments_next_cursor: str | None = None
 
 
 class ProjectThreadsPublic(SQLModel):
@@ -461,6 +499,11 @@ class CommentUpdate(SQLModel):
 
 
 class Comment(CommentBase, table=True):
+    __table_args__ = (
+        # A thread's comments in display order
+        Index("ix_comment_thread_id_created_at_id", "thread_id", "created_at", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     author_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     thread_id: uuid.UUID = Field(
@@ -483,6 +526,9 @@ class CommentPublic(CommentBase):
     updated_at: datetime
     author: UserPublic
     replies: list["ReplyPublic"] = []
+    # Set when only the first replies are included; pass as ?cursor= to the
+    # replies listing for the rest
+    replies_next_cursor: str | None = None
 
 
 class CommentsPublic(SQLModel):
@@ -504,6 +550,11 @@ class ReplyUpdate(SQLModel):
 
 
 class Reply(ReplyBase, table=True):
+    __table_args__ = (
+        # A comment's replies in display order, also what the reply window reads
+        Index("ix_reply_parent_id_created_at_id", "parent_id", "created_at", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     author_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     parent_id: uuid.UUID = Field(
@@ -690,6 +741,9 @@ class ApprovedTeamMembersPublic(SQLModel):
 # Database model
 class ProjectApplication(ProjectApplicationBase, table=True):
     __table_args__ = (
+        Index("ix_projectapplication_project_id_status", "project_id", "status"),
+        Index("ix_projectapplication_volunteer_id_created_at",
+              "volunteer_id", "created_at"),
         # Unique constraint to prevent duplicate applications
         {"sqlite_autoincrement": True},
     )
@@ -783,6 +837,13 @@ class PaymentCreate(SQLModel):
 
 # Database model
 class Payment(PaymentBase, table=True):
+    __table_args__ = (
+        Index("ix_payment_status", "status"),
+        # Payments the background reconciler may still have to check
+        Index("ix_payment_reconciled_at_unsettled", "reconciled_at", "created_at",
+              postgresql_where=text("status IN ('PENDING', 'NOT_FOUND')")),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     order_id: int = Field(sa_column=Column(
         "order_id", Integer, Identity(), unique=True))
@@ -790,6 +851,8 @@ class Payment(PaymentBase, table=True):
         default=PaymentStatus.PENDING, sa_column=Column(Enum(PaymentStatus)))
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # When the background reconciler last asked PayHere about this payment
+    reconciled_at: datetime | None = None
 
 
 # Public API models
@@ -830,6 +893,28 @@ class PayhereCheckoutAPIVerificationResponse(SQLModel):
     card_expiry: str | None = None
 
 
+class PayHereWebhookEvent(SQLModel, table=True):
+    """
+    A verified PayHere notification, recorded on the request path and applied
+    to its payment off-request. PayHere resends a notification until it is
+    acknowledged; the (order_id, status_code, md5sig) key makes the resends
+    no-ops.
+    """
+    __table_args__ = (
+        Index("ix_payherewebhookevent_order_id_status_code_md5sig",
+              "order_id", "status_code", "md5sig", unique=True),
+        Index("ix_payherewebhookevent_received_at_unprocessed", "received_at",
+              postgresql_where=text("processed_at IS NULL")),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    order_id: int = Field(foreign_key="payment.order_id", ondelete="CASCADE")
+    status_code: int
+    md5sig: str = Field(max_length=64)
+    received_at: datetime = Field(default_factory=datetime.utcnow)
+    processed_at: datetime | None = None
+
+
 # PayHere Retrieval API models
 class PayHereOAuthTokenResponse(SQLModel):
     """Response from PayHere OAuth token endpoint"""
@@ -839,6 +924,19 @@ class PayHereOAuthTokenResponse(SQLModel):
     scope: str
 
 
+class PayHereAccessToken(SQLModel, table=True):
+    """
+    The OAuth token shared by every worker, one row per PayHere app. A worker
+    renewing the token first claims the renewal until refreshing_until, so the
+    others wait for its token instead of asking PayHere for their own.
+    """
+    app_id: str = Field(primary_key=True, max_length=255)
+    access_token: str | None = None
+    expires_at: datetime | None = None
+    refreshing_until: datetime | None = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class PayHereCustomerDetails(SQLModel):
     """Customer details from PayHere retrieval response"""
     fist_name: str | None = None  # Note: PayHere API has typo "fist_name"
@@ -924,6 +1022,14 @@ class NotificationType(str, enum.Enum):
 
 
 class Notification(SQLModel, table=True):
+    __table_args__ = (
+        # SSE replay after reconnect: newer notifications of one user
+        Index("ix_notification_user_id_created_at", "user_id", "created_at"),
+        # Unread list only ever reads the unread slice
+        Index("ix_notification_user_id_created_at_unread", "user_id", "created_at",
+              postgresql_where=text("is_read = false")),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE")
@@ -942,6 +1048,13 @@ class Notification(SQLModel, table=True):
     recipient: User = Relationship(back_populates="notifications")
 
 
+class NotificationCounter(SQLModel, table=True):
+    """Denormalized unread count, so the badge is a primary key lookup"""
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    unread_count: int = Field(default=0)
+
+
 # Donation models
 class DonationBase(SQLModel):
     message: str | None = Field(default=None, max_length=500)
@@ -1029,6 +1142,10 @@ class WithdrawalRequest(SQLModel):
 
 
 class Sponsorship(SponsorshipBase, table=True):
+    __table_args__ = (
+        Index("ix_sponsorship_recipient_id", "recipient_id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     sponsor_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
@@ -1086,12 +1203,98 @@ class SponsorshipStatistics(SQLModel):
     unique_recipients: int
 
 
+# Payment rollup models
+class PaymentKind(str, enum.Enum):
+    DONATION = "DONATION"
+    SPONSORSHIP = "SPONSORSHIP"
+
+
+class PaymentParticipantRole(str, enum.Enum):
+    DONOR = "DONOR"
+    SPONSOR = "SPONSOR"
+    RECIPIENT = "RECIPIENT"
+
+
+class PaymentDailyRollup(SQLModel, table=True):
+    """
+    Payments per day (of initiation), currency, kind and status.
+    Kept in step with every status change so dashboards read these rows
+    instead of scanning payment.
+    """
+    __tablename__ = "payment_daily_rollup"
+
+    day: date = Field(primary_key=True)
+    currency: PaymentCurrency = Field(
+        sa_column=Column(Enum(PaymentCurrency), primary_key=True))
+    kind: PaymentKind = Field(
+        sa_column=Column(Enum(PaymentKind), primary_key=True))
+    status: PaymentStatus = Field(
+        sa_column=Column(Enum(PaymentStatus), primary_key=True))
+    payment_count: int = Field(default=0)
+    total_amount: float = Field(default=0.0)
+
+
+class PaymentParticipantRollup(SQLModel, table=True):
+    """Successful payments per donor, sponsor and recipient, for unique counts"""
+    __tablename__ = "payment_participant_rollup"
+
+    role: PaymentParticipantRole = Field(
+        sa_column=Column(Enum(PaymentParticipantRole), primary_key=True))
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    successful_count: int = Field(default=0)
+
+
+class PaymentDailyRollupPublic(SQLModel):
+    day: date
+    currency: PaymentCurrency
+    kind: PaymentKind
+    status: PaymentStatus
+    payment_count: int
+    total_amount: float
+
+
+class PaymentDailyRollupsPublic(SQLModel):
+    data: list[PaymentDailyRollupPublic]
+
+
+class PaymentSeriesGranularity(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class PaymentSeriesPoint(SQLModel):
+    """Successful payments in one bucket, with trailing moving averages"""
+    bucket: date
+    count: int
+    amount: float
+    unique_payers: int
+    count_moving_average: float
+    amount_moving_average: float
+
+
+class PaymentSeriesPublic(SQLModel):
+    kind: PaymentKind
+    granularity: PaymentSeriesGranularity
+    start: date
+    end: date
+    window: int
+    data: list[PaymentSeriesPoint]
+
+
 # Withdrawal models
 class Withdrawal(SQLModel, table=True):
     """
     Tracks withdrawal requests from volunteers.
     Since we don't have access to real payment APIs, this is a mock system.
     """
+    __table_args__ = (
+        Index("ix_withdrawal_recipient_id_status", "recipient_id", "status"),
+        Index("ix_withdrawal_recipient_id_idempotency_key",
+              "recipient_id", "idempotency_key", unique=True),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     recipient_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
@@ -1112,6 +1315,8 @@ class Withdrawal(SQLModel, table=True):
     )
     requested_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: datetime | None = Field(default=None)
+    # Client-supplied key; a retried request with the same key gets this row back
+    idempotency_key: str | None = Field(default=None, max_length=255)
 
     # Relationship
     recipient: User | None = Relationship()
@@ -1152,6 +1357,53 @@ class WithdrawalBalance(SQLModel):
         description="Available balance for withdrawal")
 
 
+class WithdrawalLedgerEntryType(str, enum.Enum):
+    SPONSORSHIP_CREDIT = "SPONSORSHIP_CREDIT"  # sponsorship payment succeeded
+    SPONSORSHIP_REVERSAL = "SPONSORSHIP_REVERSAL"  # ...and later left SUCCESS
+    WITHDRAWAL_HOLD = "WITHDRAWAL_HOLD"  # withdrawal requested
+    WITHDRAWAL_COMPLETION = "WITHDRAWAL_COMPLETION"  # held amount paid out
+
+
+class WithdrawalLedgerEntry(SQLModel, table=True):
+    """
+    Append-only record of every change to a recipient's withdrawable money.
+    Entries are never updated or deleted; corrections are new entries.
+    """
+    __table_args__ = (
+        Index("ix_withdrawalledgerentry_recipient_id_created_at",
+              "recipient_id", "created_at"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    recipient_id: uuid.UUID = Field(
+        foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    entry_type: WithdrawalLedgerEntryType = Field(
+        sa_column=Column(Enum(WithdrawalLedgerEntryType), nullable=False))
+    amount: float = Field(ge=0)
+    order_id: int | None = Field(default=None)
+    withdrawal_id: uuid.UUID | None = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class RecipientBalance(SQLModel, table=True):
+    """Running totals of the ledger, updated in the same transaction as each entry"""
+    recipient_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    total_received: float = Field(default=0.0)
+    total_withdrawn: float = Field(default=0.0)
+    pending_withdrawals: float = Field(default=0.0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class WithdrawalLedgerDiscrepancy(SQLModel):
+    """A balance figure on which the source tables, ledger and balance row disagree"""
+    recipient_id: uuid.UUID
+    field: str
+    source: float
+    ledger: float
+    balance: float
+
+
 # Application Reviewer Permission models
 
 
@@ -0,0 +1,24 @@
+import logging
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rebuild() -> int:
+    with Session(engine) as session:
+        return crud.rebuild_payment_rollups(session=session)
+
+
+def main() -> None:
+    logger.info("Rebuilding payment rollups")
+    rows = rebuild()
+    logger.info(f"Payment rollups rebuilt: {rows} daily rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import logging
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rebuild() -> int:
+    with Session(engine) as session:
+        return crud.rebuild_project_thread_activity(session=session)
+
+
+def main() -> None:
+    logger.info("Rebuilding project thread counters and last activity")
+    threads = rebuild()
+    logger.info(f"Project thread activity rebuilt: {threads} threads")
+
+
+if __name__ == "__main__":
+    main()
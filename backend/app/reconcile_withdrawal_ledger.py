@@ -0,0 +1,35 @@
+import logging
+import sys
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def reconcile() -> int:
+    with Session(engine) as session:
+        discrepancies = crud.reconcile_withdrawal_ledger(session=session)
+    for discrepancy in discrepancies:
+        logger.error(
+            f"Recipient {discrepancy.recipient_id} {discrepancy.field}: "
+            f"source={discrepancy.source:.2f} ledger={discrepancy.ledger:.2f} "
+            f"balance={discrepancy.balance:.2f}"
+        )
+    return len(discrepancies)
+
+
+def main() -> None:
+    logger.info("Reconciling withdrawal ledger")
+    found = reconcile()
+    if found:
+        logger.error(f"Withdrawal ledger out of balance: {found} discrepancies")
+        sys.exit(1)
+    logger.info("Withdrawal ledger balanced")
+
+
+if __name__ == "__main__":
+    main()
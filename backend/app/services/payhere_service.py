@@ -2,60 +2,139 @@
 PayHere Retrieval API Service
 
 This service handles OAuth authentication and payment retrieval from PayHere.
-Implements token caching to minimize API calls.
+Implements token and retrieval caching to minimize API calls; the OAuth
+token is shared by all workers through the database.
 """
 
+import asyncio
 import base64
 import hashlib
 import httpx
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
 from fastapi import HTTPException
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
 from app.core.config import settings
-from app.models import PayHereRetrievalResponse, PaymentCreate, PaymentInitiationResponse, PaymentInitiationPublic
+from app.core.db import async_engine
+from app.models import PayHereAccessToken, PayHereRetrievalResponse, PaymentCreate, PaymentInitiationResponse, PaymentInitiationPublic, PaymentStatus
 
 logger = logging.getLogger(__name__)
 
 
 class PayHereTokenCache:
-    """Simple in-memory token cache"""
-    _token: Optional[str] = None
-    _expires_at: Optional[datetime] = None
-
-    @classmethod
-    def get_token(cls) -> Optional[str]:
-        """Get cached token if not expired"""
-        if cls._token and cls._expires_at and datetime.utcnow() < cls._expires_at:
-            return cls._token
+    """
+    This worker's copy of the shared access token (see PayHereAccessToken),
+    so callers only go to the database or PayHere when it is about to expire.
+    """
+
+    def __init__(self) -> None:
+        self.token: str | None = None
+        self.expires_at: datetime | None = None
+
+    def get_token(self, margin: float = 0.0) -> str | None:
+        """Get cached token if it is valid for at least margin more seconds"""
+        if self.token and self.expires_at and (
+            datetime.utcnow() + timedelta(seconds=margin) < self.expires_at
+        ):
+            return self.token
         return None
 
-    @classmethod
-    def set_token(cls, token: str, expires_in: int):
-        """Cache token with expiration time (in seconds)"""
-        cls._token = token
-        # Subtract 60 seconds as safety margin
-        cls._expires_at = datetime.utcnow() + timedelta(seconds=expires_in - 60)
+    def set_token(self, token: str, expires_at: datetime) -> None:
+        """Cache token until expires_at, PayHere's own expiry time"""
+        self.token = token
+        self.expires_at = expires_at
 
 
-class PayHereService:
-    """Service for interacting with PayHere Retrieval API"""
+class PayHereRetrievalCache:
+    """
+    Short-lived in-memory cache of retrieval API answers by order_id.
+    "No payment yet" answers are cached too, so payments that are still
+    pending are not looked up again on every page load.
+    """
+    MAX_ENTRIES = 10_000
+
+    def __init__(self) -> None:
+        self._responses: dict[str, tuple[PayHereRetrievalResponse, datetime]] = {}
+
+    def get(self, order_id: str) -> PayHereRetrievalResponse | None:
+        """Get cached answer if not expired"""
+        entry = self._responses.get(order_id)
+        if entry and datetime.utcnow() < entry[1]:
+            return entry[0]
+        return None
+
+    def set(self, order_id: str, response: PayHereRetrievalResponse, ttl: float) -> None:
+        """Cache answer for ttl seconds"""
+        now = datetime.utcnow()
+        if len(self._responses) >= self.MAX_ENTRIES:
+            self._responses = {
+                key: entry for key, entry in self._responses.items() if entry[1] > now
+            }
+        self._responses[order_id] = (response, now + timedelta(seconds=ttl))
+
 
-    def __init__(self, session: Session):
+class PayHereService:
+    """
+    Service for interacting with PayHere Retrieval API.
+    One instance serves the whole application; it holds a pooled HTTP client
+    between start() and stop(), and methods that touch the database take the
+    caller's session.
+    """
+
+    def __init__(self) -> None:
         self.app_id = settings.PAYHERE_APP_ID
         self.app_secret = settings.PAYHERE_APP_SECRET
         self.token_url = settings.PAYHERE_TOKEN_URL
         self.retrieval_url = settings.PAYHERE_RETRIEVAL_URL
         self.merchant_id = settings.PAYHERE_MERCHANT_ID
         self.merchant_secret = settings.PAYHERE_MERCHANT_SECRET
-        self.session = session
+        self.client: httpx.AsyncClient | None = None
+        self.token_cache = PayHereTokenCache()
+        self.retrieval_cache = PayHereRetrievalCache()
+        self._token_lock = asyncio.Lock()
+        self._token_refresher: asyncio.Task[None] | None = None
 
         if not self.app_id or not self.app_secret:
             logger.warning("PayHere API credentials not configured")
 
+    async def start(self) -> None:
+        """Open the keep-alive connection pool shared by all PayHere calls"""
+        self.client = httpx.AsyncClient(
+            http2=settings.PAYHERE_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.PAYHERE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.PAYHERE_MAX_CONNECTIONS,
+                keepalive_expiry=settings.PAYHERE_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.PAYHERE_TIMEOUT, connect=settings.PAYHERE_CONNECT_TIMEOUT
+            ),
+        )
+        # A fresh lock for the event loop the service now runs on
+        self._token_lock = asyncio.Lock()
+        if self.app_id and self.app_secret:
+            self._token_refresher = asyncio.create_task(self._token_refresh_loop())
+
+    async def stop(self) -> None:
+        if self._token_refresher:
+            self._token_refresher.cancel()
+            try:
+                await self._token_refresher
+            except asyncio.CancelledError:
+                pass
+            self._token_refresher = None
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            raise RuntimeError("PayHereService has not been started")
+        return self.client
+
     def _generate_authorization_code(self) -> str:
         """
         Generate Base64 encoded authorization code from App ID and App Secret.
@@ -71,7 +150,7 @@ class PayHereService:
     async def _get_access_token(self) -> str:
         """
         Retrieve OAuth access token from PayHere.
-        Uses cached token if available and not expired.
+        Uses this worker's cached token while it is not about to expire.
 
         Returns:
             Access token string
@@ -80,11 +159,90 @@ class PayHereService:
             HTTPException: If token retrieval fails
         """
         # Check cache first
-        cached_token = PayHereTokenCache.get_token()
+        cached_token = self.token_cache.get_token(settings.PAYHERE_TOKEN_EXPIRY_MARGIN)
         if cached_token:
-            logger.info("Using cached PayHere access token")
             return cached_token
 
+        return await self._refresh_access_token(settings.PAYHERE_TOKEN_EXPIRY_MARGIN)
+
+    async def _refresh_access_token(self, margin: float) -> str:
+        """
+        Make sure this worker holds a token valid for at least margin more
+        seconds. Concurrent callers share one refresh: within the worker they
+        queue on a lock, and across workers the first to claim the renewal on
+        the PayHereAccessToken row asks PayHere while the others wait for its
+        token.
+        """
+        app_id = self.app_id
+        if not app_id:
+            logger.error("PayHere API credentials not configured")
+            raise HTTPException(
+                status_code=503,
+                detail="Payment verification service temporarily unavailable"
+            )
+
+        async with self._token_lock:
+            # Another caller may have refreshed while this one waited
+            cached_token = self.token_cache.get_token(margin)
+            if cached_token:
+                return cached_token
+
+            while True:
+                async with AsyncSession(async_engine) as session:
+                    # Another worker may have refreshed already
+                    shared = await crud.get_payhere_access_token_async(
+                        session=session, app_id=app_id)
+                    cached_token = self._cache_shared_token(shared, margin)
+                    if cached_token:
+                        return cached_token
+
+                    now = datetime.utcnow()
+                    # A claim outlives one token request, so a worker that
+                    # dies while renewing only delays the others
+                    claim_seconds = settings.PAYHERE_CONNECT_TIMEOUT + settings.PAYHERE_TIMEOUT
+                    if await crud.claim_payhere_access_token_refresh_async(
+                        session=session, app_id=app_id,
+                        valid_until=now + timedelta(seconds=margin),
+                        claim_until=now + timedelta(seconds=claim_seconds)
+                    ):
+                        break
+                await asyncio.sleep(settings.PAYHERE_TOKEN_WAIT_INTERVAL)
+
+            # No database connection is held while PayHere answers
+            try:
+                access_token, expires_at = await self._request_access_token()
+            except Exception:
+                async with AsyncSession(async_engine) as session:
+                    await crud.release_payhere_access_token_refresh_async(
+                        session=session, app_id=app_id)
+                raise
+            async with AsyncSession(async_engine) as session:
+                await crud.update_payhere_access_token_async(
+                    session=session, app_id=app_id,
+                    access_token=access_token, expires_at=expires_at
+                )
+
+            self.token_cache.set_token(access_token, expires_at)
+            logger.info("Successfully retrieved and shared PayHere access token")
+            return access_token
+
+    def _cache_shared_token(
+        self, shared: PayHereAccessToken | None, margin: float
+    ) -> str | None:
+        if shared and shared.access_token and shared.expires_at:
+            self.token_cache.set_token(shared.access_token, shared.expires_at)
+        return self.token_cache.get_token(margin)
+
+    async def _request_access_token(self) -> tuple[str, datetime]:
+        """
+        Ask PayHere for a new access token.
+
+        Returns:
+            Access token and the time it expires
+
+        Raises:
+            HTTPException: If token retrieval fails
+        """
         # Generate authorization code
         auth_code = self._generate_authorization_code()
 
@@ -98,39 +256,33 @@ class PayHereService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.token_url,
-                    headers=headers,
-                    data=data,
-                    timeout=30.0
+            client = self._get_client()
+            response = await client.post(
+                self.token_url,
+                headers=headers,
+                data=data
+            )
+
+            if response.status_code != 200:
+                logger.error(
+                    f"Failed to get PayHere access token: {response.text}")
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"Failed to retrieve PayHere access token: {response.text}"
                 )
 
-                if response.status_code != 200:
-                    logger.error(
-                        f"Failed to get PayHere access token: {response.text}")
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Failed to retrieve PayHere access token: {response.text}"
-                    )
-
-                token_data = response.json()
-                access_token = token_data.get("access_token")
-                expires_in = token_data.get("expires_in", 599)
-
-                if not access_token:
-                    logger.error("No access token in PayHere response")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Something went wrong while verifying payments"
-                    )
-
-                # Cache the token
-                PayHereTokenCache.set_token(access_token, expires_in)
-                logger.info(
-                    "Successfully retrieved and cached PayHere access token")
+            token_data = response.json()
+            access_token = token_data.get("access_token")
+            expires_in = token_data.get("expires_in", 599)
+
+            if not access_token:
+                logger.error("No access token in PayHere response")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Something went wrong while verifying payments"
+                )
 
-                return access_token
+            return access_token, datetime.utcnow() + timedelta(seconds=expires_in)
 
         except httpx.RequestError as e:
             logger.error(
@@ -140,6 +292,23 @@ class PayHereService:
                 detail="Service temporarily unavailable"
             )
 
+    async def _token_refresh_loop(self) -> None:
+        """Renew the token ahead of its expiry, so callers never wait for one"""
+        while True:
+            try:
+                await self._refresh_access_token(settings.PAYHERE_TOKEN_REFRESH_AHEAD)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background PayHere token refresh failed: {e}")
+                await asyncio.sleep(settings.PAYHERE_TOKEN_RETRY_INTERVAL)
+                continue
+
+            expires_at = self.token_cache.expires_at or datetime.utcnow()
+            delay = (expires_at - datetime.utcnow()).total_seconds() \
+                - settings.PAYHERE_TOKEN_REFRESH_AHEAD
+            await asyncio.sleep(max(delay, 1.0))
+
     async def _retrieve_payment_details(self, order_id: str) -> PayHereRetrievalResponse:
         """
         Retrieve payment details from PayHere Retrieval API.
@@ -160,6 +329,10 @@ class PayHereService:
                 detail="Payment verification service temporarily unavailable"
             )
 
+        cached_response = self.retrieval_cache.get(order_id)
+        if cached_response:
+            return cached_response
+
         # Get access token
         access_token = await self._get_access_token()
 
@@ -173,51 +346,54 @@ class PayHereService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.retrieval_url,
-                    headers=headers,
-                    params=params,
-                    timeout=30.0
+            client = self._get_client()
+            response = await client.get(
+                self.retrieval_url,
+                headers=headers,
+                params=params
+            )
+
+            if response.status_code != 200:
+                logger.error(
+                    f"PayHere retrieval API error: {response.text}")
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"Failed to retrieve payment details"
                 )
 
-                if response.status_code != 200:
-                    logger.error(
-                        f"PayHere retrieval API error: {response.text}")
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Failed to retrieve payment details"
-                    )
-
-                data = response.json()
-
-                # Check response status
-                status = data.get("status")
-
-                if status == -1:
-                    # No payments found for order ID
-                    payhere_response = PayHereRetrievalResponse(**data)
-                    return payhere_response
-                elif status == -2:
-                    # Authentication error
-                    logger.error("Authentication error with PayHere API")
-                    raise HTTPException(
-                        status_code=503,
-                        detail="Payment verification service temporarily unavailable"
-                    )
-                elif status == 1:
-                    # Payment found successfully
-                    logger.info(
-                        f"Successfully retrieved payment details for order {order_id}")
-                    # Parse response into PayHereRetrievalResponse object
-                    payhere_response = PayHereRetrievalResponse(**data)
-                    return payhere_response
-                else:
-                    # Unknown status
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Something went wrong while verifying payments"
-                    )
+            data = response.json()
+
+            # Check response status
+            status = data.get("status")
+
+            if status == -1:
+                # No payments found for order ID
+                payhere_response = PayHereRetrievalResponse(**data)
+                self.retrieval_cache.set(
+                    order_id, payhere_response, settings.PAYHERE_RETRIEVAL_CACHE_TTL)
+                return payhere_response
+            elif status == -2:
+                # Authentication error
+                logger.error("Authentication error with PayHere API")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Payment verification service temporarily unavailable"
+                )
+            elif status == 1:
+                # Payment found successfully
+                logger.info(
+                    f"Successfully retrieved payment details for order {order_id}")
+                # Parse response into PayHereRetrievalResponse object
+                payhere_response = PayHereRetrievalResponse(**data)
+                self.retrieval_cache.set(
+                    order_id, payhere_response, settings.PAYHERE_RETRIEVAL_CACHE_TTL)
+                return payhere_response
+            else:
+                # Unknown status
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Something went wrong while verifying payments"
+                )
 
         except httpx.RequestError as e:
             logger.error(f"Network error while retrieving payment: {str(e)}")
@@ -232,66 +408,19 @@ class PayHereService:
                 detail=f"Something went wrong while verifying payments"
             )
 
-    async def get_payment_by_order_id(self, order_id: int) -> Optional[crud.Payment]:
-        # Step 1: Check database for payment
-        payment = crud.get_payment_by_order_id(
-            session=self.session, order_id=order_id)
-
-        if not payment:
-            return None
-
-        # Step 2:
-        # If status is PENDING, verify with PayHere API
-        # If status is NOT_FOUND, also verify with PayHere API because it might have been completed later
-        if payment.status == crud.PaymentStatus.PENDING or payment.status == crud.PaymentStatus.NOT_FOUND:
-            try:
-                payhere_response = await self._retrieve_payment_details(str(order_id))
-                if payhere_response.data and len(payhere_response.data) > 0:
-                    payment_data = payhere_response.data[0]
-                    payhere_status = payment_data.status
-
-                    local_status = self._map_payhere_retrieval_status_to_local(
-                        payhere_status)
-                    local_payment_status = crud.PaymentStatus(local_status)
-
-                    # Step 3: Update payment status in database if changed
-                    if local_payment_status != payment.status:
-                        updated_payment = crud.update_payment_status(
-                            session=self.session,
-                            order_id=order_id,
-                            status=local_payment_status
-                        )
-                        if updated_payment:
-                            payment = updated_payment
-                            logger.info(
-                                f"updated payment: {payment}")
-
-                else:
-                    logger.info(
-                        f"Payment with order_id {order_id} not found in PayHere, updating status to NOT_FOUND")
-                    updated_payment = crud.update_payment_status(
-                        session=self.session,
-                        order_id=order_id,
-                        status=crud.PaymentStatus.NOT_FOUND
-                    )
-
-            except HTTPException as e:
-                # If payment not found in PayHere (404), keep current status
-                if e.status_code == 404:
-                    logger.warning(
-                        f"Payment with order_id {order_id} not found in PayHere")
-                else:
-                    # For other errors, log and return None
-                    logger.error(
-                        f"Error retrieving payment from PayHere: {e.detail}")
-                    return None
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error checking PayHere API: {str(e)}")
+    async def get_payhere_payment_status(self, order_id: int) -> PaymentStatus:
+        """
+        The local status PayHere's retrieval API reports for an order;
+        NOT_FOUND while PayHere has no payment for it.
 
-                return None
-        # Step 4: Return payment details
-        return payment
+        Raises:
+            HTTPException: If retrieval fails
+        """
+        payhere_response = await self._retrieve_payment_details(str(order_id))
+        if payhere_response.data:
+            return PaymentStatus(
+                self._map_payhere_retrieval_status_to_local(payhere_response.data[0].status))
+        return PaymentStatus.NOT_FOUND
 
     def _map_payhere_retrieval_status_to_local(self, payhere_status: str) -> int:
         """
@@ -402,7 +531,9 @@ class PayHereService:
 
         return expected_hash == received_hash
 
-    def initiate_payment(self, payment_in: PaymentCreate) -> PaymentInitiationResponse:
+    def initiate_payment(
+        self, *, session: Session, payment_in: PaymentCreate
+    ) -> PaymentInitiationResponse:
         """
         Initiate a new payment request for PayHere gateway.
         Creates a payment record with PENDING status and returns the payment details
@@ -427,7 +558,7 @@ class PayHereService:
 
         # Create the payment using CRUD with merchant_id from config
         payment = crud.create_payment(
-            session=self.session,
+            session=session,
             payment_in=payment_in,
             merchant_id=self.merchant_id
         )
@@ -450,8 +581,10 @@ class PayHereService:
             )
         )
 
-    def verify_webhook(
+    async def verify_webhook(
         self,
+        *,
+        session: AsyncSession,
         merchant_id: str,
         order_id: str,
         amount: str,
@@ -461,7 +594,9 @@ class PayHereService:
     ) -> bool:
         """
         Handle PayHere webhook notifications.
-        Verifies the hash and updates payment status in the database.
+        Verifies the hash and records the notification; the payment itself is
+        updated off-request by the webhook processor. Resends of a recorded
+        notification are acknowledged without recording them again.
 
         Args:
             merchant_id: Merchant ID from webhook
@@ -472,10 +607,10 @@ class PayHereService:
             received_hash: MD5 hash received from PayHere
 
         Returns:
-            True if verification and update successful
+            True if the notification is verified and recorded
 
         Raises:
-            HTTPException: If verification fails or update fails
+            HTTPException: If verification fails or the order is unknown
         """
         # Verify the hash
         is_verified = self._verify_payhere_hash(
@@ -504,32 +639,37 @@ class PayHereService:
 
         # Map PayHere status_code to PaymentStatus enum
         try:
-            status_code_int = int(status_code)
-            payment_status = crud.PaymentStatus(status_code_int)
-
-            # Update payment status in database
+            payment_status = crud.PaymentStatus(int(status_code))
             order_id_int = int(order_id)
-            updated_payment = crud.update_payment_status(
-                session=self.session,
-                order_id=order_id_int,
-                status=payment_status
-            )
-
-            if not updated_payment:
-                logger.error(
-                    f"Failed to update payment status for order {order_id}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to update payment status"
-                )
-
-            logger.info(
-                f"Successfully updated payment status for order {order_id} to {payment_status}")
-            return True
-
         except ValueError as e:
             logger.error(f"Invalid status code or order ID: {e}")
             raise HTTPException(
                 status_code=400,
                 detail="Invalid status code or order ID"
             )
+
+        try:
+            recorded = await crud.record_payhere_webhook_async(
+                session=session,
+                order_id=order_id_int,
+                status_code=payment_status.value,
+                md5sig=received_hash
+            )
+        except ValueError as e:
+            logger.error(f"Failed to record PayHere webhook: {e}")
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to update payment status"
+            )
+
+        if recorded:
+            logger.info(
+                f"Recorded PayHere webhook for order {order_id}: {payment_status}")
+        else:
+            logger.info(
+                f"Ignored resent PayHere webhook for order {order_id}: {payment_status}")
+        return True
+
+
+# Global instance, started and stopped with the application
+payhere_service = PayHereService()
@@ -0,0 +1,91 @@
+"""
+Off-request processing of PayHere webhook notifications
+
+The webhook route only verifies a notification and records it (see
+PayHereWebhookEvent). Every worker runs a processor that applies recorded
+notifications to their payments in batches: right away for the ones it
+received itself, and on a short poll for the ones other workers received.
+"""
+
+import asyncio
+import logging
+from typing import Any
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.core.notification_manager import notification_manager
+
+logger = logging.getLogger(__name__)
+
+
+class PayHereWebhookProcessor:
+    """
+    Applies recorded webhook notifications between start() and stop().
+    Workers skip each other's batches, so a notification is applied once.
+    """
+
+    def __init__(self, interval: float | None = None, batch_size: int | None = None) -> None:
+        self.interval = interval or settings.PAYHERE_WEBHOOK_POLL_INTERVAL
+        self.batch_size = batch_size or settings.PAYHERE_WEBHOOK_BATCH_SIZE
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        # A fresh event for the event loop the processor now runs on
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        """Process recorded notifications now rather than at the next poll"""
+        self._wakeup.set()
+
+    async def _loop(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                processed = await self.process_batch()
+            except Exception as e:
+                # The batch was rolled back and is picked up again
+                logger.error(f"PayHere webhook processing failed: {e}")
+                processed = 0
+            # A full batch means more notifications are waiting; go straight on
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def process_batch(self) -> int:
+        """
+        Apply one batch of recorded notifications and push the resulting
+        status changes to the payments' participants.
+
+        Returns:
+            Number of notifications applied
+        """
+        processed, status_events = await asyncio.to_thread(self._process)
+        if status_events:
+            await notification_manager.send_notifications(status_events)
+        return processed
+
+    def _process(self) -> tuple[int, list[tuple[UUID, dict[str, Any]]]]:
+        with Session(engine) as session:
+            return crud.process_payhere_webhook_events(
+                session=session, limit=self.batch_size)
+
+
+# Global instance, started and stopped with the application
+payhere_webhook_processor = PayHereWebhookProcessor()
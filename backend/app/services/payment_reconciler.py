@@ -0,0 +1,130 @@
+"""
+Background reconciliation of payments with PayHere
+
+Webhooks settle most payments. The rest - payments whose webhook never
+arrived and checkouts that were abandoned - are picked up here: every worker
+periodically claims a batch of unsettled payments, asks the retrieval API
+about them a few at a time and records any status change, rollups and
+ledger included, pushing it to the payment's participants. Read endpoints
+only ever look at the database.
+"""
+
+import asyncio
+import logging
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.core.notification_manager import notification_manager
+from app.models import PaymentStatus
+from app.services.payhere_service import PayHereService, payhere_service
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentReconciler:
+    """
+    Periodic reconciler of PENDING (and not yet found) payments, run in
+    every worker between start() and stop(). Workers claim disjoint batches,
+    so each payment is looked up once per round however many are running.
+    """
+
+    def __init__(
+        self,
+        service: PayHereService | None = None,
+        interval: float | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        self.service = service or payhere_service
+        self.interval = interval or settings.PAYHERE_RECONCILE_INTERVAL
+        self.batch_size = batch_size or settings.PAYHERE_RECONCILE_BATCH_SIZE
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start reconciling, if enabled and PayHere credentials are configured"""
+        if not settings.PAYHERE_RECONCILE_ENABLED:
+            return
+        if not self.service.app_id or not self.service.app_secret:
+            logger.warning("PayHere API credentials not configured, payments will not be reconciled")
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                claimed = await self.reconcile_batch()
+            except Exception as e:
+                logger.error(f"Payment reconciliation failed: {e}")
+                claimed = 0
+            # A full batch means more payments are waiting; go straight on
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    async def reconcile_batch(self) -> int:
+        """
+        Claim one batch of unsettled payments and bring them up to date with
+        PayHere, at most PAYHERE_LOOKUP_CONCURRENCY at a time.
+
+        Returns:
+            Number of payments claimed
+        """
+        claimed = await asyncio.to_thread(self._claim)
+        semaphore = asyncio.Semaphore(settings.PAYHERE_LOOKUP_CONCURRENCY)
+
+        async def reconcile(order_id: int, status: PaymentStatus) -> None:
+            async with semaphore:
+                try:
+                    payhere_status = await self.service.get_payhere_payment_status(order_id)
+                except HTTPException as e:
+                    # Claimed all the same; it is tried again in a later round
+                    logger.warning(
+                        f"Could not reconcile payment {order_id} with PayHere: {e.detail}")
+                    return
+                if payhere_status != status:
+                    status_events = await asyncio.to_thread(
+                        self._apply, order_id, status, payhere_status)
+                    if status_events:
+                        await notification_manager.send_notifications(status_events)
+
+        await asyncio.gather(*(reconcile(order_id, status) for order_id, status in claimed))
+        return len(claimed)
+
+    def _claim(self) -> list[tuple[int, PaymentStatus]]:
+        with Session(engine) as session:
+            return crud.claim_payments_for_reconciliation(
+                session=session,
+                limit=self.batch_size,
+                min_age=settings.PAYHERE_RECONCILE_MIN_AGE,
+                recheck_after=settings.PAYHERE_RECONCILE_RECHECK_AFTER,
+                max_age=settings.PAYHERE_RECONCILE_MAX_AGE,
+            )
+
+    def _apply(
+        self, order_id: int, old_status: PaymentStatus, status: PaymentStatus
+    ) -> list[tuple[UUID, dict[str, Any]]]:
+        with Session(engine) as session:
+            # A webhook may have settled the payment since it was claimed
+            payment = crud.update_payment_status(
+                session=session, order_id=order_id, status=status, expected_status=old_status)
+            if not payment or payment.status != status:
+                return []
+            logger.info(f"Reconciled payment {order_id}: {old_status.name} -> {status.name}")
+            return crud.payment_status_events(session=session, payment=payment)
+
+
+# Global instance, started and stopped with the application
+payment_reconciler = PaymentReconciler()
@@ -0,0 +1,75 @@
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import PaymentStatus, Withdrawal
+from app.tests.utils.payment import create_random_payment
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import count_queries
+
+ROWS = 20
+
+
+def _donation(db: Session) -> None:
+    payment = create_random_payment(db, status=PaymentStatus.SUCCESS)
+    crud.create_donation(
+        session=db, order_id=payment.order_id, donor_id=create_random_user(db).id)
+
+
+def _sponsorship(db: Session) -> None:
+    payment = create_random_payment(db, status=PaymentStatus.SUCCESS)
+    crud.create_sponsorship(
+        session=db, order_id=payment.order_id,
+        sponsor_id=create_random_user(db).id, recipient_id=create_random_user(db).id
+    )
+
+
+def _withdrawal(db: Session) -> None:
+    db.add(Withdrawal(
+        recipient_id=create_random_user(db).id,
+        amount_requested=1.0,
+        fee_amount=0.06,
+        amount_to_transfer=0.94,
+        bank_account_number="1",
+        bank_name="b",
+        account_holder_name="h",
+    ))
+    db.commit()
+
+
+@pytest.mark.parametrize(
+    "path, seed",
+    [
+        ("/donations/all", _donation),
+        ("/sponsorships/all", _sponsorship),
+        ("/withdrawals/all", _withdrawal),
+    ],
+)
+def test_admin_listing_query_count_is_independent_of_page_size(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    path: str,
+    seed: Callable[[Session], None],
+) -> None:
+    # Newest first, so both pages below are made of rows with distinct users
+    for _ in range(ROWS):
+        seed(db)
+
+    counts = []
+    for limit in (2, ROWS):
+        with count_queries() as statements:
+            r = client.get(
+                f"{settings.API_V1_STR}{path}",
+                headers=superuser_token_headers,
+                params={"limit": limit},
+            )
+        assert r.status_code == 200
+        assert len(r.json()["data"]) == limit
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
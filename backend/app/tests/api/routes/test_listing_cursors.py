@@ -0,0 +1,49 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.utils import encode_cursor
+
+# Each is wrong for every listing below: a string on an int or timestamp key,
+# values in the wrong order, and one value too many
+CURSORS = [
+    encode_cursor("order-1"),
+    encode_cursor(uuid.uuid4(), datetime(2025, 1, 1)),
+    encode_cursor(datetime(2025, 1, 1), uuid.uuid4(), 1),
+]
+
+
+@pytest.mark.parametrize("cursor", CURSORS)
+@pytest.mark.parametrize(
+    "path, admin",
+    [
+        ("/donations/my-donations", False),
+        ("/donations/all", True),
+        ("/sponsorships/my-sponsorships", False),
+        ("/sponsorships/received", False),
+        ("/sponsorships/all", True),
+        ("/withdrawals/my-withdrawals", False),
+        ("/withdrawals/all", True),
+        ("/projects/", True),
+        ("/projects/my-projects", False),
+        ("/projects/approved", False),
+        ("/projects/pending", True),
+    ],
+)
+def test_listing_rejects_cursor_of_another_listing(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+    path: str,
+    admin: bool,
+    cursor: str,
+) -> None:
+    headers = superuser_token_headers if admin else normal_user_token_headers
+    r = client.get(
+        f"{settings.API_V1_STR}{path}", headers=headers, params={"cursor": cursor}
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Cursor does not match this listing"
@@ -0,0 +1,148 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.api.deps import get_stream_user
+from app.api.routes.notifications import notification_stream
+from app.core import security
+from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.core.notification_manager import frame_event_id, notification_event_id
+from app.models import Notification, NotificationType, User
+from app.tests.utils.user import create_random_user
+from app.utils import encode_cursor
+
+
+def test_notification_streams_do_not_hold_db_connections(db: Session) -> None:
+    user = create_random_user(db)
+    token = security.create_access_token(user.id, timedelta(minutes=5))
+    streams = 20
+
+    async def open_streams() -> tuple[int, int, int]:
+        before = async_engine.pool.checkedout() + engine.pool.checkedout()
+        iterators = []
+        for _ in range(streams):
+            stream_user = await get_stream_user(token=token)
+            response = await notification_stream(current_user=stream_user)
+            iterator = response.body_iterator
+            # The first frame is sent once the connection is registered
+            first = await iterator.__anext__()
+            assert "connected" in first
+            iterators.append(iterator)
+        during = async_engine.pool.checkedout() + engine.pool.checkedout()
+        for iterator in iterators:
+            await iterator.aclose()
+        await async_engine.dispose()
+        return before, during, len(iterators)
+
+    before, during, opened = asyncio.run(open_streams())
+    assert opened == streams
+    assert during == before
+
+
+def _missed(db: Session, user: User, count: int) -> list[Notification]:
+    start = datetime.utcnow() - timedelta(minutes=1)
+    notifications = [
+        Notification(
+            user_id=user.id,
+            type=NotificationType.NEW_COMMENT,
+            title=f"missed {i}",
+            message="while disconnected",
+            created_at=start + timedelta(milliseconds=i),
+        )
+        for i in range(count)
+    ]
+    db.add_all(notifications)
+    db.commit()
+    return notifications
+
+
+def _reconnect(user: User, last_event_id: str, frames: int) -> list[str]:
+    async def reconnect() -> list[str]:
+        response = await notification_stream(
+            current_user=user, last_event_id=last_event_id
+        )
+        iterator = response.body_iterator
+        received = [await iterator.__anext__() for _ in range(frames)]
+        await iterator.aclose()
+        await async_engine.dispose()
+        return received
+
+    return asyncio.run(reconnect())
+
+
+def test_notification_stream_replays_after_last_event_id(db: Session) -> None:
+    user = create_random_user(db)
+    notifications = _missed(db, user, 3)
+    last_seen = notification_event_id(notifications[0].created_at, notifications[0].id)
+
+    connected, *replayed = _reconnect(user, last_seen, 3)
+    assert "connected" in connected
+    assert [frame_event_id(f) for f in replayed] == [
+        notification_event_id(n.created_at, n.id) for n in notifications[1:]
+    ]
+    assert "missed 1" in replayed[0] and "missed 2" in replayed[1]
+
+
+def test_notification_stream_resets_when_too_many_were_missed(db: Session) -> None:
+    user = create_random_user(db)
+    notifications = _missed(db, user, settings.SSE_QUEUE_SIZE + 2)
+    last_seen = notification_event_id(notifications[0].created_at, notifications[0].id)
+
+    connected, reset = _reconnect(user, last_seen, 2)
+    assert "connected" in connected
+    assert "notifications_reset" in reset
+    # The next reconnect resumes after the newest rather than replaying again
+    newest = notifications[-1]
+    assert frame_event_id(reset) == notification_event_id(newest.created_at, newest.id)
+
+
+def test_read_notifications_with_cursor(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    start = datetime.utcnow() - timedelta(hours=1)
+    db.add_all(
+        Notification(
+            user_id=user.id,
+            type=NotificationType.NEW_REPLY,
+            title=f"paged {i}",
+            message="cursor paging",
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(5)
+    )
+    db.commit()
+    url = f"{settings.API_V1_STR}/notifications/"
+
+    r = client.get(url, headers=normal_user_token_headers, params={"limit": 1000})
+    expected = [n["id"] for n in r.json()["data"]]
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        r = client.get(url, headers=normal_user_token_headers, params=params)
+        assert r.status_code == 200
+        content = r.json()
+        seen += [n["id"] for n in content["data"]]
+        if not content["meta"]["next_cursor"]:
+            break
+        params["cursor"] = content["meta"]["next_cursor"]
+    assert seen == expected
+
+    # Past the last page the total is still reported
+    r = client.get(url, headers=normal_user_token_headers, params={"skip": 100000})
+    assert r.status_code == 200
+    assert r.json()["data"] == []
+    assert r.json()["meta"]["total"] == len(expected)
+
+    r = client.get(url, headers=normal_user_token_headers, params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+    # Well-formed, but a cursor of some other listing
+    for cursor in (encode_cursor("order-1"), encode_cursor("a", "b")):
+        r = client.get(url, headers=normal_user_token_headers, params={"cursor": cursor})
+        assert r.status_code == 400
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app import crud
+from app.core.config import settings
+from app.core.notification_manager import (
+    KEEPALIVE_FRAME,
+    SSEConnection,
+    notification_manager,
+)
+from app.models import PayHereWebhookEvent, Payment, PaymentStatus
+from app.tests.utils.payhere import webhook_form
+from app.tests.utils.payment import create_random_payment
+from app.tests.utils.user import create_random_user
+
+URL = f"{settings.API_V1_STR}/payments/payhere-webhook"
+AMOUNT = 100.0
+RESENDS = 20
+
+
+def _sponsorship_payment(db: Session) -> tuple[Payment, uuid.UUID, uuid.UUID]:
+    payment = create_random_payment(db, amount=AMOUNT)
+    sponsor = create_random_user(db)
+    recipient = create_random_user(db)
+    crud.create_sponsorship(
+        session=db, order_id=payment.order_id,
+        sponsor_id=sponsor.id, recipient_id=recipient.id
+    )
+    return payment, sponsor.id, recipient.id
+
+
+def _events(db: Session, order_id: int, *, unprocessed: bool = False) -> int:
+    statement = (
+        select(func.count()).select_from(PayHereWebhookEvent)
+        .where(PayHereWebhookEvent.order_id == order_id)
+    )
+    if unprocessed:
+        statement = statement.where(PayHereWebhookEvent.processed_at.is_(None))
+    return db.exec(statement).one()
+
+
+def _wait_until_processed(db: Session, order_id: int, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while _events(db, order_id, unprocessed=True):
+        assert time.monotonic() < deadline, "webhook was not processed"
+        time.sleep(0.05)
+
+
+def test_webhook_is_applied_off_request(client: TestClient, db: Session) -> None:
+    payment, _, recipient_id = _sponsorship_payment(db)
+
+    r = client.post(
+        URL, data=webhook_form(payment.order_id, AMOUNT, PaymentStatus.SUCCESS.value))
+    assert r.status_code == 200
+    assert r.json() is True
+
+    _wait_until_processed(db, payment.order_id)
+    db.refresh(payment)
+    assert payment.status == PaymentStatus.SUCCESS
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient_id)
+    assert balance["total_received"] == AMOUNT
+
+
+def test_status_change_is_pushed_to_participants(client: TestClient, db: Session) -> None:
+    payment, sponsor_id, recipient_id = _sponsorship_payment(db)
+    connections = {user_id: SSEConnection() for user_id in (sponsor_id, recipient_id)}
+
+    async def next_event(connection: SSEConnection) -> dict[str, Any]:
+        frame: str | None = KEEPALIVE_FRAME
+        while frame == KEEPALIVE_FRAME:
+            frame = await asyncio.wait_for(connection.get(), 5.0)
+        assert frame
+        event: dict[str, Any] = json.loads(frame.removeprefix("data: "))
+        return event
+
+    assert client.portal
+    for user_id, connection in connections.items():
+        client.portal.call(notification_manager.connect, user_id, connection)
+    try:
+        r = client.post(
+            URL, data=webhook_form(payment.order_id, AMOUNT, PaymentStatus.SUCCESS.value))
+        assert r.status_code == 200
+        events = [client.portal.call(next_event, connection) for connection in connections.values()]
+    finally:
+        for user_id, connection in connections.items():
+            notification_manager.disconnect(user_id, connection)
+
+    # Both sides hear about it without asking, the sponsor to update the
+    # checkout, the recipient to update their balance
+    for event in events:
+        assert event["type"] == "payment_status"
+        assert event["order_id"] == payment.order_id
+        assert event["kind"] == "SPONSORSHIP"
+        assert event["status"] == PaymentStatus.SUCCESS.value
+
+
+def test_resent_webhooks_are_applied_once(client: TestClient, db: Session) -> None:
+    payment, _, recipient_id = _sponsorship_payment(db)
+    form = webhook_form(payment.order_id, AMOUNT, PaymentStatus.SUCCESS.value)
+
+    with ThreadPoolExecutor(max_workers=RESENDS) as pool:
+        statuses = list(pool.map(
+            lambda _: client.post(URL, data=form).status_code, range(RESENDS)))
+
+    # Every resend is acknowledged, so PayHere stops sending it
+    assert set(statuses) == {200}
+    assert _events(db, payment.order_id) == 1
+    _wait_until_processed(db, payment.order_id)
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient_id)
+    assert balance["total_received"] == AMOUNT
+
+
+def test_unverified_or_unknown_webhooks_are_rejected(client: TestClient, db: Session) -> None:
+    payment, _, _ = _sponsorship_payment(db)
+    form = webhook_form(payment.order_id, AMOUNT, PaymentStatus.SUCCESS.value)
+
+    r = client.post(URL, data={**form, "md5sig": "0" * 32})
+    assert r.status_code == 400
+    r = client.post(URL, data=webhook_form(-1, AMOUNT, PaymentStatus.SUCCESS.value))
+    assert r.status_code == 400
+    assert _events(db, payment.order_id) == 0
@@ -0,0 +1,80 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import PaymentStatus
+from app.tests.utils.payment import create_random_payment
+from app.tests.utils.user import create_random_user
+
+URL = f"{settings.API_V1_STR}/payments/statistics/series"
+
+
+def test_payment_series(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    donor = create_random_user(db)
+    for amount in (30.0, 70.0):
+        payment = create_random_payment(db, amount=amount)
+        crud.create_donation(session=db, order_id=payment.order_id, donor_id=donor.id)
+        crud.update_payment_status(
+            session=db, order_id=payment.order_id, status=PaymentStatus.SUCCESS)
+    today = payment.created_at.date()
+    params = {
+        "kind": "DONATION",
+        "granularity": "month",
+        "start": today.replace(day=1).isoformat(),
+        "end": today.isoformat(),
+        "window": 3,
+    }
+
+    r = client.get(URL, headers=superuser_token_headers, params=params)
+    assert r.status_code == 200
+    series = r.json()
+    (point,) = series["data"]
+    assert point["bucket"] == today.replace(day=1).isoformat()
+    assert point["count"] >= 2
+    assert point["amount"] >= 100.0
+    assert point["unique_payers"] >= 1
+    assert point["count_moving_average"] == point["count"]
+    assert "private" in r.headers["cache-control"]
+
+    r = client.get(
+        URL, headers={**superuser_token_headers, "If-None-Match": r.headers["etag"]},
+        params=params,
+    )
+    assert r.status_code == 304
+
+
+def test_payment_series_fills_empty_buckets(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        URL,
+        headers=superuser_token_headers,
+        params={"kind": "SPONSORSHIP", "start": "2001-01-01", "end": "2001-01-10"},
+    )
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert [p["bucket"] for p in data] == [
+        date(2001, 1, day).isoformat() for day in range(1, 11)
+    ]
+    assert all(p["count"] == 0 and p["amount_moving_average"] == 0 for p in data)
+
+
+def test_payment_series_validation(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    r = client.get(URL, headers=normal_user_token_headers, params={"kind": "DONATION"})
+    assert r.status_code == 403
+
+    r = client.get(
+        URL,
+        headers=superuser_token_headers,
+        params={"kind": "DONATION", "start": "2025-02-01", "end": "2025-01-01"},
+    )
+    assert r.status_code == 400
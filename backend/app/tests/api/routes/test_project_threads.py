@@ -0,0 +1,87 @@
+import re
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.models import Comment, ProjectThread, Reply, User
+from app.tests.utils.project import create_random_thread
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+from app.tests.utils.utils import count_queries
+
+URL = f"{settings.API_V1_STR}/projects/threads"
+COMMENTS = 5
+REPLIES = 4
+
+
+def _seeded_thread(db: Session, author: User) -> ProjectThread:
+    thread = create_random_thread(db, author)
+    # Explicit timestamps keep the display order deterministic
+    start = datetime.utcnow() - timedelta(hours=1)
+    comments = [
+        Comment(body=f"comment {i}", author_id=author.id, thread_id=thread.id,
+                created_at=start + timedelta(seconds=i))
+        for i in range(COMMENTS)
+    ]
+    db.add_all(comments)
+    db.flush()
+    db.add_all(
+        Reply(body=f"reply {i}", author_id=author.id, parent_id=comment.id,
+              created_at=start + timedelta(seconds=i))
+        for comment in comments
+        for i in range(REPLIES)
+    )
+    db.commit()
+    return thread
+
+
+def test_thread_detail_windows_comments_and_replies(client: TestClient, db: Session) -> None:
+    thread = _seeded_thread(db, create_random_user(db))
+
+    with count_queries() as statements:
+        r = client.get(f"{URL}/{thread.id}", params={"comment_limit": 2, "reply_limit": 2})
+    assert r.status_code == 200
+    detail = r.json()
+    assert [c["body"] for c in detail["comments"]] == ["comment 0", "comment 1"]
+    assert [reply["body"] for reply in detail["comments"][0]["replies"]] == ["reply 0", "reply 1"]
+    # One query for the comments and one for all their replies, however big
+    # the thread, rather than loading every reply of every comment
+    reads = [s for s in statements if re.search(r"\bFROM (comment|reply)\b", s)]
+    assert len(reads) == 2
+
+    r = client.get(f"{URL}/{thread.id}/comments",
+                   params={"cursor": detail["comments_next_cursor"], "limit": 2})
+    assert r.status_code == 200
+    assert [c["body"] for c in r.json()["data"]] == ["comment 2", "comment 3"]
+
+    comment = detail["comments"][0]
+    r = client.get(f"{settings.API_V1_STR}/projects/comments/{comment['id']}/replies",
+                   params={"cursor": comment["replies_next_cursor"]})
+    assert r.status_code == 200
+    assert [reply["body"] for reply in r.json()["data"]] == ["reply 2", "reply 3"]
+    assert r.json()["meta"]["next_cursor"] is None
+
+    # An empty window would come back without a cursor to page in from
+    for params in ({"comment_limit": 0}, {"reply_limit": 0}):
+        assert client.get(f"{URL}/{thread.id}", params=params).status_code == 422
+
+
+def test_delete_thread_removes_comments_and_replies(client: TestClient, db: Session) -> None:
+    author = create_random_user(db)
+    thread_id = _seeded_thread(db, author).id
+    other_headers = authentication_token_from_email(
+        client=client, email=create_random_user(db).email, db=db)
+    headers = authentication_token_from_email(client=client, email=author.email, db=db)
+
+    r = client.delete(f"{URL}/{thread_id}", headers=other_headers)
+    assert r.status_code == 403
+    r = client.delete(f"{URL}/{thread_id}", headers=headers)
+    assert r.status_code == 200
+    r = client.delete(f"{URL}/{thread_id}", headers=headers)
+    assert r.status_code == 404
+
+    db.expire_all()
+    assert db.get(ProjectThread, thread_id) is None
+    comments = select(Comment.id).where(Comment.thread_id == thread_id)
+    assert db.exec(select(func.count()).select_from(comments.subquery())).one() == 0
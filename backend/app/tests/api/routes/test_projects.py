@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import ProjectStatus, ProjectUpdate
+from app.tests.utils.project import create_random_project
+from app.tests.utils.user import create_random_user
+
+
+def test_read_approved_projects(client: TestClient, db: Session) -> None:
+    requester = create_random_user(db)
+    project = create_random_project(db, requester)
+    crud.update_project(
+        session=db,
+        db_project=project,
+        project_in=ProjectUpdate(status=ProjectStatus.APPROVED),
+    )
+
+    r = client.get(f"{settings.API_V1_STR}/projects/approved?limit=1000")
+    assert r.status_code == 200
+    content = r.json()
+    assert str(project.id) in [p["id"] for p in content["data"]]
+    assert content["meta"]["total"] >= 1
+
+
+def test_read_approved_projects_with_cursor(client: TestClient, db: Session) -> None:
+    requester = create_random_user(db)
+    for _ in range(3):
+        crud.update_project(
+            session=db,
+            db_project=create_random_project(db, requester),
+            project_in=ProjectUpdate(status=ProjectStatus.APPROVED),
+        )
+    url = f"{settings.API_V1_STR}/projects/approved"
+    expected = [p["id"] for p in client.get(url, params={"limit": 1000}).json()["data"]]
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        content = client.get(url, params=params).json()
+        seen += [p["id"] for p in content["data"]]
+        if not content["meta"]["next_cursor"]:
+            break
+        params["cursor"] = content["meta"]["next_cursor"]
+    assert seen == expected
@@ -0,0 +1,79 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app import crud
+from app.core.config import settings
+from app.models import PaymentStatus, Withdrawal
+from app.tests.utils.payment import create_random_payment
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+from app.tests.utils.utils import random_email
+
+URL = f"{settings.API_V1_STR}/withdrawals/request"
+# Within the engine's pool (5 + 10 overflow) so requests contend on rows,
+# not on connections
+PARALLEL = 10
+
+
+def _funded_recipient(
+    client: TestClient, db: Session, amount: float
+) -> tuple[uuid.UUID, dict[str, str]]:
+    email = random_email()
+    headers = authentication_token_from_email(client=client, email=email, db=db)
+    recipient = crud.get_user_by_email(session=db, email=email)
+    assert recipient
+    payment = create_random_payment(db, amount=amount)
+    crud.create_sponsorship(
+        session=db, order_id=payment.order_id,
+        sponsor_id=create_random_user(db).id, recipient_id=recipient.id
+    )
+    crud.update_payment_status(
+        session=db, order_id=payment.order_id, status=PaymentStatus.SUCCESS)
+    return recipient.id, headers
+
+
+def _request(client: TestClient, headers: dict[str, str], amount: float) -> int:
+    body = {
+        "amount": amount,
+        "bank_account_number": "1",
+        "bank_name": "b",
+        "account_holder_name": "h",
+    }
+    return client.post(URL, headers=headers, json=body).status_code
+
+
+def test_parallel_withdrawals_never_overdraw(client: TestClient, db: Session) -> None:
+    recipient_id, headers = _funded_recipient(client, db, 100.0)
+
+    with ThreadPoolExecutor(max_workers=PARALLEL) as pool:
+        statuses = list(pool.map(
+            lambda _: _request(client, headers, 30.0), range(PARALLEL)))
+
+    assert statuses.count(201) == 3
+    assert statuses.count(400) == PARALLEL - 3
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient_id)
+    assert balance["pending_withdrawals"] == 90.0
+    assert balance["available_balance"] >= 0
+
+
+def test_parallel_retries_with_one_idempotency_key(client: TestClient, db: Session) -> None:
+    recipient_id, headers = _funded_recipient(client, db, 100.0)
+    headers = {**headers, "Idempotency-Key": str(uuid.uuid4())}
+
+    with ThreadPoolExecutor(max_workers=PARALLEL) as pool:
+        statuses = list(pool.map(
+            lambda _: _request(client, headers, 30.0), range(PARALLEL)))
+
+    assert set(statuses) == {201}
+    count = db.exec(
+        select(func.count()).select_from(Withdrawal)
+        .where(Withdrawal.recipient_id == recipient_id)
+    ).one()
+    assert count == 1
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient_id)
+    assert balance["available_balance"] == 70.0
+
+    # A different amount under the same key is rejected
+    assert _request(client, headers, 50.0) == 400
@@ -0,0 +1,90 @@
+"""
+Requests per second on the approved-projects and notifications list readers,
+served once through the sync engine (threadpool) and once through the async
+engine (event loop).
+
+Needs a reachable, seeded database (see docker-compose):
+
+    python -m app.tests.benchmarks.bench_async_db --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI
+from sqlmodel import Session, select
+
+from app import crud
+from app.api.deps import AsyncSessionDep, SessionDep
+from app.core.config import settings
+from app.core.db import engine
+from app.models import User
+
+
+def build_app(user_id: uuid.UUID) -> FastAPI:
+    bench_app = FastAPI()
+
+    # The reader /projects/approved serves, and its sync twin
+    @bench_app.get("/sync/projects/approved")
+    def sync_approved_projects(session: SessionDep) -> int:
+        projects, _ = crud.get_approved_projects(session=session, limit=20)
+        return len(projects)
+
+    @bench_app.get("/async/projects/approved")
+    async def async_approved_projects(session: AsyncSessionDep) -> int:
+        projects, _ = await crud.get_approved_projects_async(session=session, limit=20)
+        return len(projects)
+
+    @bench_app.get("/sync/notifications")
+    def sync_notifications(session: SessionDep) -> int:
+        notifications, _ = crud.get_user_notifications(
+            session=session, user_id=user_id, limit=20)
+        return len(notifications)
+
+    @bench_app.get("/async/notifications")
+    async def async_notifications(session: AsyncSessionDep) -> int:
+        notifications, _ = await crud.get_user_notifications_async(
+            session=session, user_id=user_id, limit=20)
+        return len(notifications)
+
+    return bench_app
+
+
+async def run(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    with Session(engine) as session:
+        user = session.exec(
+            select(User).where(User.email == settings.FIRST_SUPERUSER)
+        ).one()
+
+    transport = httpx.ASGITransport(app=build_app(user.id))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in ("projects/approved", "notifications"):
+            for mode in ("sync", "async"):
+                path = f"/{mode}/{endpoint}"
+                await run(client, path, min(requests, 100), concurrency)  # warm up pools
+                rps = await run(client, path, requests, concurrency)
+                print(f"{path:<28} {rps:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,71 @@
+"""
+Wall time to notify 1, 100 and 10k users: one create_notification per
+recipient (one INSERT + commit + publish each) against a single
+create_notifications_bulk call (multi-row INSERT ... RETURNING, one commit,
+one publish).
+
+Needs a reachable database (see docker-compose). Recipients are created up
+front and removed afterwards:
+
+    python -m app.tests.benchmarks.bench_bulk_notifications --sizes 1 100 10000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlmodel import Session, delete
+
+from app import crud
+from app.core.db import engine
+from app.models import Notification, NotificationType, User
+
+NOTIFICATION = {
+    "type": NotificationType.PROJECT_STATUS_CHANGED,
+    "title": "Project update",
+    "message": "A project you follow has been updated",
+}
+
+
+def create_recipients(session: Session, count: int) -> list[uuid.UUID]:
+    users = [
+        User(email=f"bench-{uuid.uuid4()}@example.com", hashed_password="x")
+        for _ in range(count)
+    ]
+    session.add_all(users)
+    session.commit()
+    return [user.id for user in users]
+
+
+async def one_by_one(session: Session, user_ids: list[uuid.UUID]) -> None:
+    for user_id in user_ids:
+        await crud.create_notification(session=session, user_id=user_id, **NOTIFICATION)
+
+
+async def bulk(session: Session, user_ids: list[uuid.UUID]) -> None:
+    await crud.create_notifications_bulk(session=session, user_ids=user_ids, **NOTIFICATION)
+
+
+async def main(sizes: list[int]) -> None:
+    with Session(engine) as session:
+        user_ids = create_recipients(session, max(sizes))
+        try:
+            for size in sizes:
+                for name, scenario in (("one-by-one", one_by_one), ("bulk", bulk)):
+                    start = time.perf_counter()
+                    await scenario(session, user_ids[:size])
+                    elapsed = time.perf_counter() - start
+                    print(f"{size:6d} users  {name:<11} {elapsed * 1000:10.1f} ms")
+                    session.expunge_all()
+        finally:
+            session.execute(delete(Notification).where(Notification.user_id.in_(user_ids)))
+            session.execute(delete(User).where(User.id.in_(user_ids)))
+            session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
@@ -0,0 +1,93 @@
+"""
+Latency of page 1 against page N of one user's notifications, paging with
+skip/limit (OFFSET) and with the keyset cursor. OFFSET has to walk past every
+earlier row so deep pages get slower; the cursor seeks straight to its
+position on the (user_id, created_at) index. Only the page query is timed;
+the total count both modes return is the same either way.
+
+Needs a reachable database (see docker-compose). The user and their
+notifications are generated server-side and removed afterwards:
+
+    python -m app.tests.benchmarks.bench_pagination --rows 1000000 --limit 100 --pages 1 1000
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from functools import partial
+
+from sqlmodel import Session, delete, select, text
+
+from app.core.db import engine
+from app.models import Notification, User
+from app.utils import decode_cursor, encode_cursor, paginate
+
+COLUMNS = [Notification.created_at, Notification.id]
+
+REPEAT = 20
+
+
+def seed(session: Session, rows: int) -> uuid.UUID:
+    user = User(email=f"bench-{uuid.uuid4()}@example.com", hashed_password="x")
+    session.add(user)
+    session.commit()
+    session.execute(
+        text(
+            "INSERT INTO notification (id, user_id, type, title, message, is_read, created_at) "
+            "SELECT gen_random_uuid(), :user_id, 'NEW_COMMENT', 'bench', 'bench', i % 10 <> 0, "
+            "now() - make_interval(secs => i) FROM generate_series(1, :rows) AS i"
+        ),
+        {"user_id": user.id, "rows": rows},
+    )
+    session.commit()
+    session.connection().exec_driver_sql("ANALYZE notification")
+    session.commit()
+    return user.id
+
+
+def timed(call: Callable[[], object]) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def page_query(session: Session, user_id: uuid.UUID, **kwargs: object) -> list[Notification]:
+    statement = select(Notification).where(Notification.user_id == user_id)
+    return list(session.exec(paginate(statement, COLUMNS, **kwargs)).all())  # type: ignore[arg-type]
+
+
+def main(rows: int, limit: int, pages: list[int]) -> None:
+    with Session(engine) as session:
+        user_id = seed(session, rows)
+        try:
+            for page in pages:
+                skip = (page - 1) * limit
+                by_offset = timed(partial(page_query, session, user_id, skip=skip, limit=limit))
+                # Cursor a client holds after reading the previous page
+                after = None
+                if skip:
+                    (previous,) = page_query(session, user_id, skip=skip - 1, limit=1)
+                    after = decode_cursor(encode_cursor(previous.created_at, previous.id))
+                by_cursor = timed(partial(page_query, session, user_id, limit=limit, after=after))
+                print(
+                    f"page {page:6d}  offset {by_offset:8.2f} ms  "
+                    f"cursor {by_cursor:8.2f} ms"
+                )
+        finally:
+            session.execute(delete(Notification).where(Notification.user_id == user_id))
+            session.execute(delete(User).where(User.id == user_id))
+            session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 1000])
+    args = parser.parse_args()
+    main(args.rows, args.limit, args.pages)
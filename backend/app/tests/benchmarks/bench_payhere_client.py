@@ -0,0 +1,96 @@
+"""
+Latency of PayHere retrieval calls (p50/p99):
+
+- per-call client: a new httpx.AsyncClient for every request, as the service
+  used to do, so every call opens (and for https, handshakes) a connection
+- pooled client: PayHereService's application-scoped client, reusing
+  keep-alive connections
+
+By default the calls go to a local stand-in server started by the script
+(plain HTTP, so only the TCP connect and client setup are saved). Point
+--retrieval-url at an https stand-in to include the TLS handshake:
+
+    python -m app.tests.benchmarks.bench_payhere_client --requests 500 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from app.core.config import settings
+from app.services.payhere_service import PayHereService
+from app.tests.utils.payhere import RETRIEVAL_PATH, fake_payhere
+
+HEADERS = {"Authorization": "Bearer bench", "Content-Type": "application/json"}
+
+
+async def measure(
+    call: Callable[[int], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> list[float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(order_id: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await call(order_id)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one(order_id) for order_id in range(requests)))
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<16} p50 {percentiles[49] * 1000:8.2f} ms  "
+        f"p99 {percentiles[98] * 1000:8.2f} ms"
+    )
+
+
+async def run(retrieval_url: str, requests: int, concurrency: int, http2: bool) -> None:
+    async def per_call_client(order_id: int) -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            return await client.get(
+                retrieval_url, headers=HEADERS, params={"order_id": order_id}, timeout=30.0)
+
+    report("per-call client", await measure(per_call_client, requests, concurrency))
+
+    settings.PAYHERE_HTTP2 = http2
+    service = PayHereService()
+    await service.start()
+    try:
+        async def pooled_client(order_id: int) -> httpx.Response:
+            return await service._get_client().get(
+                retrieval_url, headers=HEADERS, params={"order_id": order_id})
+
+        report("pooled client", await measure(pooled_client, requests, concurrency))
+    finally:
+        await service.stop()
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.retrieval_url:
+        asyncio.run(run(args.retrieval_url, args.requests, args.concurrency, args.http2))
+        return
+    with fake_payhere(latency=args.latency) as server:
+        url = server.base_url + RETRIEVAL_PATH
+        asyncio.run(run(url, args.requests, args.concurrency, args.http2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="delay added by the local stand-in, in seconds")
+    parser.add_argument("--retrieval-url", default=None,
+                        help="use this stand-in instead of starting one")
+    parser.add_argument("--http2", action="store_true",
+                        help="let the pooled client negotiate HTTP/2 (https only)")
+    main(parser.parse_args())
@@ -0,0 +1,195 @@
+"""
+Replay of 10k PayHere webhook notifications, a share of them resends of an
+earlier one (PayHere resends until it gets a 200):
+
+- inline: what the webhook route used to do, verify the hash and run
+  update_payment_status (row lock, rollups, ledger, commit) inside the
+  request, resends included
+- record: the request path now, PayHereService.verify_webhook, which
+  verifies and records the notification; a resend is an insert that does
+  nothing. Followed by the time the webhook processor takes to apply
+  everything in batches
+
+Reports request-path p50/p99 and throughput. Needs a reachable database (see
+docker-compose). Each run gets its own sponsored payments, removed
+afterwards together with the rollups they touched:
+
+    python -m app.tests.benchmarks.bench_payhere_webhooks --webhooks 10000 --resend-ratio 0.3
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlmodel import Session, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.models import (
+    Payment,
+    PaymentCurrency,
+    PaymentStatus,
+    Sponsorship,
+    User,
+    WithdrawalLedgerEntry,
+)
+from app.services.payhere_service import PayHereService
+from app.tests.utils.payhere import webhook_form
+
+AMOUNT = 100.0
+RECIPIENTS = 100
+SUCCESS = PaymentStatus.SUCCESS.value
+
+
+def seed(session: Session, orders: int, tag: str) -> tuple[list[int], list[uuid.UUID]]:
+    users = [
+        User(email=f"bench-{uuid.uuid4()}@example.com", hashed_password="x")
+        for _ in range(1 + RECIPIENTS)
+    ]
+    session.add_all(users)
+    payments = [
+        Payment(
+            merchant_id="bench", first_name="f", last_name="l", email="payer@example.com",
+            phone="0", address="a", city="c", country="LK", items=tag,
+            currency=PaymentCurrency.LKR, amount=AMOUNT,
+        )
+        for _ in range(orders)
+    ]
+    session.add_all(payments)
+    session.commit()
+    order_ids = [payment.order_id for payment in payments]
+    session.add_all([
+        Sponsorship(
+            sponsor_id=users[0].id, recipient_id=users[1 + i % RECIPIENTS].id, order_id=order_id)
+        for i, order_id in enumerate(order_ids)
+    ])
+    session.commit()
+    return order_ids, [user.id for user in users]
+
+
+def notifications(order_ids: list[int], webhooks: int) -> list[dict[str, str]]:
+    resends = random.choices(order_ids, k=webhooks - len(order_ids))
+    forms = [webhook_form(order_id, AMOUNT, SUCCESS) for order_id in order_ids + resends]
+    random.shuffle(forms)
+    return forms
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<8} p50 {percentiles[49] * 1000:8.2f} ms  p99 {percentiles[98] * 1000:8.2f} ms  "
+        f"{len(latencies) / elapsed:8.0f} webhooks/s"
+    )
+
+
+def inline(forms: list[dict[str, str]], concurrency: int) -> None:
+    """The previous request path, kept here for comparison"""
+    service = PayHereService()
+    latencies: list[float] = []
+
+    def one(form: dict[str, str]) -> None:
+        start = time.perf_counter()
+        assert service._verify_payhere_hash(
+            merchant_id=form["merchant_id"], order_id=form["order_id"],
+            amount=float(form["payhere_amount"]), currency=form["payhere_currency"],
+            status_code=form["status_code"], received_hash=form["md5sig"],
+        )
+        with Session(engine) as session:
+            crud.update_payment_status(
+                session=session, order_id=int(form["order_id"]),
+                status=PaymentStatus(int(form["status_code"])))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    # Sync routes run on a threadpool of about this size
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, forms))
+    report("inline", latencies, time.perf_counter() - start)
+
+
+async def record(forms: list[dict[str, str]], concurrency: int, batch_size: int) -> None:
+    service = PayHereService()
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(form: dict[str, str]) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            async with AsyncSession(async_engine) as session:
+                await service.verify_webhook(
+                    session=session, merchant_id=form["merchant_id"],
+                    order_id=form["order_id"], amount=form["payhere_amount"],
+                    currency=form["payhere_currency"], status_code=form["status_code"],
+                    received_hash=form["md5sig"],
+                )
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(form) for form in forms))
+    report("record", latencies, time.perf_counter() - start)
+    await async_engine.dispose()
+
+    start = time.perf_counter()
+    applied = 0
+    with Session(engine) as session:
+        while processed := crud.process_payhere_webhook_events(
+            session=session, limit=batch_size
+        )[0]:
+            applied += processed
+    print(f"{'apply':<8} {applied} notifications in {time.perf_counter() - start:.2f} s "
+          f"(batches of {batch_size})")
+
+
+def measure(
+    webhooks: int, resend_ratio: float, run: Callable[[list[dict[str, str]]], Awaitable[None] | None]
+) -> None:
+    tag = f"bench-{uuid.uuid4()}"
+    with Session(engine) as session:
+        order_ids, user_ids = seed(session, int(webhooks * (1 - resend_ratio)), tag)
+    try:
+        result = run(notifications(order_ids, webhooks))
+        if result is not None:
+            asyncio.run(result)
+        with Session(engine) as session:
+            successful = len(session.exec(
+                select(Payment.order_id)
+                .where(Payment.items == tag, Payment.status == PaymentStatus.SUCCESS)
+            ).all())
+            credits = len(session.exec(
+                select(WithdrawalLedgerEntry.id).where(WithdrawalLedgerEntry.order_id.in_(order_ids))
+            ).all())
+        print(f"{'':<8} {successful}/{len(order_ids)} payments settled, {credits} ledger credits")
+    finally:
+        with Session(engine) as session:
+            session.execute(delete(WithdrawalLedgerEntry).where(
+                WithdrawalLedgerEntry.recipient_id.in_(user_ids)))
+            session.execute(delete(Sponsorship).where(Sponsorship.sponsor_id.in_(user_ids)))
+            session.execute(delete(Payment).where(Payment.items == tag))
+            session.execute(delete(User).where(User.id.in_(user_ids)))
+            session.commit()
+            crud.rebuild_payment_rollups(session=session)
+
+
+def main(args: argparse.Namespace) -> None:
+    if not settings.PAYHERE_MERCHANT_SECRET:
+        raise SystemExit("PAYHERE_MERCHANT_SECRET must be set to sign the notifications")
+    measure(args.webhooks, args.resend_ratio, lambda forms: inline(forms, args.concurrency))
+    measure(args.webhooks, args.resend_ratio,
+            lambda forms: record(forms, args.concurrency, args.batch_size))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--webhooks", type=int, default=10_000)
+    parser.add_argument("--resend-ratio", type=float, default=0.3,
+                        help="share of the notifications that are resends")
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=settings.PAYHERE_WEBHOOK_BATCH_SIZE)
+    main(parser.parse_args())
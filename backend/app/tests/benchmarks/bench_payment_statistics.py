@@ -0,0 +1,163 @@
+"""
+Admin donation statistics over 1M payments, three ways:
+
+- load-all: every successful (Donation, Payment) pair loaded into Python,
+  followed by separate COUNT queries (the original implementation)
+- aggregate: one pass over payment with FILTER clauses
+- rollup: get_donation_statistics, reading payment_daily_rollup
+
+Reports wall time and peak Python allocations.
+
+Needs a reachable database (see docker-compose). Payments and donations are
+generated server-side, tagged, and removed afterwards; the rollups are
+rebuilt after seeding and again after cleanup:
+
+    python -m app.tests.benchmarks.bench_payment_statistics --rows 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+
+from sqlmodel import Session, delete, func, select, text
+
+from app import crud
+from app.core.db import engine
+from app.models import Donation, DonationStatistics, Payment, PaymentStatus, User
+
+DONORS = 1000
+
+
+def seed(session: Session, rows: int, tag: str) -> list[uuid.UUID]:
+    donors = [
+        User(email=f"bench-{uuid.uuid4()}@example.com", hashed_password="x")
+        for _ in range(DONORS)
+    ]
+    session.add_all(donors)
+    session.commit()
+    donor_ids = [donor.id for donor in donors]
+    session.execute(
+        text(
+            "INSERT INTO payment (id, merchant_id, first_name, last_name, email, phone, "
+            "address, city, country, items, currency, amount, status, created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'bench', 'f', 'l', 'payer@example.com', '0', 'a', 'c', "
+            "'LK', :tag, 'LKR', 100 + i % 5000, "
+            "CAST(CASE WHEN i % 10 = 0 THEN 'PENDING' WHEN i % 10 = 1 THEN 'FAILED' "
+            "ELSE 'SUCCESS' END AS paymentstatus), now(), now() "
+            "FROM generate_series(1, :rows) AS i"
+        ),
+        {"tag": tag, "rows": rows},
+    )
+    session.execute(
+        text(
+            "INSERT INTO donation (id, donor_id, order_id, created_at) "
+            "SELECT gen_random_uuid(), (:donors)[1 + order_id % :count], order_id, now() "
+            "FROM payment WHERE items = :tag"
+        ),
+        {"donors": donor_ids, "count": len(donor_ids), "tag": tag},
+    )
+    session.commit()
+    session.connection().exec_driver_sql("ANALYZE payment, donation")
+    session.commit()
+    return donor_ids
+
+
+def load_all(session: Session) -> DonationStatistics:
+    """The previous implementation, kept here for comparison"""
+    results = list(session.exec(
+        select(Donation, Payment)
+        .join(Payment, Donation.order_id == Payment.order_id)
+        .where(Payment.status == PaymentStatus.SUCCESS)
+    ).all())
+    total_amount = sum(payment.amount for _, payment in results)
+    successful_count = len(results)
+    pending_count = session.exec(
+        select(func.count())
+        .select_from(Donation)
+        .join(Payment, Donation.order_id == Payment.order_id)
+        .where(Payment.status == PaymentStatus.PENDING)
+    ).one()
+    unique_donors = session.exec(
+        select(func.count(func.distinct(Donation.donor_id)))
+        .select_from(Donation)
+        .join(Payment, Donation.order_id == Payment.order_id)
+        .where(Payment.status == PaymentStatus.SUCCESS)
+    ).one()
+    return DonationStatistics(
+        total_donations=successful_count + pending_count,
+        total_amount=float(total_amount),
+        average_donation=float(total_amount / successful_count) if successful_count else 0.0,
+        pending_donations=pending_count,
+        successful_donations=successful_count,
+        unique_donors=unique_donors,
+    )
+
+
+def aggregate(session: Session) -> DonationStatistics:
+    """Single FILTER aggregate over payment"""
+    success = Payment.status == PaymentStatus.SUCCESS
+    successful_count, pending_count, total_amount, average_donation, unique_donors = session.exec(
+        select(
+            func.count().filter(success),
+            func.count().filter(Payment.status == PaymentStatus.PENDING),
+            func.coalesce(func.sum(Payment.amount).filter(success), 0.0),
+            func.coalesce(func.avg(Payment.amount).filter(success), 0.0),
+            func.count(func.distinct(Donation.donor_id)).filter(success),
+        )
+        .select_from(Donation)
+        .join(Payment, Donation.order_id == Payment.order_id)
+        .where(Payment.status.in_([PaymentStatus.SUCCESS, PaymentStatus.PENDING]))
+    ).one()
+    return DonationStatistics(
+        total_donations=successful_count + pending_count,
+        total_amount=float(total_amount),
+        average_donation=float(average_donation),
+        pending_donations=pending_count,
+        successful_donations=successful_count,
+        unique_donors=unique_donors,
+    )
+
+
+def measure(session: Session, call: Callable[[Session], DonationStatistics]) -> tuple[float, float, DonationStatistics]:
+    session.expunge_all()
+    tracemalloc.start()
+    start = time.perf_counter()
+    stats = call(session)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    session.expunge_all()
+    return elapsed, peak / 2**20, stats
+
+
+def main(rows: int) -> None:
+    tag = f"bench-{uuid.uuid4()}"
+    with Session(engine) as session:
+        donor_ids = seed(session, rows, tag)
+        crud.rebuild_payment_rollups(session=session)
+        try:
+            for name, call in (
+                ("load-all", load_all),
+                ("aggregate", aggregate),
+                ("rollup", lambda s: crud.get_donation_statistics(session=s)),
+            ):
+                elapsed, peak, stats = measure(session, call)
+                print(
+                    f"{name:<10} {elapsed * 1000:10.1f} ms  peak {peak:8.1f} MiB  "
+                    f"successful={stats.successful_donations} total={stats.total_amount:.0f}"
+                )
+        finally:
+            session.execute(delete(Donation).where(Donation.donor_id.in_(donor_ids)))
+            session.execute(delete(Payment).where(Payment.items == tag))
+            session.execute(delete(User).where(User.id.in_(donor_ids)))
+            session.commit()
+            crud.rebuild_payment_rollups(session=session)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    main(args.rows)
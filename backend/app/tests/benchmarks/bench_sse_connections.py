@@ -0,0 +1,66 @@
+"""
+Resident memory of one worker holding many SSE streams while notifications keep
+arriving. Half of the streams are idle (never read past the first frame), the
+other half are slow (read one frame per round). With bounded per-connection
+buffers RSS should level off once the buffers are full instead of growing with
+every round.
+
+Runs in-process against the notification stream endpoint, no database needed:
+
+    python -m app.tests.benchmarks.bench_sse_connections --connections 5000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import resource
+import uuid
+
+from app.api.routes.notifications import notification_stream
+from app.core.notification_manager import notification_manager
+from app.models import User
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * resource.getpagesize() / 1024 / 1024
+
+
+async def main(connections: int, rounds: int, per_round: int) -> None:
+    users = [
+        User(id=uuid.uuid4(), email=f"bench-{i}@example.com", hashed_password="x")
+        for i in range(connections)
+    ]
+    streams = []
+    for user in users:
+        response = await notification_stream(current_user=user)
+        iterator = response.body_iterator
+        await iterator.__anext__()  # connected frame registers the stream
+        streams.append(iterator)
+    slow = streams[: connections // 2]
+
+    print(f"{connections} streams open, rss {rss_mb():.1f} MB")
+    payload = {"type": "bench", "title": "x" * 64, "message": "y" * 256}
+    for round_no in range(1, rounds + 1):
+        for _ in range(per_round):
+            for user in users:
+                await notification_manager.deliver_local(user.id, payload)
+        for iterator in slow:
+            await iterator.__anext__()
+        print(
+            f"round {round_no:3d}  rss {rss_mb():7.1f} MB  "
+            f"dropped {notification_manager.dropped_messages:9d}  "
+            f"evicted {notification_manager.evicted_connections:6d}"
+        )
+
+    for iterator in streams:
+        await iterator.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--per-round", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.connections, args.rounds, args.per_round))
@@ -0,0 +1,88 @@
+"""
+Event-loop CPU time spent per idle SSE connection on keepalives.
+
+- per-connection: every stream waits in asyncio.wait_for(queue.get(), timeout),
+  so each one arms and cancels its own timer and encodes its own keepalive
+- shared: streams wait on SSEConnection.get() while one sharded heartbeat in
+  the notification manager queues a pre-encoded keepalive frame
+
+The interval is shortened so a run covers many heartbeats:
+
+    python -m app.tests.benchmarks.bench_sse_heartbeat --connections 10000 --interval 1 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from app.core.notification_broker import InMemoryNotificationBroker
+from app.core.notification_manager import NotificationConnectionManager, SSEConnection
+
+
+async def per_connection(connections: int, interval: float, duration: float) -> int:
+    sent = 0
+
+    async def stream() -> None:
+        nonlocal sent
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        while True:
+            try:
+                await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                json.dumps({"type": "keepalive"})
+                sent += 1
+
+    tasks = [asyncio.create_task(stream()) for _ in range(connections)]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return sent
+
+
+async def shared(connections: int, interval: float, duration: float) -> int:
+    sent = 0
+    manager = NotificationConnectionManager(
+        broker=InMemoryNotificationBroker(), heartbeat_interval=interval
+    )
+
+    async def stream(connection: SSEConnection) -> None:
+        nonlocal sent
+        while True:
+            await connection.get()
+            sent += 1
+
+    tasks = []
+    for _ in range(connections):
+        connection = SSEConnection()
+        await manager.connect(uuid.uuid4(), connection)
+        tasks.append(asyncio.create_task(stream(connection)))
+    await manager.start()
+    await asyncio.sleep(duration)
+    await manager.stop()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return sent
+
+
+async def main(connections: int, interval: float, duration: float) -> None:
+    for name, scenario in (("per-connection", per_connection), ("shared", shared)):
+        cpu = time.process_time()
+        sent = await scenario(connections, interval, duration)
+        cpu = time.process_time() - cpu
+        print(
+            f"{name:<15} {sent:8d} keepalives  cpu {cpu:6.2f}s  "
+            f"{cpu / max(sent, 1) * 1e6:7.1f} us/keepalive"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.connections, args.interval, args.duration))
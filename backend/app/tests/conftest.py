@@ -5,9 +5,9 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
 from app.core.config import settings
-from app.core.db import engine, init_db
+from app.core.db import async_engine, engine, init_db
 from app.main import app
-from app.models import Item, User
+from app.models import Comment, Item, ProjectThread, Reply, Task, User
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
@@ -19,6 +19,10 @@ def db() -> Generator[Session, None, None]:
         yield session
         statement = delete(Item)
         session.execute(statement)
+        # Thread authors and task assignees do not cascade; clear them before
+        # their users
+        for model in (Reply, Comment, ProjectThread, Task):
+            session.execute(delete(model))
         statement = delete(User)
         session.execute(statement)
         session.commit()
@@ -28,6 +32,9 @@ def db() -> Generator[Session, None, None]:
 def client() -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
         yield c
+        # Pooled async connections are bound to the client's event loop
+        assert c.portal
+        c.portal.call(async_engine.dispose)
 
 
 @pytest.fixture(scope="module")
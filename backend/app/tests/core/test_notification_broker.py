@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+
+from app.core.notification_broker import (
+    InMemoryNotificationBroker,
+    PostgresNotificationBroker,
+)
+from app.core.notification_manager import NotificationConnectionManager, SSEConnection
+
+
+def test_in_memory_broker_delivers_to_local_connections() -> None:
+    async def run() -> str | None:
+        manager = NotificationConnectionManager(broker=InMemoryNotificationBroker())
+        await manager.start()
+        user_id = uuid.uuid4()
+        connection = SSEConnection()
+        await manager.connect(user_id, connection)
+        await manager.send_notification(user_id, {"title": "hello"})
+        message = await asyncio.wait_for(connection.get(), 1.0)
+        await manager.stop()
+        return message
+
+    message = asyncio.run(run())
+    assert message == 'data: {"title": "hello"}\n\n'
+
+
+def test_postgres_broker_fans_out_across_workers() -> None:
+    # Two managers with their own listener stand in for two uvicorn workers
+    channel = f"notifications_test_{uuid.uuid4().hex}"
+
+    async def run() -> tuple[str | None, str | None]:
+        sender = NotificationConnectionManager(
+            broker=PostgresNotificationBroker(channel=channel)
+        )
+        receiver = NotificationConnectionManager(
+            broker=PostgresNotificationBroker(channel=channel)
+        )
+        await sender.start()
+        await receiver.start()
+        user_id = uuid.uuid4()
+        connection = SSEConnection()
+        await receiver.connect(user_id, connection)
+        try:
+            await sender.send_notification(user_id, {"title": "from another worker"})
+            received = await asyncio.wait_for(connection.get(), 5.0)
+            # The publishing worker gets its own notification back as well
+            own_connection = SSEConnection()
+            await sender.connect(user_id, own_connection)
+            await sender.send_notification(user_id, {"title": "echo"})
+            echoed = await asyncio.wait_for(own_connection.get(), 5.0)
+        finally:
+            await sender.stop()
+            await receiver.stop()
+        return received, echoed
+
+    received, echoed = asyncio.run(run())
+    assert received == 'data: {"title": "from another worker"}\n\n'
+    assert echoed == 'data: {"title": "echo"}\n\n'
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+
+from app.core.notification_broker import InMemoryNotificationBroker
+from app.core.notification_manager import (
+    KEEPALIVE_FRAME,
+    NotificationConnectionManager,
+    SSEConnection,
+    format_notification_event,
+    frame_event_id,
+    notification_event_id,
+    parse_event_id,
+)
+
+
+def _notify(manager: NotificationConnectionManager, user_id: uuid.UUID, count: int) -> None:
+    async def run() -> None:
+        for i in range(count):
+            await manager.deliver_local(user_id, {"n": i})
+
+    asyncio.run(run())
+
+
+def _drain(connection: SSEConnection) -> list[str]:
+    async def run() -> list[str]:
+        frames: list[str] = []
+        while True:
+            try:
+                frame = await asyncio.wait_for(connection.get(), 0.01)
+            except asyncio.TimeoutError:
+                return frames
+            if frame is None:
+                return frames
+            frames.append(frame)
+
+    return asyncio.run(run())
+
+
+def _connect(overflow: str) -> tuple[NotificationConnectionManager, uuid.UUID, SSEConnection]:
+    manager = NotificationConnectionManager(broker=InMemoryNotificationBroker())
+    user_id = uuid.uuid4()
+    connection = SSEConnection(maxsize=3, overflow=overflow)
+    asyncio.run(manager.connect(user_id, connection))
+    return manager, user_id, connection
+
+
+def test_drop_oldest_keeps_latest_messages() -> None:
+    manager, user_id, connection = _connect(SSEConnection.DROP_OLDEST)
+    _notify(manager, user_id, 5)
+    frames = _drain(connection)
+    assert [json.loads(f[len("data: "):])["n"] for f in frames] == [2, 3, 4]
+    assert connection.dropped == 2
+    assert manager.dropped_messages == 2
+
+
+def test_coalesce_summarises_overflow() -> None:
+    manager, user_id, connection = _connect(SSEConnection.COALESCE)
+    _notify(manager, user_id, 5)
+    frames = _drain(connection)
+    assert len(frames) == 4
+    assert json.loads(frames[-1][len("data: "):]) == {
+        "type": "notifications_coalesced",
+        "count": 2,
+    }
+    assert manager.dropped_messages == 2
+
+
+def test_disconnect_evicts_slow_consumer() -> None:
+    manager, user_id, connection = _connect(SSEConnection.DISCONNECT)
+    _notify(manager, user_id, 5)
+    assert connection.closed
+    assert _drain(connection) == []
+    assert manager.get_connections(user_id) == []
+    assert manager.evicted_connections == 1
+    assert manager.dropped_messages == 1
+
+
+def test_heartbeat_reaches_idle_connections_only() -> None:
+    manager = NotificationConnectionManager(
+        broker=InMemoryNotificationBroker(), heartbeat_interval=0.16
+    )
+
+    async def run() -> tuple[list[str], list[str]]:
+        idle, busy = SSEConnection(), SSEConnection()
+        await manager.connect(uuid.uuid4(), idle)
+        await manager.connect(uuid.uuid4(), busy)
+        busy.put("data: {}\n\n")
+        await manager.start()
+        # A full sweep over every shard takes one interval
+        await asyncio.sleep(0.3)
+        await manager.stop()
+        return [idle._messages.popleft()], list(busy._messages)
+
+    idle_frames, busy_frames = asyncio.run(run())
+    assert idle_frames == [KEEPALIVE_FRAME]
+    assert busy_frames == ["data: {}\n\n"]
+
+
+def test_notification_frames_carry_unique_event_ids() -> None:
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678901)
+    first, second = sorted([uuid.uuid4(), uuid.uuid4()])
+    event_id = notification_event_id(created_at, first)
+    assert parse_event_id(event_id) == (created_at, first)
+    # Same microsecond, still distinct and ordered by id
+    key = parse_event_id(notification_event_id(created_at, second))
+    assert key and key > (created_at, first)
+
+    frame = format_notification_event({
+        "id": str(first),
+        "title": "x",
+        "created_at": created_at.replace(tzinfo=timezone.utc).isoformat(),
+    })
+    assert frame.startswith(f"id: {event_id}\ndata: ")
+    assert frame_event_id(frame) == event_id
+    assert frame_event_id(KEEPALIVE_FRAME) is None
+    # Ids from before the cursor format are ignored rather than misread
+    assert parse_event_id("1735787045678901") is None
+
+
+def test_send_notifications_fans_out_batch() -> None:
+    manager = NotificationConnectionManager(broker=InMemoryNotificationBroker())
+    users = [uuid.uuid4() for _ in range(3)]
+    connections = [SSEConnection() for _ in users]
+
+    async def run() -> None:
+        await manager.start()
+        for user_id, connection in zip(users, connections, strict=True):
+            await manager.connect(user_id, connection)
+        await manager.send_notifications(
+            [(user_id, {"to": str(user_id)}) for user_id in users]
+        )
+        await manager.stop()
+
+    asyncio.run(run())
+    for user_id, connection in zip(users, connections, strict=True):
+        assert _drain(connection) == [f'data: {{"to": "{user_id}"}}\n\n']
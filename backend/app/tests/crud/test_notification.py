@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import uuid
+
+import pytest
+from sqlmodel import Session, select
+
+from app import crud
+from app.models import Notification, NotificationType
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import count_queries
+
+
+def test_create_notifications_bulk(db: Session) -> None:
+    users = [create_random_user(db) for _ in range(3)]
+    user_ids = [user.id for user in users]
+
+    notifications = asyncio.run(
+        crud.create_notifications_bulk(
+            session=db,
+            user_ids=user_ids,
+            type=NotificationType.PROJECT_STATUS_CHANGED,
+            title="Announcement",
+            message="Project-wide update",
+        )
+    )
+
+    assert [n.user_id for n in notifications] == user_ids
+    assert all(n.id and not n.is_read for n in notifications)
+    stored = db.exec(
+        select(Notification).where(Notification.user_id.in_(user_ids))
+    ).all()
+    assert sorted(n.id for n in stored) == sorted(n.id for n in notifications)
+
+
+def test_create_notifications_bulk_without_recipients(db: Session) -> None:
+    notifications = asyncio.run(
+        crud.create_notifications_bulk(
+            session=db,
+            user_ids=[],
+            type=NotificationType.PROJECT_STATUS_CHANGED,
+            title="Announcement",
+            message="Nobody to tell",
+        )
+    )
+    assert notifications == []
+
+
+def test_create_notifications_bulk_skips_unknown_recipients(
+    db: Session, caplog: pytest.LogCaptureFixture
+) -> None:
+    user = create_random_user(db)
+
+    with caplog.at_level(logging.WARNING, logger="app.crud"):
+        notifications = asyncio.run(
+            crud.create_notifications_bulk(
+                session=db,
+                user_ids=[uuid.uuid4(), user.id, uuid.uuid4()],
+                type=NotificationType.PROJECT_STATUS_CHANGED,
+                title="Announcement",
+                message="Two recipients were deleted",
+            )
+        )
+
+    skipped = [r.message for r in caplog.records if "unknown users" in r.message]
+    assert len(skipped) == 1
+    assert skipped[0].startswith("Skipping notifications for 2 unknown users")
+    assert [n.user_id for n in notifications] == [user.id]
+    assert crud.get_unread_notifications_count(session=db, user_id=user.id) == 1
+
+
+def test_unread_counter_follows_create_and_mark_read(db: Session) -> None:
+    user = create_random_user(db)
+    assert crud.get_unread_notifications_count(session=db, user_id=user.id) == 0
+
+    async def notify(count: int) -> list[Notification]:
+        return [
+            await crud.create_notification(
+                session=db,
+                user_id=user.id,
+                type=NotificationType.NEW_COMMENT,
+                title=f"comment {i}",
+                message="new comment",
+            )
+            for i in range(count)
+        ]
+
+    notifications = asyncio.run(notify(3))
+    asyncio.run(
+        crud.create_notifications_bulk(
+            session=db,
+            user_ids=[user.id, user.id],
+            type=NotificationType.PROJECT_STATUS_CHANGED,
+            title="Announcement",
+            message="Project-wide update",
+        )
+    )
+    assert crud.get_unread_notifications_count(session=db, user_id=user.id) == 5
+
+    crud.mark_notification_as_read(session=db, notification_id=notifications[0].id)
+    # Marking an already read notification does not decrement again
+    read = crud.mark_notification_as_read(session=db, notification_id=notifications[0].id)
+    assert read.is_read
+    assert crud.get_unread_notifications_count(session=db, user_id=user.id) == 4
+
+    assert crud.mark_all_notifications_as_read(session=db, user_id=user.id) == 4
+    assert crud.get_unread_notifications_count(session=db, user_id=user.id) == 0
+    assert crud.get_unread_notifications(session=db, user_id=user.id) == []
+
+
+def test_user_notifications_page_and_total_in_one_query(db: Session) -> None:
+    user = create_random_user(db)
+    db.add_all(
+        Notification(
+            user_id=user.id,
+            type=NotificationType.NEW_COMMENT,
+            title=f"paged {i}",
+            message="paged",
+        )
+        for i in range(5)
+    )
+    db.commit()
+
+    page, total = crud.get_user_notifications(session=db, user_id=user.id, limit=2)
+    assert len(page) == 2
+    assert total == 5
+
+    # Cursor pages leave the total to the first page and count nothing
+    last = page[-1]
+    with count_queries() as statements:
+        rest, total = crud.get_user_notifications(
+            session=db, user_id=user.id, limit=10, after=(last.created_at, last.id)
+        )
+    assert len(rest) == 3
+    assert total is None
+    assert len(statements) == 1
+    assert "count(" not in statements[0]
+
+    # Past the last page there are no rows, but the total is still known
+    empty, total = crud.get_user_notifications(session=db, user_id=user.id, skip=10)
+    assert empty == []
+    assert total == 5
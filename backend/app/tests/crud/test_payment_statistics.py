@@ -0,0 +1,108 @@
+from datetime import date
+from typing import Any
+
+from sqlmodel import Session
+
+from app import crud
+from app.models import PaymentKind, PaymentStatus
+from app.tests.utils.payment import create_random_payment
+from app.tests.utils.user import create_random_user
+
+
+def test_donation_statistics(db: Session) -> None:
+    before = crud.get_donation_statistics(session=db)
+    donor, other = create_random_user(db), create_random_user(db)
+    for donor_id, amount, status in (
+        (donor.id, 100.0, PaymentStatus.SUCCESS),
+        (donor.id, 50.0, PaymentStatus.SUCCESS),
+        (other.id, 25.0, PaymentStatus.PENDING),
+        (other.id, 999.0, PaymentStatus.FAILED),
+    ):
+        payment = create_random_payment(db, amount=amount)
+        crud.create_donation(session=db, order_id=payment.order_id, donor_id=donor_id)
+        crud.update_payment_status(session=db, order_id=payment.order_id, status=status)
+
+    after = crud.get_donation_statistics(session=db)
+    assert after.successful_donations - before.successful_donations == 2
+    assert after.pending_donations - before.pending_donations == 1
+    assert after.total_donations - before.total_donations == 3
+    assert after.total_amount - before.total_amount == 150.0
+    assert after.unique_donors - before.unique_donors == 1
+    assert after.average_donation == after.total_amount / after.successful_donations
+
+
+def test_sponsorship_statistics(db: Session) -> None:
+    before = crud.get_sponsorship_statistics(session=db)
+    sponsor, recipient = create_random_user(db), create_random_user(db)
+    for amount, status in (
+        (40.0, PaymentStatus.SUCCESS),
+        (60.0, PaymentStatus.PENDING),
+        (80.0, PaymentStatus.CANCELLED),
+    ):
+        payment = create_random_payment(db, amount=amount)
+        crud.create_sponsorship(
+            session=db, order_id=payment.order_id,
+            sponsor_id=sponsor.id, recipient_id=recipient.id
+        )
+        crud.update_payment_status(session=db, order_id=payment.order_id, status=status)
+
+    after = crud.get_sponsorship_statistics(session=db)
+    assert after.successful_sponsorships - before.successful_sponsorships == 1
+    assert after.pending_sponsorships - before.pending_sponsorships == 1
+    assert after.total_amount - before.total_amount == 40.0
+    assert after.unique_sponsors - before.unique_sponsors == 1
+    assert after.unique_recipients - before.unique_recipients == 1
+
+
+def test_refund_moves_payment_out_of_success(db: Session) -> None:
+    donor = create_random_user(db)
+    payment = create_random_payment(db, amount=70.0)
+    crud.create_donation(session=db, order_id=payment.order_id, donor_id=donor.id)
+    crud.update_payment_status(
+        session=db, order_id=payment.order_id, status=PaymentStatus.SUCCESS)
+    before = crud.get_donation_statistics(session=db)
+
+    crud.update_payment_status(
+        session=db, order_id=payment.order_id, status=PaymentStatus.CANCELLED)
+
+    after = crud.get_donation_statistics(session=db)
+    assert before.successful_donations - after.successful_donations == 1
+    assert before.total_amount - after.total_amount == 70.0
+    assert before.unique_donors - after.unique_donors == 1
+
+
+def _rollup_snapshot(db: Session) -> tuple[Any, ...]:
+    return (
+        crud.get_donation_statistics(session=db),
+        crud.get_sponsorship_statistics(session=db),
+        # Rows a status move emptied are not recreated by a rebuild
+        [r.model_dump() for r in crud.get_payment_daily_rollups(session=db) if r.payment_count],
+    )
+
+
+def test_rebuild_matches_incremental_rollup(db: Session) -> None:
+    # Start from a rebuilt state; other tests seed payments directly
+    crud.rebuild_payment_rollups(session=db)
+    donor = create_random_user(db)
+    for status in (PaymentStatus.SUCCESS, PaymentStatus.PENDING, PaymentStatus.FAILED):
+        payment = create_random_payment(db, amount=10.0)
+        crud.create_donation(session=db, order_id=payment.order_id, donor_id=donor.id)
+        crud.update_payment_status(session=db, order_id=payment.order_id, status=status)
+    incremental = _rollup_snapshot(db)
+
+    crud.rebuild_payment_rollups(session=db)
+
+    assert _rollup_snapshot(db) == incremental
+
+
+def test_daily_rollups_filter_by_kind_and_day(db: Session) -> None:
+    donor = create_random_user(db)
+    payment = create_random_payment(db, amount=15.0)
+    crud.create_donation(session=db, order_id=payment.order_id, donor_id=donor.id)
+    today = payment.created_at.date()
+
+    rows = crud.get_payment_daily_rollups(
+        session=db, kind=PaymentKind.DONATION, start=today, end=today)
+    assert rows
+    assert all(r.kind == PaymentKind.DONATION and r.day == today for r in rows)
+    assert not crud.get_payment_daily_rollups(session=db, end=date(2000, 1, 1))
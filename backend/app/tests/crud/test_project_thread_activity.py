@@ -0,0 +1,84 @@
+from typing import Any
+
+from sqlmodel import Session
+
+from app import crud
+from app.models import (
+    CommentCreate,
+    ProjectThread,
+    ProjectThreadCreate,
+    ProjectThreadSort,
+    ReplyCreate,
+)
+from app.tests.utils.project import create_random_thread
+from app.tests.utils.user import create_random_user
+
+
+def _activity(db: Session, thread: ProjectThread) -> tuple[Any, ...]:
+    db.refresh(thread)
+    return (
+        thread.comment_count, thread.reply_count, thread.last_activity_at, thread.last_author_id
+    )
+
+
+def test_comments_and_replies_update_thread_activity(db: Session) -> None:
+    author, commenter = create_random_user(db), create_random_user(db)
+    thread = create_random_thread(db, author)
+    assert _activity(db, thread) == (0, 0, thread.created_at, author.id)
+    updated_at = thread.updated_at
+
+    comment = crud.create_comment(
+        session=db, comment_in=CommentCreate(body="c"), thread_id=thread.id, author_id=author.id)
+    other = crud.create_comment(
+        session=db, comment_in=CommentCreate(body="c"), thread_id=thread.id, author_id=author.id)
+    reply = crud.create_reply(
+        session=db, reply_in=ReplyCreate(body="r", parent_id=comment.id), author_id=commenter.id)
+    crud.create_reply(
+        session=db, reply_in=ReplyCreate(body="r", parent_id=comment.id), author_id=author.id)
+    latest = crud.create_reply(
+        session=db, reply_in=ReplyCreate(body="r", parent_id=other.id), author_id=commenter.id)
+    assert _activity(db, thread) == (2, 3, latest.created_at, commenter.id)
+    # Counters are bookkeeping, not an edit of the thread
+    assert thread.updated_at == updated_at
+
+    crud.delete_reply(session=db, db_reply=reply)
+    assert _activity(db, thread)[:2] == (2, 2)
+    # Deleting a comment takes its replies off the counters too
+    crud.delete_comment(session=db, db_comment=comment)
+    assert _activity(db, thread)[:2] == (1, 1)
+
+
+def test_rebuild_matches_incremental_activity(db: Session) -> None:
+    author = create_random_user(db)
+    thread = create_random_thread(db, author)
+    comment = crud.create_comment(
+        session=db, comment_in=CommentCreate(body="c"), thread_id=thread.id, author_id=author.id)
+    crud.create_reply(
+        session=db, reply_in=ReplyCreate(body="r", parent_id=comment.id), author_id=author.id)
+    incremental = _activity(db, thread)
+
+    # Drifted counters, e.g. from writes that bypassed crud
+    thread.comment_count, thread.reply_count = 7, 7
+    db.add(thread)
+    db.commit()
+    assert crud.rebuild_project_thread_activity(session=db) >= 1
+
+    assert _activity(db, thread) == incremental
+
+
+def test_threads_sort_by_recent_activity(db: Session) -> None:
+    author = create_random_user(db)
+    quiet = create_random_thread(db, author)
+    busy = crud.create_project_thread(
+        session=db, thread_in=ProjectThreadCreate(title="busy", body="body"),
+        author_id=author.id, project_id=quiet.project_id,
+    )
+    crud.create_comment(
+        session=db, comment_in=CommentCreate(body="c"), thread_id=quiet.id, author_id=author.id)
+
+    threads, count = crud.get_project_threads_by_project_id(
+        session=db, project_id=quiet.project_id, sort=ProjectThreadSort.ACTIVITY)
+
+    assert count == 2
+    assert [t.id for t in threads] == [quiet.id, busy.id]
+    assert threads[0].comment_count == 1
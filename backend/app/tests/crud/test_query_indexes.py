@@ -0,0 +1,225 @@
+import re
+import uuid
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+from app.models import (
+    ApplicationStatus,
+    DeveloperRole,
+    Donation,
+    Notification,
+    NotificationType,
+    PaymentStatus,
+    Project,
+    ProjectApplication,
+    ProjectStatus,
+    ProjectType,
+    Sponsorship,
+    Task,
+    TaskStatus,
+    Withdrawal,
+    WithdrawalStatus,
+)
+from app.tests.utils.payment import random_payment
+from app.tests.utils.user import create_random_user
+
+ROWS = 300
+
+
+@pytest.fixture(scope="module")
+def seeded(db: Session) -> dict[str, Any]:
+    """Many rows of other users around a handful belonging to the target user"""
+    target = create_random_user(db)
+    other = create_random_user(db)
+
+    projects = [
+        Project(
+            title=f"project {i}",
+            description="seeded for index tests",
+            project_type=ProjectType.WEBSITE,
+            requester_id=other.id,
+            status=ProjectStatus.APPROVED if i % 50 == 0 else ProjectStatus.PENDING,
+        )
+        for i in range(ROWS)
+    ]
+    db.add_all(projects)
+    db.flush()
+
+    def application(project: Project, volunteer_id: uuid.UUID) -> ProjectApplication:
+        return ProjectApplication(
+            project_id=project.id,
+            volunteer_id=volunteer_id,
+            volunteer_role=DeveloperRole.BACKEND,
+            cover_letter="seeded",
+            skills="python",
+            experience_years=1,
+            github_url="https://github.com/example",
+            status=ApplicationStatus.APPROVED,
+        )
+
+    db.add_all(application(p, other.id) for p in projects)
+    db.add_all(application(p, target.id) for p in projects[:3])
+    db.add_all(
+        Task(
+            title=f"task {i}",
+            project_id=projects[i].id,
+            assignee_id=target.id if i < 3 else other.id,
+            status=TaskStatus.COMPLETED,
+        )
+        for i in range(ROWS)
+    )
+    db.add_all(
+        Notification(
+            user_id=target.id if i < 3 else other.id,
+            type=NotificationType.NEW_COMMENT,
+            title="seeded",
+            message="seeded",
+            is_read=i % 10 != 0,
+        )
+        for i in range(ROWS)
+    )
+    db.add_all(
+        Withdrawal(
+            recipient_id=target.id if i < 3 else other.id,
+            amount_requested=1.0,
+            fee_amount=0.06,
+            amount_to_transfer=0.94,
+            bank_account_number="1",
+            bank_name="b",
+            account_holder_name="h",
+            status=WithdrawalStatus.COMPLETED,
+        )
+        for i in range(ROWS)
+    )
+
+    # Mostly settled payments, a few pending ones
+    payments = [
+        random_payment(status=PaymentStatus.PENDING if i % 100 == 0 else PaymentStatus.SUCCESS)
+        for i in range(2 * ROWS)
+    ]
+    db.add_all(payments)
+    db.flush()
+    db.add_all(
+        Donation(donor_id=other.id, order_id=payment.order_id)
+        for payment in payments[:ROWS]
+    )
+    db.add_all(
+        Sponsorship(
+            sponsor_id=other.id,
+            recipient_id=target.id if i < 3 else other.id,
+            order_id=payment.order_id,
+        )
+        for i, payment in enumerate(payments[ROWS:])
+    )
+    db.commit()
+    db.connection().exec_driver_sql(
+        "ANALYZE project, projectapplication, task, notification, withdrawal, "
+        "payment, donation, sponsorship"
+    )
+    db.commit()
+    return {"target": target}
+
+
+@contextmanager
+def captured_statements(table: str) -> Generator[list[tuple[str, Any]], None, None]:
+    """Collect the SQL reading from `table` while the block runs"""
+    statements: list[tuple[str, Any]] = []
+    pattern = re.compile(rf"\bFROM {table}\b")
+
+    def before_cursor_execute(statement: str, parameters: Any, **_: Any) -> None:
+        if pattern.search(statement):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute, named=True)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(db: Session, table: str, call: Callable[[], Any]) -> str:
+    with captured_statements(table) as statements:
+        call()
+    assert statements, f"no query against {table}"
+    plans = []
+    connection = db.connection()
+    # Test tables are small; rule out seq scans so the plan shows which
+    # index the query shape can use
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    for statement, parameters in statements:
+        rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+        plans.append("\n".join(row[0] for row in rows))
+    db.rollback()
+    return "\n".join(plans)
+
+
+def test_unread_notifications_use_partial_index(db: Session, seeded: dict[str, Any]) -> None:
+    user_id = seeded["target"].id
+    plan = explain(
+        db, "notification",
+        lambda: crud.get_unread_notifications(session=db, user_id=user_id),
+    )
+    assert "ix_notification_user_id_created_at_unread" in plan
+
+
+def test_project_applications_use_project_index(db: Session, seeded: dict[str, Any]) -> None:
+    project_id = crud.get_applications_by_volunteer_id(
+        session=db, volunteer_id=seeded["target"].id
+    )[0][0].project_id
+    plan = explain(
+        db, "projectapplication",
+        lambda: crud.get_applications_by_project_id(session=db, project_id=project_id),
+    )
+    assert "ix_projectapplication_project_id_status" in plan
+
+
+def test_volunteer_applications_use_volunteer_index(db: Session, seeded: dict[str, Any]) -> None:
+    user_id = seeded["target"].id
+    plan = explain(
+        db, "projectapplication",
+        lambda: crud.get_applications_by_volunteer_id(session=db, volunteer_id=user_id),
+    )
+    assert "ix_projectapplication_volunteer_id_created_at" in plan
+
+
+def test_assigned_tasks_use_assignee_index(db: Session, seeded: dict[str, Any]) -> None:
+    user_id = seeded["target"].id
+    plan = explain(
+        db, "task",
+        lambda: crud.get_volunteer_profile_stats(session=db, user_id=user_id),
+    )
+    assert "ix_task_assignee_id_status" in plan
+
+
+def test_recipient_sponsorships_use_recipient_index(db: Session, seeded: dict[str, Any]) -> None:
+    user_id = seeded["target"].id
+    plan = explain(
+        db, "sponsorship",
+        lambda: crud.get_sponsorships_by_recipient_id(session=db, recipient_id=user_id),
+    )
+    assert "ix_sponsorship_recipient_id" in plan
+
+
+def test_withdrawal_balance_is_a_key_lookup(db: Session, seeded: dict[str, Any]) -> None:
+    user_id = seeded["target"].id
+    plan = explain(
+        db, "recipientbalance",
+        lambda: crud.get_withdrawal_balance(session=db, recipient_id=user_id),
+    )
+    assert "recipientbalance_pkey" in plan
+
+
+@pytest.mark.usefixtures("seeded")
+def test_approved_projects_use_status_index(db: Session) -> None:
+    plan = explain(
+        db, "project",
+        lambda: crud.get_approved_projects(session=db),
+    )
+    assert "ix_project_status_created_at" in plan
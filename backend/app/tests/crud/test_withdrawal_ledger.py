@@ -0,0 +1,150 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.db import engine
+from app.models import (
+    Payment,
+    PaymentStatus,
+    Withdrawal,
+    WithdrawalLedgerEntry,
+    WithdrawalLedgerEntryType,
+)
+from app.tests.utils.payment import create_random_payment
+from app.tests.utils.user import create_random_user
+
+
+def _sponsor(db: Session, recipient_id: uuid.UUID, amount: float) -> Payment:
+    payment = create_random_payment(db, amount=amount)
+    crud.create_sponsorship(
+        session=db, order_id=payment.order_id,
+        sponsor_id=create_random_user(db).id, recipient_id=recipient_id
+    )
+    return payment
+
+
+def _withdraw(db: Session, recipient_id: uuid.UUID, amount: float) -> Withdrawal:
+    return crud.create_withdrawal(
+        session=db, recipient_id=recipient_id, amount_requested=amount,
+        bank_account_number="1", bank_name="b", account_holder_name="h"
+    )
+
+
+def _entry_types(db: Session, recipient_id: uuid.UUID) -> list[WithdrawalLedgerEntryType]:
+    statement = (
+        select(WithdrawalLedgerEntry.entry_type)
+        .where(WithdrawalLedgerEntry.recipient_id == recipient_id)
+        .order_by(WithdrawalLedgerEntry.created_at)
+    )
+    return list(db.exec(statement).all())
+
+
+def test_sponsorship_success_credits_and_refund_reverses(db: Session) -> None:
+    recipient = create_random_user(db)
+    payment = _sponsor(db, recipient.id, 100.0)
+    # Pending sponsorships are not withdrawable yet
+    assert crud.get_withdrawal_balance(session=db, recipient_id=recipient.id)[
+        "total_received"] == 0.0
+
+    crud.update_payment_status(
+        session=db, order_id=payment.order_id, status=PaymentStatus.SUCCESS)
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient.id)
+    assert balance["total_received"] == 100.0
+    assert balance["available_balance"] == 100.0
+
+    crud.update_payment_status(
+        session=db, order_id=payment.order_id, status=PaymentStatus.CHARGEDBACK)
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient.id)
+    assert balance["total_received"] == 0.0
+    assert _entry_types(db, recipient.id) == [
+        WithdrawalLedgerEntryType.SPONSORSHIP_CREDIT,
+        WithdrawalLedgerEntryType.SPONSORSHIP_REVERSAL,
+    ]
+
+
+def test_withdrawal_hold_and_completion(db: Session) -> None:
+    recipient = create_random_user(db)
+    payment = _sponsor(db, recipient.id, 200.0)
+    crud.update_payment_status(
+        session=db, order_id=payment.order_id, status=PaymentStatus.SUCCESS)
+
+    withdrawal = _withdraw(db, recipient.id, 150.0)
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient.id)
+    assert balance["pending_withdrawals"] == 150.0
+    assert balance["total_withdrawn"] == 0.0
+    assert balance["available_balance"] == 50.0
+
+    crud.complete_withdrawal(session=db, withdrawal_id=withdrawal.id)
+    # Completing twice must not move the money twice
+    crud.complete_withdrawal(session=db, withdrawal_id=withdrawal.id)
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient.id)
+    assert balance["pending_withdrawals"] == 0.0
+    assert balance["total_withdrawn"] == 150.0
+    assert balance["available_balance"] == 50.0
+
+
+def test_parallel_completions_move_money_once(db: Session) -> None:
+    recipient = create_random_user(db)
+    payment = _sponsor(db, recipient.id, 200.0)
+    crud.update_payment_status(
+        session=db, order_id=payment.order_id, status=PaymentStatus.SUCCESS)
+    withdrawal = _withdraw(db, recipient.id, 150.0)
+
+    def complete(_: int) -> None:
+        with Session(engine) as session:
+            crud.complete_withdrawal(session=session, withdrawal_id=withdrawal.id)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(complete, range(8)))
+
+    balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient.id)
+    assert balance["total_withdrawn"] == 150.0
+    assert _entry_types(db, recipient.id).count(
+        WithdrawalLedgerEntryType.WITHDRAWAL_COMPLETION) == 1
+
+
+def test_batches_over_the_same_recipients_do_not_deadlock(db: Session) -> None:
+    recipients = [create_random_user(db).id for _ in range(2)]
+    # Each batch credits both recipients, half of them listed in reverse order
+    batches = [
+        [_sponsor(db, recipient_id, 10.0).order_id for recipient_id in recipients][::step]
+        for step in (1, -1) * 4
+    ]
+
+    def credit(order_ids: list[int]) -> None:
+        with Session(engine) as session:
+            payments = {
+                payment.order_id: payment
+                for payment in session.exec(select(Payment).where(Payment.order_id.in_(order_ids)))
+            }
+            participants = crud.get_payments_participants(session=session, order_ids=order_ids)
+            changes = []
+            for order_id in order_ids:
+                payments[order_id].status = PaymentStatus.SUCCESS
+                session.add(payments[order_id])
+                changes.append((payments[order_id], PaymentStatus.PENDING, participants[order_id]))
+            crud.apply_payment_status_changes(session=session, changes=changes)
+            session.commit()
+
+    with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+        list(pool.map(credit, batches))
+
+    for recipient_id in recipients:
+        balance = crud.get_withdrawal_balance(session=db, recipient_id=recipient_id)
+        assert balance["total_received"] == 10.0 * len(batches)
+
+
+def test_reconcile_finds_ledger_in_balance(db: Session) -> None:
+    recipient = create_random_user(db)
+    for amount in (30.0, 70.0):
+        payment = _sponsor(db, recipient.id, amount)
+        crud.update_payment_status(
+            session=db, order_id=payment.order_id, status=PaymentStatus.SUCCESS)
+    crud.complete_withdrawal(
+        session=db, withdrawal_id=_withdraw(db, recipient.id, 40.0).id)
+    _withdraw(db, recipient.id, 10.0)
+
+    discrepancies = crud.reconcile_withdrawal_ledger(session=db)
+    assert not [d for d in discrepancies if d.recipient_id == recipient.id]
@@ -0,0 +1,33 @@
+from collections.abc import Generator
+
+import pytest
+from sqlmodel import Session, delete
+
+from app.core.config import settings
+from app.models import PayHereAccessToken
+from app.tests.utils.payhere import (
+    RETRIEVAL_PATH,
+    TOKEN_PATH,
+    FakePayHere,
+    fake_payhere,
+)
+
+LATENCY = 0.2
+
+
+@pytest.fixture()
+def payhere(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> Generator[FakePayHere, None, None]:
+    with fake_payhere(latency=LATENCY) as server:
+        monkeypatch.setattr(settings, "PAYHERE_APP_ID", "app")
+        monkeypatch.setattr(settings, "PAYHERE_APP_SECRET", "secret")
+        monkeypatch.setattr(settings, "PAYHERE_TOKEN_URL", server.base_url + TOKEN_PATH)
+        monkeypatch.setattr(
+            settings, "PAYHERE_RETRIEVAL_URL", server.base_url + RETRIEVAL_PATH)
+        # The fake only speaks plain HTTP/1.1
+        monkeypatch.setattr(settings, "PAYHERE_HTTP2", False)
+        # No token shared by earlier tests
+        db.execute(delete(PayHereAccessToken))
+        db.commit()
+        yield server
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.models import PayHereAccessToken, PaymentStatus
+from app.services.payhere_service import PayHereService
+from app.tests.utils.payhere import FakePayHere, run
+
+CALLERS = 500
+
+
+def test_retrieval_answers_are_cached(payhere: FakePayHere) -> None:
+    service = PayHereService()
+    payhere.statuses["1"] = "RECEIVED"
+
+    async def lookups() -> list[PaymentStatus]:
+        return [await service.get_payhere_payment_status(order_id) for order_id in (1, 2)]
+
+    # Nothing on PayHere for order 2 yet; that answer is cached too
+    assert run(lookups, service) == [PaymentStatus.SUCCESS, PaymentStatus.NOT_FOUND]
+    assert run(lookups, service) == [PaymentStatus.SUCCESS, PaymentStatus.NOT_FOUND]
+    assert payhere.retrieval_requests == 2
+
+
+@pytest.mark.parametrize("shared_token", [None, "expired"])
+def test_concurrent_callers_share_one_token_request(
+    db: Session, payhere: FakePayHere, shared_token: str | None
+) -> None:
+    if shared_token:
+        db.add(PayHereAccessToken(
+            app_id="app", access_token=shared_token,
+            expires_at=datetime.utcnow() - timedelta(seconds=1)
+        ))
+        db.commit()
+    # Two workers, each with its own cache, lock and connection pool
+    workers = [PayHereService(), PayHereService()]
+
+    async def callers() -> list[str]:
+        return await asyncio.gather(*(
+            workers[i % len(workers)]._get_access_token() for i in range(CALLERS)
+        ))
+
+    tokens = run(callers, *workers)
+
+    assert payhere.token_requests == 1
+    assert set(tokens) == {"fake-token-1"}
+
+
+def test_token_is_renewed_before_it_expires(db: Session, payhere: FakePayHere) -> None:
+    # Still usable by callers, but due for the background refresh
+    expires_in = (settings.PAYHERE_TOKEN_EXPIRY_MARGIN + settings.PAYHERE_TOKEN_REFRESH_AHEAD) / 2
+    db.add(PayHereAccessToken(
+        app_id="app", access_token="old",
+        expires_at=datetime.utcnow() + timedelta(seconds=expires_in)
+    ))
+    db.commit()
+    service = PayHereService()
+
+    async def idle() -> None:
+        await asyncio.sleep(3 * payhere.latency)
+
+    run(idle, service)
+    assert payhere.token_requests == 1
+    assert service.token_cache.get_token() == "fake-token-1"
+
+    db.expire_all()
+    shared = db.get(PayHereAccessToken, "app")
+    assert shared and shared.access_token == "fake-token-1"
+
+    # Another worker picks the renewed token up without asking PayHere
+    other = PayHereService()
+    assert run(other._get_access_token, other) == "fake-token-1"
+    assert payhere.token_requests == 1
+
+
+def test_token_row_is_not_locked_while_payhere_answers(db: Session, payhere: FakePayHere) -> None:
+    service = PayHereService()
+
+    async def renew_and_peek() -> tuple[str | None, datetime | None]:
+        renewal = asyncio.create_task(service._get_access_token())
+        await asyncio.sleep(payhere.latency / 2)
+        # NOWAIT fails at once if the renewing worker kept the row locked
+        with Session(engine) as session:
+            peeked = session.exec(
+                select(PayHereAccessToken.access_token, PayHereAccessToken.refreshing_until)
+                .where(PayHereAccessToken.app_id == "app")
+                .with_for_update(nowait=True)
+            ).one()
+        await renewal
+        return peeked
+
+    access_token, refreshing_until = run(renew_and_peek, service)
+    assert access_token is None
+    assert refreshing_until and refreshing_until > datetime.utcnow()
+
+    db.expire_all()
+    shared = db.get(PayHereAccessToken, "app")
+    assert shared and shared.access_token == "fake-token-1"
+    assert shared.refreshing_until is None
+
+
+def test_stale_refresh_claim_is_taken_over(db: Session, payhere: FakePayHere) -> None:
+    # Left by a worker that died while renewing
+    db.add(PayHereAccessToken(
+        app_id="app", refreshing_until=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+    service = PayHereService()
+
+    assert run(service._get_access_token, service) == "fake-token-1"
+    assert payhere.token_requests == 1
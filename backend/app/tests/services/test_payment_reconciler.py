@@ -0,0 +1,89 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, update
+
+from app import crud
+from app.core.config import settings
+from app.models import Payment, PaymentStatus
+from app.services.payhere_service import PayHereService
+from app.services.payment_reconciler import PaymentReconciler
+from app.tests.utils.payhere import FakePayHere, run
+from app.tests.utils.payment import random_payment
+
+PAGE = 20
+
+
+def _stale_payments(db: Session, count: int = PAGE) -> list[Payment]:
+    # Only these payments are due; everything else was checked just now
+    db.execute(update(Payment).values(reconciled_at=datetime.utcnow()))
+    created_at = datetime.utcnow() - timedelta(seconds=settings.PAYHERE_RECONCILE_MIN_AGE + 60)
+    payments = [random_payment(created_at=created_at) for _ in range(count)]
+    db.add_all(payments)
+    db.commit()
+    for payment in payments:
+        db.refresh(payment)
+    return payments
+
+
+def test_stale_payments_are_reconciled_concurrently(
+    db: Session, payhere: FakePayHere
+) -> None:
+    payments = _stale_payments(db)
+    payhere.statuses[str(payments[0].order_id)] = "RECEIVED"
+    service = PayHereService()
+    reconciler = PaymentReconciler(service, batch_size=PAGE)
+
+    start = time.perf_counter()
+    claimed = run(reconciler.reconcile_batch, service)
+    elapsed = time.perf_counter() - start
+
+    assert claimed == PAGE
+    assert payhere.retrieval_requests == PAGE
+    # Several lookups in flight at once, not one after another
+    assert elapsed < PAGE * payhere.latency / 2
+    for payment in payments:
+        db.refresh(payment)
+    assert payments[0].status == PaymentStatus.SUCCESS
+    # Nothing on PayHere for the rest: abandoned at checkout
+    assert {payment.status for payment in payments[1:]} == {PaymentStatus.NOT_FOUND}
+
+    # Checked payments are not claimed again until they are due
+    assert run(reconciler.reconcile_batch, service) == 0
+
+
+def test_workers_claim_disjoint_batches(db: Session, payhere: FakePayHere) -> None:
+    _stale_payments(db)
+    workers = [PayHereService(), PayHereService()]
+    reconcilers = [PaymentReconciler(worker, batch_size=PAGE) for worker in workers]
+
+    async def both() -> list[int]:
+        return await asyncio.gather(*(reconciler.reconcile_batch() for reconciler in reconcilers))
+
+    claimed = run(both, *workers)
+
+    assert sum(claimed) == PAGE
+    assert payhere.retrieval_requests == PAGE
+
+
+@pytest.mark.usefixtures("payhere")
+def test_reconciler_does_not_undo_a_webhook(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    payment = _stale_payments(db, 1)[0]
+    service = PayHereService()
+    lookup = service.get_payhere_payment_status
+
+    async def webhook_during_lookup(order_id: int) -> PaymentStatus:
+        status = await lookup(order_id)
+        crud.update_payment_status(
+            session=db, order_id=order_id, status=PaymentStatus.SUCCESS)
+        return status
+
+    monkeypatch.setattr(service, "get_payhere_payment_status", webhook_during_lookup)
+    run(PaymentReconciler(service).reconcile_batch, service)
+
+    db.refresh(payment)
+    assert payment.status == PaymentStatus.SUCCESS
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from app.models import Notification
+from app.utils import (
+    decode_cursor,
+    encode_cursor,
+    get_next_cursor,
+    paginate,
+    paginate_with_total,
+    split_total,
+)
+
+
+def test_cursor_round_trip() -> None:
+    key = (datetime(2025, 5, 1, 12, 30, 0, 123456), uuid.uuid4(), 42)
+    cursor = encode_cursor(*key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == key
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor()])
+def test_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_paginate_uses_keyset_after_cursor() -> None:
+    columns = [Notification.created_at, Notification.id]
+    offset_sql = str(
+        paginate(select(Notification), columns, skip=20, limit=10).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "OFFSET" in offset_sql
+
+    after = (datetime(2025, 1, 1), uuid.uuid4())
+    keyset_sql = str(
+        paginate(select(Notification), columns, limit=10, after=after).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "OFFSET" not in keyset_sql
+    assert "(notification.created_at, notification.id) <" in keyset_sql
+    assert "ORDER BY notification.created_at DESC, notification.id DESC" in keyset_sql
+
+    with pytest.raises(ValueError):
+        paginate(select(Notification), columns, limit=10, after=(1,))
+
+
+def test_next_cursor_only_for_full_pages() -> None:
+    rows = [(1,), (2,)]
+    assert get_next_cursor(rows, 3, lambda row: row) is None
+    assert decode_cursor(get_next_cursor(rows, 2, lambda row: row) or "") == (2,)
+
+
+def test_paginate_with_total_is_one_statement() -> None:
+    columns = [Notification.created_at, Notification.id]
+    statement = select(Notification).where(Notification.is_read.is_(False))
+
+    offset_sql = str(
+        paginate_with_total(statement, columns, skip=20, limit=10).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "count(*) OVER () AS total_count" in offset_sql
+
+    # Cursor pages do not count the listing again
+    after = (datetime(2025, 1, 1), uuid.uuid4())
+    keyset_sql = str(
+        paginate_with_total(statement, columns, limit=10, after=after).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "count(" not in keyset_sql
+    assert "NULL AS total_count" in keyset_sql
+
+
+def test_estimated_total_only_for_unfiltered_tables() -> None:
+    columns = [Notification.created_at, Notification.id]
+    estimated = str(
+        paginate_with_total(select(Notification), columns, estimate=True).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "pg_class.reltuples" in estimated
+
+    filtered = str(
+        paginate_with_total(
+            select(Notification).where(Notification.is_read.is_(False)), columns, estimate=True
+        ).compile(dialect=postgresql.dialect())
+    )
+    assert "pg_class" not in filtered
+
+
+def test_split_total() -> None:
+    assert split_total([("a", 5), ("b", 5)]) == (["a", "b"], 5)
+    assert split_total([("a", "x", 2)]) == ([("a", "x")], 2)
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Awaitable, Callable, Generator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Protocol, TypeVar
+from urllib.parse import parse_qs, urlparse
+
+from app.core.config import settings
+from app.core.db import async_engine
+
+TOKEN_PATH = "/merchant/v1/oauth/token"
+RETRIEVAL_PATH = "/merchant/v1/payment/search"
+
+T = TypeVar("T")
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for a burst of new connections without SYN retries
+    request_queue_size = 128
+
+
+class FakePayHere:
+    """
+    PayHere OAuth and retrieval endpoints on a local port. Every request
+    waits `latency` seconds before answering. The OAuth endpoint issues a
+    new token each time ("fake-token-1", "fake-token-2", ...); retrieval
+    reports each order with the PayHere status in `statuses` or "no payments
+    found".
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.statuses: dict[str, str] = {}
+        self.token_requests = 0
+        self.retrieval_requests = 0
+        self._lock = threading.Lock()
+        self._server = Server(("127.0.0.1", 0), self._handler())
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections open between requests, like the real API
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _reply(self, body: dict[str, Any]) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with fake._lock:
+                    fake.token_requests += 1
+                    token = f"fake-token-{fake.token_requests}"
+                time.sleep(fake.latency)
+                self._reply({"access_token": token, "expires_in": 599})
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                order_id = parse_qs(url.query)["order_id"][0]
+                with fake._lock:
+                    fake.retrieval_requests += 1
+                time.sleep(fake.latency)
+                status = fake.statuses.get(order_id)
+                if status is None:
+                    self._reply({"status": -1, "msg": "No payments found", "data": None})
+                    return
+                self._reply({
+                    "status": 1,
+                    "msg": "Payments found",
+                    "data": [{
+                        "payment_id": 1,
+                        "order_id": order_id,
+                        "date": "2026-01-01 00:00:00",
+                        "description": "fake",
+                        "status": status,
+                        "currency": "LKR",
+                        "amount": 10.0,
+                    }],
+                })
+
+        return Handler
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@contextmanager
+def fake_payhere(latency: float = 0.0) -> Generator[FakePayHere, None, None]:
+    server = FakePayHere(latency=latency)
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+class Service(Protocol):
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+def run(scenario: Callable[[], Awaitable[T]], *services: Service) -> T:
+    """Run scenario on a fresh event loop with the services started"""
+    async def main() -> T:
+        for service in services:
+            await service.start()
+        try:
+            return await scenario()
+        finally:
+            for service in reversed(services):
+                await service.stop()
+            # Pooled async connections are bound to this event loop
+            await async_engine.dispose()
+
+    return asyncio.run(main())
+
+
+def webhook_form(
+    order_id: int, amount: float, status_code: int, currency: str = "LKR"
+) -> dict[str, str]:
+    """Form fields of a PayHere notification, signed with PAYHERE_MERCHANT_SECRET"""
+    merchant_id = settings.PAYHERE_MERCHANT_ID or ""
+    inner_hash = hashlib.md5(
+        (settings.PAYHERE_MERCHANT_SECRET or "").encode()).hexdigest().upper()
+    md5sig = hashlib.md5(
+        f"{merchant_id}{order_id}{float(amount)}{currency}{status_code}{inner_hash}".encode()
+    ).hexdigest().upper()
+    return {
+        "merchant_id": merchant_id,
+        "order_id": str(order_id),
+        "payhere_amount": f"{amount:.2f}",
+        "payhere_currency": currency,
+        "status_code": str(status_code),
+        "md5sig": md5sig,
+    }
@@ -0,0 +1,30 @@
+from typing import Any
+
+from sqlmodel import Session
+
+from app.models import Payment, PaymentCurrency
+
+
+def random_payment(*, amount: float = 10.0, **fields: Any) -> Payment:
+    """An unsaved LKR payment; fields override the defaults, e.g. status"""
+    return Payment(
+        merchant_id="m",
+        first_name="f",
+        last_name="l",
+        email="payer@example.com",
+        phone="0",
+        address="a",
+        city="c",
+        country="LK",
+        items="test",
+        currency=PaymentCurrency.LKR,
+        amount=amount,
+        **fields,
+    )
+
+
+def create_random_payment(db: Session, *, amount: float = 10.0, **fields: Any) -> Payment:
+    payment = random_payment(amount=amount, **fields)
+    db.add(payment)
+    db.commit()
+    return payment
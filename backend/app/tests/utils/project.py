@@ -0,0 +1,29 @@
+from sqlmodel import Session
+
+from app import crud
+from app.models import (
+    Project,
+    ProjectCreate,
+    ProjectThread,
+    ProjectThreadCreate,
+    ProjectType,
+    User,
+)
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_project(db: Session, requester: User) -> Project:
+    project_in = ProjectCreate(
+        title=random_lower_string(),
+        description=random_lower_string(),
+        project_type=ProjectType.WEBSITE,
+    )
+    return crud.create_project(session=db, project_in=project_in, requester_id=requester.id)
+
+
+def create_random_thread(db: Session, author: User) -> ProjectThread:
+    project = create_random_project(db, author)
+    thread_in = ProjectThreadCreate(title=random_lower_string(), body=random_lower_string())
+    return crud.create_project_thread(
+        session=db, thread_in=thread_in, author_id=author.id, project_id=project.id
+    )
@@ -1,5 +1,9 @@
+import base64
+import json
 import logging
 import math
+import uuid
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -9,6 +13,22 @@ import emails  # type: ignore
 import jwt
 from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Table,
+    case,
+    cast,
+    column,
+    func,
+    literal,
+    null,
+    select,
+    table,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.types import TypeDecorator
 
 from app.core import security
 from app.core.config import settings
@@ -125,7 +145,9 @@ def verify_password_reset_token(token: str) -> str | None:
         return None
 
 
-def calculate_pagination_meta(*, total: int, skip: int, limit: int) -> Meta:
+def calculate_pagination_meta(
+    *, total: int, skip: int, limit: int, next_cursor: str | None = None
+) -> Meta:
     """
     Calculate pagination metadata for API responses.
 
@@ -133,13 +155,16 @@ def calculate_pagination_meta(*, total: int, skip: int, limit: int) -> Meta:
         total: Total number of items
         skip: Number of items to skip
         limit: Number of items per page
+        next_cursor: Cursor for the following page, if keyset paging is used
 
     Returns:
         Meta object with pagination information
     """
     page = (skip // limit) + 1
+    if total is None:
+        return Meta(page=page, total=None, totalPages=None, next_cursor=next_cursor)
     totalPages = math.ceil(total / limit) if limit > 0 else 1
-    return Meta(page=page, total=total, totalPages=totalPages)
+    return Meta(page=page, total=total, totalPages=totalPages, next_cursor=next_cursor)
 
 
 def page_to_skip(page: int, limit: int) -> int:
@@ -158,17 +183,207 @@ def page_to_skip(page: int, limit: int) -> int:
     return (page - 1) * limit
 
 
-def calculate_pagination_meta_from_page(*, total: int, page: int, limit: int) -> Meta:
+def calculate_pagination_meta_from_page(
+    *, total: int | None, page: int, limit: int, next_cursor: str | None = None
+) -> Meta:
     """
     Calculate pagination metadata for API responses using page-based pagination.
 
     Args:
-        total: Total number of items
+        total: Total number of items, None on cursor pages
         page: Current page number (1-based)
         limit: Number of items per page
+        next_cursor: Cursor for the following page, if keyset paging is used
 
     Returns:
         Meta object with pagination information
     """
+    if total is None:
+        return Meta(page=page, total=None, totalPages=None, next_cursor=next_cursor)
     totalPages = math.ceil(total / limit) if limit > 0 else 1
-    return Meta(page=page, total=total, totalPages=totalPages)
+    return Meta(page=page, total=total, totalPages=totalPages, next_cursor=next_cursor)
+
+
+class InvalidCursorError(ValueError):
+    """A decoded cursor that does not fit the listing it was passed to"""
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Args:
+        values: Key values in sort order, e.g. (created_at, id) or (order_id,)
+
+    Returns:
+        URL-safe cursor string
+    """
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            encoded.append({"d": value.isoformat()})
+        elif isinstance(value, uuid.UUID):
+            encoded.append({"u": str(value)})
+        else:
+            encoded.append(value)
+    raw = json.dumps(encoded, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        encoded = json.loads(raw)
+        values: list[Any] = []
+        for value in encoded:
+            if isinstance(value, dict) and "d" in value:
+                values.append(datetime.fromisoformat(value["d"]))
+            elif isinstance(value, dict) and "u" in value:
+                values.append(uuid.UUID(value["u"]))
+            elif isinstance(value, (int, float, str)):
+                values.append(value)
+            else:
+                raise ValueError(value)
+        if not values:
+            raise ValueError("empty cursor")
+        return tuple(values)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+
+# Cursor value types accepted per column type; other column types (enums,
+# booleans) are not checked
+CURSOR_VALUE_TYPES: dict[type, tuple[type, ...]] = {
+    datetime: (datetime,),
+    uuid.UUID: (uuid.UUID,),
+    int: (int,),
+    float: (int, float),
+    str: (str,),
+}
+
+
+def check_cursor(after: tuple[Any, ...], columns: Sequence[Any]) -> None:
+    """
+    Raise InvalidCursorError unless `after` has one value per column, each of
+    a type its column can hold, so a cursor from another listing is a client
+    error rather than a database error.
+    """
+    if len(after) != len(columns):
+        raise InvalidCursorError("Cursor does not match this listing")
+    for column_, value in zip(columns, after, strict=True):
+        sql_type = column_.type
+        if isinstance(sql_type, TypeDecorator):
+            sql_type = sql_type.impl_instance
+        try:
+            python_type = sql_type.python_type
+        except NotImplementedError:
+            continue
+        accepted = CURSOR_VALUE_TYPES.get(python_type)
+        if accepted is None:
+            continue
+        # bool is an int, but never a valid key value
+        if isinstance(value, bool) or not isinstance(value, accepted):
+            raise InvalidCursorError("Cursor does not match this listing")
+
+
+def paginate(
+    statement: Any,
+    columns: Sequence[Any],
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None,
+    descending: bool = True,
+) -> Any:
+    """
+    Order a statement newest first by `columns` (oldest first when not
+    `descending`) and select one page.
+
+    Without `after` this is plain OFFSET paging. With `after` (a decoded
+    cursor) it continues right after that key instead, which costs the same
+    on page 1000 as on page 1 when an index covers `columns`.
+    """
+    if descending:
+        statement = statement.order_by(*(column.desc() for column in columns))
+    else:
+        statement = statement.order_by(*columns)
+    if after is None:
+        statement = statement.offset(skip)
+    else:
+        check_cursor(after, columns)
+        key, position = tuple_(*columns), tuple_(*after)
+        statement = statement.where(key < position if descending else key > position)
+    return statement.limit(limit)
+
+
+# Below this many rows an exact count is cheap enough to always run
+ESTIMATE_THRESHOLD = 100_000
+
+_pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+
+def paginate_with_total(
+    statement: Any,
+    columns: Sequence[Any],
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[Any, ...] | None = None,
+    descending: bool = True,
+    estimate: bool = False,
+) -> Any:
+    """
+    paginate() with the size of the whole listing as an extra last column, so
+    the page and its total come back in one round trip.
+
+    Offset pages use a window count. Cursor pages carry a NULL total: the
+    client has the total from the first page, and counting the whole listing
+    again on every page would cost what the cursor saves. With `estimate`, an
+    unfiltered listing of a large table reports the planner's row estimate
+    from pg_class rather than counting every row.
+    """
+    froms = statement.get_final_froms()
+    if after is not None:
+        total: ColumnElement[Any] = null()
+    elif estimate and statement.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+        from_table = froms[0]
+        reltuples = select(cast(_pg_class.c.reltuples, BigInteger)).where(
+            _pg_class.c.oid == cast(literal(from_table.name), REGCLASS)
+        ).scalar_subquery()
+        exact = select(func.count()).select_from(
+            statement.order_by(None).subquery()
+        ).scalar_subquery()
+        # reltuples is -1 until the table is first analyzed
+        total = case((reltuples >= ESTIMATE_THRESHOLD, reltuples), else_=exact)
+    else:
+        total = func.count().over()
+    statement = statement.add_columns(total.label("total_count"))
+    return paginate(
+        statement, columns, skip=skip, limit=limit, after=after, descending=descending
+    )
+
+
+def count_rows(statement: Any) -> Any:
+    """SELECT count(*) over the rows `statement` would return"""
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+
+def split_total(rows: Sequence[Any]) -> tuple[list[Any], int | None]:
+    """Separate rows of paginate_with_total() into their items and the total"""
+    items = [row[0] if len(row) == 2 else tuple(row[:-1]) for row in rows]
+    return items, rows[0][-1]
+
+
+def get_next_cursor(
+    rows: Sequence[Any], limit: int, key: Callable[[Any], tuple[Any, ...]]
+) -> str | None:
+    """Cursor for the page after `rows`, or None when this was the last page"""
+    if limit <= 0 or len(rows) < limit:
+        return None
+    return encode_cursor(*key(rows[-1]))
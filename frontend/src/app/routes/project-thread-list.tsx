@@ -39,7 +39,7 @@ export const ProjectThreadListRoute = () => {
                   </p>
                 </div>
                 <div className="text-right">
-                  <p>{thread.comments.length} Comments</p>
+                  <p>{thread.comment_count} Comments</p>
                 </div>
               </Link>
             </li>
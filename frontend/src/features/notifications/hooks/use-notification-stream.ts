@@ -2,7 +2,11 @@ import { useQueryClient } from '@tanstack/react-query';
 import { useEffect, useRef } from 'react';
 
 import { useNotifications } from '@/components/ui/notifications';
-import { NotificationData } from '@/types/api';
+import {
+  NotificationData,
+  PAYMENT_STATUS,
+  PaymentStatusEvent,
+} from '@/types/api';
 
 import { unreadNotificationsKeys } from '../api/get-unread-notifications';
 
@@ -46,6 +50,59 @@ export const useNotificationStream = (enabled: boolean = true) => {
           return;
         }
 
+        // Server dropped notifications we were too slow to read; refetch
+        if (data.type === 'notifications_coalesced') {
+          addNotification({
+            type: 'info',
+            title: 'New notifications',
+            message: `You have ${data.count} new notifications`,
+          });
+          queryClient.invalidateQueries({
+            queryKey: unreadNotificationsKeys.unread(),
+          });
+          queryClient.invalidateQueries({
+            queryKey: unreadNotificationsKeys.unreadCount(),
+          });
+          return;
+        }
+
+        // Missed more notifications while disconnected than the server
+        // replays; refetch instead of showing a partial history
+        if (data.type === 'notifications_reset') {
+          queryClient.invalidateQueries({
+            queryKey: unreadNotificationsKeys.unread(),
+          });
+          queryClient.invalidateQueries({
+            queryKey: unreadNotificationsKeys.unreadCount(),
+          });
+          return;
+        }
+
+        // A payment we are part of settled or failed; refetch what it changes
+        // instead of polling the payment until it does
+        if (data.type === 'payment_status') {
+          const payment: PaymentStatusEvent = data;
+          const queryKeys =
+            payment.kind === 'DONATION'
+              ? [['my-donations']]
+              : [
+                  ['my-sponsorships'],
+                  ['received-sponsorships'],
+                  ['withdrawal-balance'],
+                ];
+          queryKeys.forEach((queryKey) =>
+            queryClient.invalidateQueries({ queryKey }),
+          );
+          if (payment.status === PAYMENT_STATUS.SUCCESS) {
+            addNotification({
+              type: 'success',
+              title: 'Payment completed',
+              message: `Payment #${payment.order_id} was successful`,
+            });
+          }
+          return;
+        }
+
         // Handle real notification
         const notification: NotificationData = data;
 
@@ -44,7 +44,10 @@ export const getProjectThreads = ({
 }: {
   projectId: string;
 }): Promise<Paginated<ProjectThread>> => {
-  return api.get(`/projects/${projectId}/threads`);
+  // Most recently active first; threads come with counts, not comments
+  return api.get(`/projects/${projectId}/threads`, {
+    params: { sort: 'activity' },
+  });
 };
 
 export const useProjectThreads = ({
@@ -84,6 +87,32 @@ export const useProjectThread = ({
   });
 };
 
+// API functions to load more comments of a thread, or replies of a comment,
+// after the ones the thread detail came with
+export const getThreadComments = ({
+  threadId,
+  cursor,
+}: {
+  threadId: string;
+  cursor: string;
+}): Promise<Paginated<Comment>> => {
+  return api.get(`/projects/threads/${threadId}/comments`, {
+    params: { cursor, limit: 20 },
+  });
+};
+
+export const getCommentReplies = ({
+  commentId,
+  cursor,
+}: {
+  commentId: string;
+  cursor: string;
+}): Promise<Paginated<Reply>> => {
+  return api.get(`/projects/comments/${commentId}/replies`, {
+    params: { cursor, limit: 20 },
+  });
+};
+
 // API function to create a thread
 export const createProjectThread = ({
   projectId,
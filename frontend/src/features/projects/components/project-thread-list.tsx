@@ -72,7 +72,7 @@ export const ProjectThreadList = ({ projectId }: ProjectThreadListProps) => {
                   </div>
                   <div className="text-right">
                     <p className="font-semibold">
-                      {thread.comments.length} comments
+                      {thread.comment_count} comments
                     </p>
                   </div>
                 </div>
@@ -20,6 +20,8 @@ import { Comment as CommentType, Reply as ReplyType } from '@/types/api';
 import { formatDate } from '@/utils/format';
 
 import {
+  getCommentReplies,
+  getThreadComments,
   useProjectThread,
   useCreateComment,
   useUpdateComment,
@@ -96,11 +98,39 @@ const CommentItem = ({
 }) => {
   const canEdit = currentUser?.id === comment.author_id;
   const [isReplying, setIsReplying] = useState(false);
-  const [showAllReplies, setShowAllReplies] = useState(false);
+  // Replies loaded past the first few the thread detail includes
+  const [moreReplies, setMoreReplies] = useState<{
+    replies: ReplyType[];
+    cursor: string | null | undefined;
+  } | null>(null);
+  const [isLoadingReplies, setIsLoadingReplies] = useState(false);
 
-  const repliesToShow = showAllReplies
-    ? comment.replies
-    : comment.replies?.slice(0, 5) || [];
+  const loadedIds = new Set(comment.replies?.map((reply) => reply.id));
+  const repliesToShow = [
+    ...(comment.replies || []),
+    ...(moreReplies?.replies.filter((reply) => !loadedIds.has(reply.id)) ||
+      []),
+  ];
+  const repliesCursor = moreReplies
+    ? moreReplies.cursor
+    : comment.replies_next_cursor;
+
+  const handleLoadMoreReplies = async () => {
+    if (!repliesCursor) return;
+    setIsLoadingReplies(true);
+    try {
+      const page = await getCommentReplies({
+        commentId: comment.id,
+        cursor: repliesCursor,
+      });
+      setMoreReplies({
+        replies: [...(moreReplies?.replies || []), ...page.data],
+        cursor: page.meta.next_cursor,
+      });
+    } finally {
+      setIsLoadingReplies(false);
+    }
+  };
 
   return (
     <div className="rounded-lg border border-slate-200 bg-slate-50/50 p-4 shadow-sm">
@@ -314,7 +344,7 @@ const CommentItem = ({
         </div>
       )}
 
-      {comment.replies && comment.replies.length > 0 && (
+      {repliesToShow.length > 0 && (
         <div className="ml-6 mt-3 space-y-3 border-l-2 border-slate-100 pl-3">
           {repliesToShow.map((reply) => (
             <ReplyItem
@@ -348,15 +378,14 @@ const CommentItem = ({
               createCommentMutation={createCommentMutation}
             />
           ))}
-          {comment.replies.length > 5 && (
+          {repliesCursor && (
             <Button
               variant="link"
               className="p-0 text-sm"
-              onClick={() => setShowAllReplies(!showAllReplies)}
+              isLoading={isLoadingReplies}
+              onClick={handleLoadMoreReplies}
             >
-              {showAllReplies
-                ? 'Show less'
-                : `View all ${comment.replies.length} replies`}
+              View more replies
             </Button>
           )}
         </div>
@@ -616,6 +645,12 @@ export const ProjectThread = ({ threadId }: ProjectThreadProps) => {
   const [editingCommentId, setEditingCommentId] = useState<string | null>(null);
   const [isEditingThread, setIsEditingThread] = useState(false);
   const [sortOrder, setSortOrder] = useState('newest');
+  // Comments loaded past the first page the thread detail includes
+  const [moreComments, setMoreComments] = useState<{
+    comments: CommentType[];
+    cursor: string | null | undefined;
+  } | null>(null);
+  const [isLoadingComments, setIsLoadingComments] = useState(false);
 
   const { data: thread, isLoading, error } = useProjectThread({ threadId });
   const createCommentMutation = useCreateComment({
@@ -645,7 +680,33 @@ export const ProjectThread = ({ threadId }: ProjectThreadProps) => {
 
   const user = useUser();
 
-  const comments = thread?.comments || [];
+  const loadedIds = new Set(thread?.comments.map((comment) => comment.id));
+  const comments = [
+    ...(thread?.comments || []),
+    ...(moreComments?.comments.filter(
+      (comment) => !loadedIds.has(comment.id),
+    ) || []),
+  ];
+  const commentsCursor = moreComments
+    ? moreComments.cursor
+    : thread?.comments_next_cursor;
+
+  const handleLoadMoreComments = async () => {
+    if (!commentsCursor) return;
+    setIsLoadingComments(true);
+    try {
+      const page = await getThreadComments({
+        threadId,
+        cursor: commentsCursor,
+      });
+      setMoreComments({
+        comments: [...(moreComments?.comments || []), ...page.data],
+        cursor: page.meta.next_cursor,
+      });
+    } finally {
+      setIsLoadingComments(false);
+    }
+  };
   const sortedComments = [...comments].sort((a, b) => {
     const dateA = new Date(a.created_at).getTime();
     const dateB = new Date(b.created_at).getTime();
@@ -803,8 +864,8 @@ export const ProjectThread = ({ threadId }: ProjectThreadProps) => {
                   {thread.title}
                 </h3>
                 <p className="text-sm text-slate-600">
-                  {comments.length}{' '}
-                  {comments.length === 1 ? 'comment' : 'comments'}
+                  {thread.comment_count}{' '}
+                  {thread.comment_count === 1 ? 'comment' : 'comments'}
                 </p>
               </div>
             </div>
@@ -998,7 +1059,7 @@ export const ProjectThread = ({ threadId }: ProjectThreadProps) => {
         {/* Comments Header */}
         <div className="flex items-center justify-between border-b border-slate-200/60 p-4">
           <h2 className="text-xl font-semibold text-slate-800">
-            Comments ({comments.length})
+            Comments ({thread.comment_count})
           </h2>
           {comments.length > 1 && (
             <div className="flex items-center gap-2">
@@ -1055,6 +1116,18 @@ export const ProjectThread = ({ threadId }: ProjectThreadProps) => {
               />
             ))
           )}
+          {commentsCursor && (
+            <div className="text-center">
+              <Button
+                variant="outline"
+                size="sm"
+                isLoading={isLoadingComments}
+                onClick={handleLoadMoreComments}
+              >
+                Load more comments
+              </Button>
+            </div>
+          )}
         </div>
       </div>
     </>
@@ -23,10 +23,18 @@ export type RequestWithdrawalInput = z.infer<
   typeof requestWithdrawalInputSchema
 >;
 
-export const requestWithdrawal = (
-  data: RequestWithdrawalInput,
-): Promise<Withdrawal> => {
-  return api.post('/withdrawals/request', data);
+type RequestWithdrawalVariables = RequestWithdrawalInput & {
+  idempotencyKey: string;
+};
+
+export const requestWithdrawal = ({
+  idempotencyKey,
+  ...data
+}: RequestWithdrawalVariables): Promise<Withdrawal> => {
+  // Resending with the same key returns the withdrawal already created
+  return api.post('/withdrawals/request', data, {
+    headers: { 'Idempotency-Key': idempotencyKey },
+  });
 };
 
 type UseRequestWithdrawalOptions = {
@@ -27,6 +27,10 @@ export const WithdrawalRequestDialog = ({
   availableBalance,
 }: WithdrawalRequestDialogProps) => {
   const [open, setOpen] = useState(false);
+  // One key per withdrawal, reused if the user resubmits after a failure
+  const [idempotencyKey, setIdempotencyKey] = useState(() =>
+    crypto.randomUUID(),
+  );
   const { addNotification } = useNotifications();
   const requestWithdrawalMutation = useRequestWithdrawal({
     mutationConfig: {
@@ -36,6 +40,7 @@ export const WithdrawalRequestDialog = ({
           title: 'Withdrawal Requested',
           message: `Your withdrawal of LKR ${withdrawal.amount_requested.toFixed(2)} has been requested successfully.`,
         });
+        setIdempotencyKey(crypto.randomUUID());
         setOpen(false);
       },
       onError: (error: any) => {
@@ -50,7 +55,7 @@ export const WithdrawalRequestDialog = ({
   });
 
   const handleSubmit = (values: RequestWithdrawalInput) => {
-    requestWithdrawalMutation.mutate(values);
+    requestWithdrawalMutation.mutate({ ...values, idempotencyKey });
   };
 
   const calculateFee = (amount: number) => {
@@ -15,6 +15,9 @@ export type Meta = {
   page: number;
   total: number;
   totalPages: number;
+  // Keyset pagination: pass back as ?cursor= for the next page
+  // (cursor pages come back with total/totalPages set to null)
+  next_cursor?: string | null;
 };
 
 export type Paginated<T> = {
@@ -52,7 +55,9 @@ export type Comment = {
   created_at: string;
   updated_at: string;
   author: User;
+  // Only the first replies are included; more are loaded with this cursor
   replies: Reply[];
+  replies_next_cursor?: string | null;
 };
 
 export type Reply = {
@@ -73,8 +78,15 @@ export type ProjectThread = {
   project_id: string;
   created_at: string;
   updated_at: string;
+  comment_count: number;
+  reply_count: number;
+  last_activity_at: string;
+  last_author_id: string | null;
   author: User;
+  // Only the first comments are included (none in thread listings); more
+  // are loaded with this cursor
   comments: Comment[];
+  comments_next_cursor?: string | null;
 };
 
 export const VOLUNTEER_ROLES = {
@@ -436,6 +448,16 @@ export interface NotificationsResponse {
   };
 }
 
+// Pushed on the notification stream when a payment the user is part of
+// changes status
+export interface PaymentStatusEvent {
+  type: 'payment_status';
+  order_id: number;
+  kind: 'DONATION' | 'SPONSORSHIP';
+  status: PaymentStatus;
+  updated_at: string;
+}
+
 // Add these types at the end of the file
 
 export interface OpenPosition {